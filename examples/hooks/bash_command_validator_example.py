@@ -53,25 +53,33 @@ def _validate_command(command: str) -> list[str]:
     return issues
 
 
-def main():
-    try:
-        input_data = json.load(sys.stdin)
-    except json.JSONDecodeError as e:
-        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
-        # Exit code 1 shows stderr to the user but not to Claude
-        sys.exit(1)
+def evaluate(input_data: dict) -> list[str]:
+    """Return the issues found in a PreToolUse hook input (empty: allow).
 
+    Used by main() and by in-process dispatchers.
+    """
     tool_name = input_data.get("tool_name", "")
     if tool_name != "Bash":
-        sys.exit(0)
+        return []
 
     tool_input = input_data.get("tool_input", {})
     command = tool_input.get("command", "")
 
     if not command:
-        sys.exit(0)
+        return []
+
+    return _validate_command(command)
+
+
+def main():
+    try:
+        input_data = json.load(sys.stdin)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
+        # Exit code 1 shows stderr to the user but not to Claude
+        sys.exit(1)
 
-    issues = _validate_command(command)
+    issues = evaluate(input_data)
     if issues:
         for message in issues:
             print(f"• {message}", file=sys.stderr)
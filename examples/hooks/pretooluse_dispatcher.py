@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Claude Code Hook: Combined PreToolUse Dispatcher
+=================================================
+Every PreToolUse hook is a separate process. With hookify, security-guidance
+and the Bash command validator installed, one Edit starts two Python
+interpreters and one Bash call starts two, and each one parses the same
+stdin JSON. This dispatcher loads all three checkers as modules and runs
+them in one process against one parsed input:
+
+- hookify (plugins/hookify): rules from .claude/hookify.*.local.md
+- security-guidance (plugins/security-guidance): security reminders for
+  Edit, Write and MultiEdit
+- bash_command_validator_example.py: command checks for Bash
+
+Their decisions are merged under the existing hook contracts:
+
+- If the security reminder or the Bash validator blocks, the dispatcher
+  exits with code 2 and writes their messages to stderr, which is shown to
+  Claude. Exit code 2 discards JSON output, so hookify's message (a block
+  or a warning) is written to stderr too.
+- Otherwise it prints hookify's JSON response (possibly a deny) and exits 0.
+
+A checker that fails is reported on stderr and otherwise ignored; it never
+blocks the tool call. A checker whose file is missing (or whose path is set
+to '') is skipped.
+
+Use it in place of the separate PreToolUse entries (remove them from the
+hookify and security-guidance hooks.json files, or don't install them).
+Make sure to change your path to your actual script:
+
+{
+  "hooks": {
+    "PreToolUse": [
+      {
+        "hooks": [
+          {
+            "type": "command",
+            "command": "python3 /path/to/claude-code/examples/hooks/pretooluse_dispatcher.py"
+          }
+        ]
+      }
+    ]
+  }
+}
+
+Options:
+  --hookify PATH          hookify plugin directory (default: plugins/hookify)
+  --security PATH         security_reminder_hook.py (default: plugins/security-guidance/hooks/...)
+  --bash-validator PATH   bash_command_validator_example.py (default: next to this file)
+  --benchmark [RUNS]      compare latency against running the checkers as separate hooks
+"""
+
+import importlib.util
+import json
+import os
+import sys
+
+EXAMPLES_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(EXAMPLES_DIR))
+
+DEFAULT_PATHS = {
+    "hookify": os.path.join(REPO_ROOT, "plugins", "hookify"),
+    "security": os.path.join(
+        REPO_ROOT, "plugins", "security-guidance", "hooks", "security_reminder_hook.py"
+    ),
+    "bash-validator": os.path.join(EXAMPLES_DIR, "bash_command_validator_example.py"),
+}
+
+# Tools each checker's hooks.json matcher selects (None = every tool)
+MATCHERS = {
+    "hookify": None,
+    "security": ("Edit", "Write", "MultiEdit"),
+    "bash-validator": ("Bash",),
+}
+
+
+def _load_script(name: str, path: str):
+    """Import a hook script by file path."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _run_hookify(plugin_root: str, raw_input: str) -> dict:
+    """Evaluate hookify rules through the same path as hooks/pretooluse.py."""
+    parent_dir = os.path.dirname(plugin_root)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+    from hookify.core.client import evaluate_hook
+
+    return json.loads(evaluate_hook("pretooluse", raw_input))
+
+
+def dispatch(raw_input: str, paths: dict) -> tuple[int, str, str]:
+    """Run the checkers against one hook input.
+
+    Args:
+        raw_input: Hook input JSON
+        paths: Checker name -> path (see DEFAULT_PATHS); '' or a missing
+            path skips the checker
+
+    Returns:
+        (exit code, stdout, stderr) for the combined hook
+    """
+    try:
+        input_data = json.loads(raw_input)
+    except json.JSONDecodeError as e:
+        # Exit code 1 shows stderr to the user but not to Claude
+        return 1, "", f"Error: Invalid JSON input: {e}"
+
+    tool_name = input_data.get("tool_name", "")
+    enabled = {
+        name: path for name, path in paths.items()
+        if path and os.path.exists(path)
+        and (MATCHERS[name] is None or tool_name in MATCHERS[name])
+    }
+    response = {}
+    blocks = []  # Messages of checkers that block with exit code 2
+    errors = []
+
+    if "hookify" in enabled:
+        try:
+            response = _run_hookify(enabled["hookify"], raw_input)
+        except Exception as e:
+            # Same contract as hookify's own hook: report, never block
+            response = {"systemMessage": f"Hookify error: {e}"}
+
+    if "security" in enabled:
+        try:
+            reminder = _load_script("security_reminder_hook", enabled["security"]).evaluate(input_data)
+            if reminder:
+                blocks.append(reminder)
+        except Exception as e:
+            errors.append(f"security-guidance failed: {e}")
+
+    if "bash-validator" in enabled:
+        try:
+            issues = _load_script("bash_command_validator", enabled["bash-validator"]).evaluate(input_data)
+            if issues:
+                blocks.append("\n".join(f"• {message}" for message in issues))
+        except Exception as e:
+            errors.append(f"bash validator failed: {e}")
+
+    if blocks:
+        if response.get("systemMessage"):
+            blocks.insert(0, response["systemMessage"])
+        return 2, "", "\n\n".join(blocks + errors)
+    return 0, json.dumps(response), "\n".join(errors)
+
+
+def benchmark(runs: int, paths: dict) -> None:
+    """Compare the dispatcher with the checkers run as separate hooks.
+
+    Runs in a scratch project (with hookify's example rules) and a scratch
+    HOME, so no real project or security-guidance state is touched. The
+    separate hooks are started in parallel, as Claude Code does.
+    """
+    import resource
+    import shutil
+    import statistics
+    import subprocess
+    import tempfile
+    import time
+
+    scratch = tempfile.mkdtemp(prefix="dispatcher-bench-")
+    try:
+        claude_dir = os.path.join(scratch, ".claude")
+        os.makedirs(claude_dir)
+        examples = os.path.join(paths["hookify"], "examples") if paths["hookify"] else ""
+        if os.path.isdir(examples):
+            for name in os.listdir(examples):
+                shutil.copy(os.path.join(examples, name), os.path.join(claude_dir, f"hookify.{name}"))
+        env = dict(os.environ, HOME=scratch, CLAUDE_PLUGIN_ROOT=paths["hookify"], HOOKIFY_DAEMON="0")
+
+        inputs = [
+            ("Bash: grep (blocked)", {"tool_name": "Bash", "tool_input": {"command": "grep -r foo ."}}),
+            ("Bash: ls", {"tool_name": "Bash", "tool_input": {"command": "ls -la"}}),
+            ("Edit: eval( (blocked)", {"tool_name": "Edit", "tool_input": {
+                "file_path": "src/app.js", "old_string": "a", "new_string": "eval(input)"}}),
+            ("Write: plain file", {"tool_name": "Write", "tool_input": {
+                "file_path": "notes.md", "content": "Meeting notes\n" * 200}}),
+        ]
+        scripts = {
+            "hookify": [os.path.join(paths["hookify"], "hooks", "pretooluse.py")] if paths["hookify"] else [],
+            "security": [paths["security"]] if paths["security"] else [],
+            "bash-validator": [paths["bash-validator"]] if paths["bash-validator"] else [],
+        }
+        dispatcher = [sys.executable, os.path.abspath(__file__)] + [
+            arg for name, path in paths.items() for arg in (f"--{name}", path)
+        ]
+
+        def run(commands, payload):
+            """Start commands in parallel; return wall seconds, CPU seconds, exit codes."""
+            before = resource.getrusage(resource.RUSAGE_CHILDREN)
+            start = time.perf_counter()
+            procs = [
+                subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.DEVNULL, cwd=scratch, env=env)
+                for command in commands
+            ]
+            for proc in procs:
+                proc.communicate(payload)
+            wall = time.perf_counter() - start
+            after = resource.getrusage(resource.RUSAGE_CHILDREN)
+            cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+            return wall, cpu, [proc.returncode for proc in procs]
+
+        print(f"{runs} runs per input (medians; CPU = all processes)\n")
+        print(f"{'input':<24} {'hooks':>5} {'separate ms':>12} {'cpu ms':>8} "
+              f"{'dispatcher ms':>14} {'cpu ms':>8} {'saved ms':>9}")
+        for label, data in inputs:
+            tool_name = data["tool_name"]
+            separate = [
+                [sys.executable] + scripts[name] for name in scripts
+                if scripts[name] and os.path.exists(scripts[name][0])
+                and (MATCHERS[name] is None or tool_name in MATCHERS[name])
+            ]
+            results = {"separate": [], "dispatcher": []}
+            for i in range(runs):
+                # A fresh session each run, so the security reminder fires every time
+                payload = json.dumps(dict(data, session_id=f"bench-{i}", hook_event_name="PreToolUse",
+                                          cwd=scratch)).encode("utf-8")
+                results["separate"].append(run(separate, payload))
+                results["dispatcher"].append(run([dispatcher], payload))
+
+            def median(key, index):
+                return statistics.median(r[index] for r in results[key]) * 1000
+
+            print(f"{label:<24} {len(separate):>5} {median('separate', 0):>12.1f} "
+                  f"{median('separate', 1):>8.1f} {median('dispatcher', 0):>14.1f} "
+                  f"{median('dispatcher', 1):>8.1f} "
+                  f"{median('separate', 0) - median('dispatcher', 0):>9.1f}")
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def main():
+    args = sys.argv[1:]
+    paths = dict(DEFAULT_PATHS)
+    for name in paths:
+        flag = f"--{name}"
+        if flag in args:
+            paths[name] = args[args.index(flag) + 1]
+
+    if "--benchmark" in args:
+        position = args.index("--benchmark") + 1
+        runs = int(args[position]) if position < len(args) and args[position].isdigit() else 20
+        benchmark(runs, paths)
+        return
+
+    code, stdout, stderr = dispatch(sys.stdin.read(), paths)
+    if stdout:
+        print(stdout)
+    if stderr:
+        print(stderr, file=sys.stderr)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""In-process throughput benchmark for RuleEngine.evaluate_rules.
+
+Evaluates synthetic rule sets (10 to 10,000 rules mixing operators, fields and
+events) against Bash, Write, MultiEdit and Stop payloads and records the mean
+evaluation time and throughput per combination.
+
+Usage (from the plugin root):
+    python3 benchmarks/bench_engine.py [--full] [--output PATH]
+
+--full adds 10,000-rule sets, 10 MB Write/MultiEdit payloads and a 1 GB
+transcript (generated in a temporary directory, which needs the disk space).
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PLUGIN_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if os.path.dirname(PLUGIN_ROOT) not in sys.path:
+    sys.path.insert(0, os.path.dirname(PLUGIN_ROOT))
+
+from hookify.benchmarks import workloads
+from hookify.benchmarks.results import write_results
+from hookify.core.client import resolve_event
+from hookify.core.rule_engine import CompiledRuleset, RuleEngine
+
+KB = 1024
+MB = 1024 * KB
+GB = 1024 * MB
+
+QUICK = {
+    'rules': [10, 100, 1000],
+    'content_sizes': [1 * KB, 100 * KB, 1 * MB],
+    'transcript_sizes': [1 * MB, 16 * MB],
+}
+FULL = {
+    'rules': [10, 100, 1000, 10000],
+    'content_sizes': [1 * KB, 100 * KB, 1 * MB, 10 * MB],
+    'transcript_sizes': [1 * MB, 100 * MB, 1 * GB],
+}
+
+
+def _size_label(size: int) -> str:
+    for unit, factor in (('GB', GB), ('MB', MB), ('KB', KB)):
+        if size >= factor:
+            return f"{size // factor}{unit}"
+    return f"{size}B"
+
+
+def time_evaluations(engine: RuleEngine, rules, payload, event, min_time: float,
+                     max_iterations: int = 10000):
+    """Run evaluate_rules repeatedly; return (iterations, mean seconds)."""
+    iterations = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while iterations < max_iterations and (iterations == 0 or elapsed < min_time):
+        engine.evaluate_rules(rules, payload, event=event)
+        iterations += 1
+        elapsed = time.perf_counter() - start
+    return iterations, elapsed / iterations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--full', action='store_true', help='include the largest rule sets and payloads')
+    parser.add_argument('--min-time', type=float, default=0.3, help='seconds to spend per measurement')
+    parser.add_argument('--output', default=os.path.join(PLUGIN_ROOT, 'benchmarks', 'results', 'engine.json'))
+    args = parser.parse_args()
+    config = FULL if args.full else QUICK
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix='hookify-bench-') as work_dir:
+        # Stop evaluations persist transcript scan state under ./.claude
+        os.chdir(work_dir)
+
+        payloads = [('bash', 'pretooluse', workloads.bash_payload(), 0)]
+        for size in config['content_sizes']:
+            payloads.append((f'write-{_size_label(size)}', 'pretooluse', workloads.write_payload(size), size))
+            payloads.append((f'multiedit-{_size_label(size)}', 'pretooluse', workloads.multiedit_payload(size), size))
+        for size in config['transcript_sizes']:
+            path = os.path.join(work_dir, f'transcript-{size}.jsonl')
+            workloads.write_transcript(path, size)
+            payloads.append((f'stop-{_size_label(size)}', 'stop', workloads.stop_payload(path), size))
+            payloads.append((f'stop-incremental-{_size_label(size)}', 'stop',
+                             workloads.stop_payload(path, session_id=f'bench-{size}'), size))
+
+        for count in config['rules']:
+            rules = workloads.generate_rules(count)
+
+            start = time.perf_counter()
+            CompiledRuleset(rules)
+            results.append({
+                'name': f'compile/{count}-rules', 'metric': 'ms',
+                'value': (time.perf_counter() - start) * 1000, 'higher_is_better': False,
+                'rules': count,
+            })
+
+            engine = RuleEngine()
+            engine.compile(rules)
+            for label, hook, payload, size in payloads:
+                event = resolve_event(hook, payload)
+                if 'session_id' in payload:
+                    # Measure the steady state: later Stops in the same session
+                    engine.evaluate_rules(rules, payload, event=event)
+                # Large transcripts are measured once; everything else repeatedly
+                min_time = 0 if size >= 100 * MB else args.min_time
+                iterations, mean = time_evaluations(engine, rules, payload, event, min_time)
+
+                result = {
+                    'name': f'evaluate/{label}/{count}-rules', 'metric': 'mean_ms',
+                    'value': mean * 1000, 'higher_is_better': False,
+                    'rules': count, 'payload_bytes': size, 'iterations': iterations,
+                    'evals_per_sec': 1 / mean if mean else None,
+                    'stats': engine.last_stats.to_dict(),
+                }
+                results.append(result)
+                print(f"{result['name']:<45} {result['value']:>10.3f} ms  ({iterations} runs)")
+
+    write_results('engine', results, args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
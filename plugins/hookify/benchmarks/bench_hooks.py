@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Cold-start latency benchmark for the hookify hook entry points.
+
+Runs hooks/pretooluse.py and hooks/stop.py as subprocesses, exactly as Claude
+Code does, against a temporary project containing synthetic rule files, and
+records p50/p99 wall-clock latency. The first run of each configuration (cold
+rule cache) is recorded separately.
+
+Usage (from the plugin root):
+    python3 benchmarks/bench_hooks.py [--full] [--runs N] [--daemon] [--output PATH]
+
+--daemon additionally measures each configuration with the evaluation daemon running.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PLUGIN_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if os.path.dirname(PLUGIN_ROOT) not in sys.path:
+    sys.path.insert(0, os.path.dirname(PLUGIN_ROOT))
+
+from hookify.benchmarks import workloads
+from hookify.benchmarks.results import percentile, write_results
+
+QUICK_RULES = [0, 10, 100, 1000]
+FULL_RULES = [0, 10, 100, 1000, 10000]
+
+
+def run_hook(script: str, payload: bytes, cwd: str, env: dict) -> float:
+    """Run one hook subprocess; return its wall-clock latency in seconds."""
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, os.path.join(PLUGIN_ROOT, 'hooks', script)],
+        input=payload, cwd=cwd, env=env, capture_output=True
+    )
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"{script} exited with {completed.returncode}: {completed.stderr.decode()}")
+    return elapsed
+
+
+def daemon_command(command: str, cwd: str, env: dict) -> None:
+    subprocess.run([sys.executable, os.path.join(PLUGIN_ROOT, 'core', 'daemon.py'), command],
+                   cwd=cwd, env=env, capture_output=True, check=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--full', action='store_true', help='include 10,000-rule projects')
+    parser.add_argument('--runs', type=int, default=30, help='runs per configuration')
+    parser.add_argument('--daemon', action='store_true', help='also measure with the daemon running')
+    parser.add_argument('--output', default=os.path.join(PLUGIN_ROOT, 'benchmarks', 'results', 'hooks.json'))
+    args = parser.parse_args()
+    results = []
+
+    for count in (FULL_RULES if args.full else QUICK_RULES):
+        with tempfile.TemporaryDirectory(prefix='hookify-bench-') as project:
+            workloads.write_rules(workloads.generate_rules(count), project)
+            transcript = os.path.join(project, 'transcript.jsonl')
+            workloads.write_transcript(transcript, 1024 * 1024)
+
+            cases = [
+                ('pretooluse.py', 'bash', workloads.bash_payload()),
+                ('pretooluse.py', 'write-100KB', workloads.write_payload(100 * 1024)),
+                ('stop.py', 'stop-1MB', workloads.stop_payload(transcript)),
+            ]
+            modes = [('in-process', '0')] + ([('daemon', '1')] if args.daemon else [])
+
+            for mode, daemon_flag in modes:
+                env = dict(os.environ, CLAUDE_PLUGIN_ROOT=PLUGIN_ROOT, HOOKIFY_DAEMON=daemon_flag)
+                if mode == 'daemon':
+                    daemon_command('start', project, env)
+                try:
+                    for script, label, payload in cases:
+                        data = json.dumps(payload).encode('utf-8')
+                        first = run_hook(script, data, project, env)
+                        latencies = [run_hook(script, data, project, env) for _ in range(args.runs)]
+
+                        name = f'{mode}/{script}/{label}/{count}-rules'
+                        common = {'rules': count, 'runs': args.runs, 'higher_is_better': False}
+                        results.append(dict(common, name=name, metric='first_run_ms', value=first * 1000))
+                        results.append(dict(common, name=name, metric='p50_ms',
+                                            value=percentile(latencies, 0.50) * 1000))
+                        results.append(dict(common, name=name, metric='p99_ms',
+                                            value=percentile(latencies, 0.99) * 1000))
+                        print(f"{name:<55} first {first * 1000:8.1f} ms  "
+                              f"p50 {percentile(latencies, 0.50) * 1000:8.1f} ms  "
+                              f"p99 {percentile(latencies, 0.99) * 1000:8.1f} ms")
+                finally:
+                    if mode == 'daemon':
+                        daemon_command('stop', project, env)
+
+    write_results('hooks', results, args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Start-up import budget for the hookify hooks.
+
+Runs hooks/pretooluse.py under ``python3 -X importtime`` in three situations
+and fails if a hook imports a module it should not need there, or if its
+imports (beyond those of a bare interpreter) take longer than the budget:
+
+    no-rules    project without rule files: the hook must answer right away
+    daemon      rule files and a running daemon: only the socket client loads
+    in-process  rule files, no daemon: the rule engine loads, but nothing
+                specific to transcripts or huge literal sets
+
+Usage (from the plugin root):
+    python3 benchmarks/import_budget.py [--runs N] [--scale X] [--bundle dist/hookify.pyz]
+
+--scale multiplies every time budget (e.g. 2 on a slow CI machine); the
+forbidden-module checks do not depend on machine speed. For a bundle, the
+imports Python itself needs to run any zipapp (runpy) count as baseline.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import zipapp
+from typing import Dict, List, Optional, Tuple
+
+PLUGIN_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if os.path.dirname(PLUGIN_ROOT) not in sys.path:
+    sys.path.insert(0, os.path.dirname(PLUGIN_ROOT))
+
+from hookify.benchmarks import workloads
+
+# scenario -> (import time budget in ms, modules that must not be imported)
+BUDGETS: Dict[str, Tuple[float, List[str]]] = {
+    'no-rules': (3.0, [
+        'json', 're', 'socket', '_socket', 'typing', 'dataclasses',
+        'hookify.core.config_loader', 'hookify.core.rule_engine',
+    ]),
+    'daemon': (5.0, [
+        'json', 're', 'socket', 'typing', 'dataclasses', 'hashlib', 'tempfile',
+        'hookify.core.config_loader', 'hookify.core.rule_engine',
+    ]),
+    'in-process': (45.0, [
+        'socket', 'hashlib', 'tempfile', 'dataclasses', 'inspect',
+        'hookify.core.transcript', 'hookify.matchers.aho_corasick',
+    ]),
+}
+
+
+def _parse_line(line: str) -> Optional[Tuple[str, float]]:
+    """Parse one -X importtime line into (module, self time in ms)."""
+    if not line.startswith('import time:'):
+        return None
+    self_us, _, name = line[len('import time:'):].split('|')
+    if not self_us.strip().isdigit():
+        return None  # Header line
+    return name.strip(), int(self_us) / 1000
+
+
+def import_times(command: List[str], cwd: str, env: dict, payload: bytes) -> Dict[str, float]:
+    """Run a command with -X importtime and return {module: self time in ms}."""
+    completed = subprocess.run(
+        [command[0], '-X', 'importtime'] + command[1:],
+        input=payload, cwd=cwd, env=env, capture_output=True
+    )
+    modules = {}
+    for line in completed.stderr.decode('utf-8', errors='replace').splitlines():
+        parsed = _parse_line(line)
+        if parsed:
+            modules[parsed[0]] = parsed[1]
+    return modules
+
+
+def measure(command: List[str], cwd: str, env: dict, payload: bytes,
+            baseline: set, runs: int) -> Tuple[float, set]:
+    """Best-of-runs import time (ms) beyond the interpreter's own imports."""
+    best = None
+    imported = set()
+    for _ in range(runs):
+        modules = import_times(command, cwd, env, payload)
+        imported = set(modules)
+        total = sum(ms for name, ms in modules.items() if name not in baseline)
+        best = total if best is None else min(best, total)
+    return best, imported
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=5, help='runs per scenario (best is kept)')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply time budgets')
+    parser.add_argument('--bundle', help='check a zipapp built by scripts/build_bundle.py')
+    args = parser.parse_args()
+
+    if args.bundle:
+        command = [sys.executable, os.path.abspath(args.bundle), 'pretooluse']
+    else:
+        command = [sys.executable, os.path.join(PLUGIN_ROOT, 'hooks', 'pretooluse.py')]
+
+    # Measure steady state: let source runs reuse __pycache__
+    env = dict(os.environ, CLAUDE_PLUGIN_ROOT=PLUGIN_ROOT)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    payload = json.dumps(workloads.bash_payload()).encode('utf-8')
+    daemon = [sys.executable, os.path.join(PLUGIN_ROOT, 'core', 'daemon.py')]
+
+    with tempfile.TemporaryDirectory(prefix='hookify-imports-') as empty:
+        if args.bundle:
+            source = os.path.join(empty, 'source')
+            os.makedirs(source)
+            with open(os.path.join(source, '__main__.py'), 'w') as f:
+                f.write('pass\n')
+            zipapp.create_archive(source, os.path.join(empty, 'empty.pyz'))
+            baseline_command = [sys.executable, os.path.join(empty, 'empty.pyz')]
+        else:
+            baseline_command = [sys.executable, '-c', 'pass']
+        baseline = set(import_times(baseline_command, empty, env, b''))
+
+    failures = 0
+    for scenario, (budget_ms, forbidden) in BUDGETS.items():
+        with tempfile.TemporaryDirectory(prefix='hookify-imports-') as project:
+            if scenario != 'no-rules':
+                workloads.write_rules(workloads.generate_rules(100), project)
+
+            run_env = dict(env, HOOKIFY_DAEMON='0' if scenario == 'in-process' else '1')
+            if scenario == 'daemon':
+                subprocess.run(daemon + ['start'], cwd=project, env=run_env,
+                               capture_output=True, check=True)
+            try:
+                import_times(command, project, run_env, payload)  # Warm up caches
+                total_ms, imported = measure(command, project, run_env, payload, baseline, args.runs)
+            finally:
+                if scenario == 'daemon':
+                    subprocess.run(daemon + ['stop'], cwd=project, env=run_env, capture_output=True)
+
+        limit = budget_ms * args.scale
+        unexpected = sorted(m for m in forbidden if m in imported)
+        ok = total_ms <= limit and not unexpected
+        failures += 0 if ok else 1
+        print(f"{scenario:<12} {total_ms:7.2f} ms (budget {limit:.1f} ms)  {'ok' if ok else 'FAIL'}")
+        if unexpected:
+            print(f"  unexpected imports: {', '.join(unexpected)}")
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Machine-readable benchmark results for hookify.
+
+Each benchmark run writes one JSON document:
+
+    {
+      "suite": "engine",
+      "timestamp": "2026-01-01T12:00:00",
+      "environment": {"python": "3.11.7", "platform": "...", "git_commit": "..."},
+      "results": [
+        {"name": "...", "metric": "evals_per_sec", "value": 1234.5, "higher_is_better": true, ...},
+        ...
+      ]
+    }
+
+Usage:
+    python3 benchmarks/results.py compare baseline.json current.json [--threshold 0.10]
+
+compare exits with status 1 if any metric regressed by more than the threshold.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from typing import Any, Dict, List
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and revision the benchmark ran on."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'git_commit': commit,
+    }
+
+
+def write_results(suite: str, results: List[Dict[str, Any]], output: str) -> None:
+    """Write a suite's results as JSON to output (creating parent directories)."""
+    document = {
+        'suite': suite,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment(),
+        'results': results,
+    }
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(document, f, indent=2)
+        f.write('\n')
+    print(f"Wrote {len(results)} results to {output}")
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of values (fraction in 0..1)."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def compare(baseline_path: str, current_path: str, threshold: float = 0.10) -> int:
+    """Print per-metric changes between two result files.
+
+    Returns:
+        Number of metrics that regressed by more than threshold
+    """
+    with open(baseline_path) as f:
+        baseline = {(r['name'], r['metric']): r for r in json.load(f)['results']}
+    with open(current_path) as f:
+        current = json.load(f)['results']
+
+    regressions = 0
+    for result in current:
+        key = (result['name'], result['metric'])
+        old = baseline.get(key)
+        if not old or not old['value']:
+            continue
+
+        change = (result['value'] - old['value']) / old['value']
+        worse = -change if result.get('higher_is_better') else change
+        flag = ''
+        if worse > threshold:
+            flag = '  REGRESSION'
+            regressions += 1
+        print(f"{result['name']:<50} {result['metric']:<16} "
+              f"{old['value']:>12.3f} -> {result['value']:>12.3f} ({change:+.1%}){flag}")
+
+    return regressions
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 4 or sys.argv[1] != 'compare':
+        print(__doc__.strip().split('Usage:')[1], file=sys.stderr)
+        sys.exit(2)
+
+    threshold = 0.10
+    if '--threshold' in sys.argv:
+        threshold = float(sys.argv[sys.argv.index('--threshold') + 1])
+
+    sys.exit(1 if compare(sys.argv[2], sys.argv[3], threshold) else 0)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Synthetic rule sets and hook payloads for the hookify benchmarks.
+
+Everything is generated from a fixed seed so runs are comparable.
+"""
+
+import json
+import os
+import random
+from typing import Dict, List, Optional
+
+from hookify.core.config_loader import Condition, Rule
+
+# Operator mix for generated conditions (weights roughly follow real rule packs)
+OPERATORS = [
+    ('regex_match', 5),
+    ('contains', 3),
+    ('not_contains', 1),
+    ('equals', 1),
+    ('starts_with', 1),
+    ('ends_with', 1),
+]
+
+# Fields a generated rule may check, per event
+FIELDS = {
+    'bash': ['command'],
+    'file': ['file_path', 'new_text', 'content', 'old_text'],
+    'stop': ['transcript', 'reason'],
+    'prompt': ['user_prompt'],
+}
+
+# Regex shapes used for regex_match conditions ({w} is replaced by a random word)
+REGEX_TEMPLATES = [
+    r'{w}\s+-rf',
+    r'{w}\.log\(',
+    r'\b{w}_[A-Z]+\b',
+    r'(?:{w}|{w}2)\s*=\s*["\']',
+    r'\.{w}$',
+    r'{w}[0-9]{{2,4}}',
+]
+
+WORDS = [
+    'alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel',
+    'india', 'juliet', 'kilo', 'lima', 'mike', 'november', 'oscar', 'papa',
+    'quebec', 'romeo', 'sierra', 'tango', 'uniform', 'victor', 'whiskey',
+    'xray', 'yankee', 'zulu', 'secret', 'token', 'deploy', 'prod', 'internal',
+]
+
+
+def _word(rng: random.Random) -> str:
+    return f"{rng.choice(WORDS)}{rng.randint(0, 9999)}"
+
+
+def _pattern(rng: random.Random, operator: str) -> str:
+    if operator == 'regex_match':
+        return rng.choice(REGEX_TEMPLATES).format(w=_word(rng))
+    return _word(rng)
+
+
+def generate_rules(count: int, seed: int = 0, events: Optional[List[str]] = None) -> List[Rule]:
+    """Generate a rule set mixing operators, fields, events and tool matchers."""
+    rng = random.Random(seed)
+    events = events or ['bash', 'file', 'file', 'stop', 'prompt', 'all']
+    operators = [op for op, weight in OPERATORS for _ in range(weight)]
+    rules = []
+
+    for i in range(count):
+        event = rng.choice(events)
+        field_names = FIELDS.get(event) or FIELDS['bash'] + FIELDS['file']
+        conditions = []
+        for _ in range(rng.choice([1, 1, 2, 3])):
+            operator = rng.choice(operators)
+            conditions.append(Condition(
+                field=rng.choice(field_names),
+                operator=operator,
+                pattern=_pattern(rng, operator),
+            ))
+
+        tool_matcher = None
+        if event == 'file' and rng.random() < 0.3:
+            tool_matcher = rng.choice(['Edit', 'Write', 'Edit|Write|MultiEdit'])
+
+        rules.append(Rule(
+            name=f"bench-{i}",
+            enabled=True,
+            event=event,
+            conditions=conditions,
+            action='block' if rng.random() < 0.2 else 'warn',
+            tool_matcher=tool_matcher,
+            message=f"Benchmark rule {i} matched.",
+        ))
+
+    return rules
+
+
+def render_rule(rule: Rule) -> str:
+    """Render a rule as a .local.md file understood by config_loader."""
+    lines = [
+        '---',
+        f'name: {rule.name}',
+        f'enabled: {str(rule.enabled).lower()}',
+        f'event: {rule.event}',
+        f'action: {rule.action}',
+    ]
+    if rule.tool_matcher:
+        lines.append(f'tool_matcher: {rule.tool_matcher}')
+    lines.append('conditions:')
+    for condition in rule.conditions:
+        lines.append(f'  - field: {condition.field}')
+        lines.append(f'    operator: {condition.operator}')
+        lines.append(f'    pattern: {condition.pattern}')
+    lines.append('---')
+    lines.append('')
+    lines.append(rule.get_message())
+    return '\n'.join(lines) + '\n'
+
+
+def write_rules(rules: List[Rule], project_dir: str) -> None:
+    """Write rules as .claude/hookify.*.local.md files under project_dir."""
+    claude_dir = os.path.join(project_dir, '.claude')
+    os.makedirs(claude_dir, exist_ok=True)
+    for rule in rules:
+        with open(os.path.join(claude_dir, f'hookify.{rule.name}.local.md'), 'w') as f:
+            f.write(render_rule(rule))
+
+
+def _text(size: int, seed: int) -> str:
+    """Source-code-like text of roughly size characters."""
+    rng = random.Random(seed)
+    line_templates = [
+        'const {w} = require("./{w}");',
+        'function {w}(a, b) {{ return a + b; }}',
+        '    if ({w} > 10) {{ console.warn("{w}"); }}',
+        '# {w} {w} {w}',
+        'export default {w};',
+        '',
+    ]
+    parts = []
+    total = 0
+    while total < size:
+        line = rng.choice(line_templates).format(w=_word(rng)) + '\n'
+        parts.append(line)
+        total += len(line)
+    return ''.join(parts)[:size]
+
+
+def bash_payload() -> Dict:
+    return {
+        'hook_event_name': 'PreToolUse',
+        'session_id': 'bench',
+        'tool_name': 'Bash',
+        'tool_input': {'command': 'npm test -- --watch=false && git status'},
+    }
+
+
+def write_payload(size: int) -> Dict:
+    return {
+        'hook_event_name': 'PreToolUse',
+        'session_id': 'bench',
+        'tool_name': 'Write',
+        'tool_input': {'file_path': 'src/components/app.ts', 'content': _text(size, seed=size)},
+    }
+
+
+def multiedit_payload(size: int, edits: int = 20) -> Dict:
+    per_edit = max(1, size // edits)
+    return {
+        'hook_event_name': 'PreToolUse',
+        'session_id': 'bench',
+        'tool_name': 'MultiEdit',
+        'tool_input': {
+            'file_path': 'src/server/handler.py',
+            'edits': [
+                {'old_string': _text(per_edit // 4, seed=i), 'new_string': _text(per_edit, seed=i + 1)}
+                for i in range(edits)
+            ],
+        },
+    }
+
+
+def stop_payload(transcript_path: str, session_id: Optional[str] = None) -> Dict:
+    payload = {
+        'hook_event_name': 'Stop',
+        'transcript_path': transcript_path,
+        'reason': 'Task complete',
+    }
+    if session_id:
+        payload['session_id'] = session_id
+    return payload
+
+
+def write_transcript(path: str, size: int, seed: int = 0) -> None:
+    """Write a JSONL session transcript of about size bytes."""
+    rng = random.Random(seed)
+    # Reuse a pool of entries so multi-GB transcripts are quick to generate
+    pool = [
+        json.dumps({
+            'type': rng.choice(['user', 'assistant']),
+            'message': {'content': _text(rng.randint(200, 4000), seed=i)},
+        }) + '\n'
+        for i in range(256)
+    ]
+    written = 0
+    with open(path, 'w') as f:
+        while written < size:
+            line = rng.choice(pool)
+            f.write(line)
+            written += len(line)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""Thin client for the hookify evaluation daemon.
+
+The hook scripts use this module to forward their stdin payload to a
+long-lived daemon (see daemon.py) instead of loading and parsing every rule
+file themselves. Hooks import it before anything else, so at module level it
+only imports os; everything else is imported where it is needed. A hook that
+finds no rule files, or that gets its answer from the daemon, never loads json,
+re or the rule engine.
+"""
+
+import os
+
+# Seconds to wait for the daemon before falling back to in-process evaluation.
+# Kept well below the 10 second hook timeout in hooks.json.
+CLIENT_TIMEOUT = 5.0
+
+
+# Rule files are .claude/hookify.*.local.md
+RULE_PREFIX = 'hookify.'
+RULE_SUFFIX = '.local.md'
+
+
+def has_rule_files(claude_dir: str = '.claude') -> bool:
+    """Cheaply check whether the project has any hookify rule files.
+
+    Uses one directory listing rather than glob so hooks can exit before
+    importing the rule engine when there is nothing to evaluate.
+    """
+    try:
+        names = os.listdir(claude_dir)
+    except OSError:
+        return False
+    min_length = len(RULE_PREFIX) + len(RULE_SUFFIX)
+    return any(
+        len(name) >= min_length and name.startswith(RULE_PREFIX) and name.endswith(RULE_SUFFIX)
+        for name in names
+    )
+
+
+def resolve_event(hook: str, input_data: dict):
+    """Map a hook name and its input to the rule event used for filtering.
+
+    Args:
+        hook: Hook script name ("pretooluse", "posttooluse", "stop", "userpromptsubmit")
+        input_data: Parsed hook input JSON
+
+    Returns:
+        Event name ("bash", "file", "stop", "prompt") or None for all events
+    """
+    if hook == 'stop':
+        return 'stop'
+    if hook == 'userpromptsubmit':
+        return 'prompt'
+
+    # PreToolUse/PostToolUse: use tool_name to determine "bash" vs "file" event
+    tool_name = input_data.get('tool_name', '')
+    if tool_name == 'Bash':
+        return 'bash'
+    elif tool_name in ['Edit', 'Write', 'MultiEdit']:
+        return 'file'
+    return None
+
+
+def socket_path(project_dir: str = None) -> str:
+    """Get the daemon socket path for a project directory.
+
+    Rules are loaded relative to the project directory, so each project gets
+    its own daemon. The socket lives in a per-user directory under the system
+    temp dir to stay within the Unix socket path length limit.
+    """
+    # zlib checksums instead of hashlib/tempfile, which add several
+    # milliseconds of imports to every hook call
+    import zlib
+
+    project_dir = os.path.abspath(project_dir or os.getcwd()).encode('utf-8')
+    digest = f'{zlib.crc32(project_dir):08x}{zlib.adler32(project_dir):08x}'
+    temp_dir = os.environ.get('TMPDIR') or os.environ.get('TEMP') or os.environ.get('TMP') or '/tmp'
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    return os.path.join(temp_dir, f'hookify-{uid}', f'{digest}.sock')
+
+
+def socket_dir_problem(directory: str):
+    """Return why a socket directory must not be used, or None if it is safe.
+
+    The directory sits in a shared temp dir where anyone can create it first.
+    It must be a real directory (not a symlink), owned by the current user
+    and accessible to nobody else. Otherwise another user could plant a
+    socket that answers hooks with any decision, or read the hook inputs.
+    """
+    import stat  # Already loaded by os
+
+    if not hasattr(os, 'getuid'):
+        return 'file ownership cannot be checked on this platform'
+    try:
+        st = os.lstat(directory)
+    except OSError as e:
+        return str(e)
+    if not stat.S_ISDIR(st.st_mode):
+        return f'{directory} is not a directory'
+    if st.st_uid != os.getuid():
+        return f'{directory} is owned by uid {st.st_uid}, not {os.getuid()}'
+    if stat.S_IMODE(st.st_mode) != 0o700:
+        return f'{directory} has mode {stat.S_IMODE(st.st_mode):o}, not 700'
+    return None
+
+
+def is_trusted_socket(path: str) -> bool:
+    """Check that path is a socket of the current user in a private directory."""
+    import stat
+
+    if socket_dir_problem(os.path.dirname(path)) is not None:
+        return False
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+def _exchange(path: str, request: bytes, timeout: float) -> bytes:
+    """Send a raw request over the daemon socket and return the raw reply."""
+    # The socket module wraps the _socket C module and pulls in selectors,
+    # enum and collections (~10 ms); the C module alone is all that is needed
+    try:
+        import _socket as socket
+    except ImportError:
+        import socket
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(request)
+        sock.shutdown(socket.SHUT_WR)
+
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        sock.close()
+
+    return b''.join(chunks)
+
+
+def send_request(header: dict, payload: bytes = b'', timeout: float = CLIENT_TIMEOUT,
+                 path: str = None) -> dict:
+    """Send one request to the daemon and return its decoded JSON reply.
+
+    The wire format is a single JSON header line followed by the raw payload.
+    The daemon replies with one JSON document and closes the connection.
+
+    Raises:
+        OSError: If the daemon cannot be reached or its socket is not trusted
+        ValueError: If the reply is not valid JSON
+    """
+    import json
+
+    path = path or socket_path()
+    if not is_trusted_socket(path):
+        raise OSError(f'No trusted daemon socket at {path}')
+    reply = _exchange(path, json.dumps(header).encode('utf-8') + b'\n' + payload, timeout)
+    return json.loads(reply.decode('utf-8'))
+
+
+def request_evaluation(hook: str, raw_input: str):
+    """Ask a running daemon to evaluate the hook input.
+
+    Args:
+        hook: Hook script name (see resolve_event)
+        raw_input: Raw stdin payload, forwarded without parsing
+
+    Returns:
+        The daemon's JSON response text, passed through without decoding, or
+        None if no daemon is available (the caller should then evaluate rules
+        in-process).
+    """
+    if os.environ.get('HOOKIFY_DAEMON') == '0':
+        return None
+
+    # Only a daemon of the current user is asked; anything else could
+    # answer with any decision
+    path = socket_path()
+    if not is_trusted_socket(path):
+        return None
+
+    try:
+        # Hook names are plain identifiers, so the header needs no JSON encoder
+        header = f'{{"hook": "{hook}"}}\n'.encode('utf-8')
+        reply = _exchange(path, header + raw_input.encode('utf-8'), CLIENT_TIMEOUT).strip()
+    except (OSError, AttributeError, UnicodeError):
+        return None  # AttributeError: no AF_UNIX on this platform
+
+    # Anything but a JSON object means the daemon failed mid-reply
+    if not (reply.startswith(b'{') and reply.endswith(b'}')):
+        return None
+    return reply.decode('utf-8', errors='replace')
+
+
+def evaluate_hook(hook: str, raw_input: str) -> str:
+    """Answer one hook call: no rule files, the daemon, or in-process rules.
+
+    The hook scripts and the combined PreToolUse dispatcher in
+    examples/hooks all go through this function, so they share the
+    daemon, the decision cache and the selective JSON decoding.
+
+    Args:
+        hook: Hook script name (see resolve_event)
+        raw_input: Raw stdin payload
+
+    Returns:
+        The JSON response text for the hook to print
+    """
+    # No rule files - answer before importing json or the rule engine
+    if not has_rule_files():
+        return '{}'
+
+    # Forward to the evaluation daemon if one is running
+    reply = request_evaluation(hook, raw_input)
+    if reply is not None:
+        return reply
+
+    # No daemon - evaluate rules in-process
+    import json
+    from hookify.core.decision_cache import open_decision_cache
+    from hookify.core.json_select import HEADER_SPEC, input_spec, select
+
+    # An identical input earlier in the session may already be decided
+    cache = open_decision_cache(hook)
+    cached = cache.get(raw_input) if cache is not None else None
+    if cached is not None:
+        return cached
+
+    from hookify.core.config_loader import load_rules
+    from hookify.core.rule_engine import RuleEngine, input_fields
+
+    rules = load_rules(event=resolve_event(hook, select(raw_input, HEADER_SPEC)))
+
+    # Decode only the parts of the input the rules read
+    input_data = select(raw_input, input_spec(input_fields(rules)))
+
+    engine = RuleEngine()
+    output = json.dumps(engine.evaluate_rules(rules, input_data))
+    if cache is not None:
+        cache.put(input_data, rules, engine, output)
+    return output
@@ -7,17 +7,66 @@ Loads and parses .claude/hookify.*.local.md files.
 import os
 import sys
 import glob
+import json
 import re
-from typing import List, Optional, Dict, Any
-from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Tuple
 
+from hookify.core.settings import CACHE_DIR, make_cache_dir
 
-@dataclass
-class Condition:
+
+class _Record:
+    """Base for plain record classes: keyword construction, repr and equality.
+
+    Used instead of dataclasses, whose import (with inspect, ast and dis)
+    adds about 10 ms to every hook that evaluates rules in-process.
+    Subclasses list their fields with defaults in _FIELDS.
+    """
+
+    _FIELDS: tuple = ()  # (name, default) pairs; defaults are copied
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        if len(args) > len(self._FIELDS):
+            raise TypeError(f"{type(self).__name__}() takes at most {len(self._FIELDS)} arguments")
+        for (name, default), value in zip(self._FIELDS, args):
+            if name in kwargs:
+                raise TypeError(f"{type(self).__name__}() got multiple values for {name!r}")
+            kwargs[name] = value
+        for name, default in self._FIELDS:
+            if name in kwargs:
+                setattr(self, name, kwargs.pop(name))
+            elif default is _REQUIRED:
+                raise TypeError(f"{type(self).__name__}() missing argument {name!r}")
+            else:
+                setattr(self, name, list(default) if isinstance(default, list) else default)
+        if kwargs:
+            raise TypeError(f"{type(self).__name__}() got unexpected arguments {sorted(kwargs)}")
+
+    def __repr__(self) -> str:
+        values = ', '.join(f'{name}={getattr(self, name)!r}' for name, _ in self._FIELDS)
+        return f'{type(self).__name__}({values})'
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name, _ in self._FIELDS)
+
+    __hash__ = None  # Mutable, like a dataclass with eq=True
+
+
+_REQUIRED = object()
+
+
+class Condition(_Record):
     """A single condition for matching."""
-    field: str  # "command", "new_text", "old_text", "file_path", etc.
-    operator: str  # "regex_match", "contains", "equals", etc.
-    pattern: str  # Pattern to match
+
+    _FIELDS = (
+        ('field', _REQUIRED),  # "command", "new_text", "old_text", "file_path", etc.
+        ('operator', _REQUIRED),  # "regex_match", "contains", "equals", etc.
+        ('pattern', _REQUIRED),  # Pattern to match
+        # For field paths such as "edits[*].new_string": "any" or "all" elements
+        # must match (None = "all" for not_contains, "any" otherwise)
+        ('match', None),
+    )
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Condition':
@@ -25,21 +74,32 @@ class Condition:
         return cls(
             field=data.get('field', ''),
             operator=data.get('operator', 'regex_match'),
-            pattern=data.get('pattern', '')
+            pattern=data.get('pattern', ''),
+            match=data.get('match')
         )
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert Condition to a JSON-serializable dict."""
+        data = {'field': self.field, 'operator': self.operator, 'pattern': self.pattern}
+        if self.match is not None:
+            data['match'] = self.match
+        return data
+
 
-@dataclass
-class Rule:
+class Rule(_Record):
     """A hookify rule."""
-    name: str
-    enabled: bool
-    event: str  # "bash", "file", "stop", "all", etc.
-    pattern: Optional[str] = None  # Simple pattern (legacy)
-    conditions: List[Condition] = field(default_factory=list)
-    action: str = "warn"  # "warn" or "block" (future)
-    tool_matcher: Optional[str] = None  # Override tool matching
-    message: str = ""  # Message body from markdown
+
+    _FIELDS = (
+        ('name', _REQUIRED),
+        ('enabled', _REQUIRED),
+        ('event', _REQUIRED),  # "bash", "file", "stop", "all", etc.
+        ('pattern', None),  # Simple pattern (legacy)
+        ('conditions', []),  # List[Condition]
+        ('action', "warn"),  # "warn" or "block" (future)
+        ('tool_matcher', None),  # Override tool matching
+        ('message', ""),  # Message body from markdown (None = not loaded yet)
+        ('source', None),  # Rule file the rule was loaded from
+    )
 
     @classmethod
     def from_dict(cls, frontmatter: Dict[str, Any], message: str) -> 'Rule':
@@ -83,6 +143,43 @@ class Rule:
             message=message.strip()
         )
 
+    @classmethod
+    def from_cache(cls, data: Dict[str, Any], source: str) -> 'Rule':
+        """Create Rule from a rule cache entry.
+
+        The message body is not stored in the cache; it is read from the
+        source file on first use (see get_message).
+        """
+        return cls(
+            name=data['name'],
+            enabled=data['enabled'],
+            event=data['event'],
+            pattern=data.get('pattern'),
+            conditions=[Condition.from_dict(c) for c in data.get('conditions', [])],
+            action=data.get('action', 'warn'),
+            tool_matcher=data.get('tool_matcher'),
+            message=None,
+            source=source
+        )
+
+    def to_cache(self) -> Dict[str, Any]:
+        """Convert Rule to a rule cache entry (without the message body)."""
+        return {
+            'name': self.name,
+            'enabled': self.enabled,
+            'event': self.event,
+            'pattern': self.pattern,
+            'conditions': [c.to_dict() for c in self.conditions],
+            'action': self.action,
+            'tool_matcher': self.tool_matcher,
+        }
+
+    def get_message(self) -> str:
+        """Return the message body, loading it from the rule file if needed."""
+        if self.message is None:
+            self.message = load_rule_message(self.source) if self.source else ''
+        return self.message
+
 
 def extract_frontmatter(content: str) -> tuple[Dict[str, Any], str]:
     """Extract YAML frontmatter and message body from markdown.
@@ -195,9 +292,20 @@ def extract_frontmatter(content: str) -> tuple[Dict[str, Any], str]:
     return frontmatter, message
 
 
+# Parsed rules (and parse failures) are cached here, keyed by rule file
+# mtime and size
+CACHE_FILE = os.path.join(CACHE_DIR, 'rules.json')
+CACHE_VERSION = 2
+
+
 def load_rules(event: Optional[str] = None) -> List[Rule]:
     """Load all hookify rules from .claude directory.
 
+    Rule files whose mtime and size match the on-disk cache are not re-read;
+    only new or modified files are parsed. Files that failed to parse are
+    cached too: their error is reported again without re-reading them.
+    Message bodies of cached rules are loaded lazily via Rule.get_message().
+
     Args:
         event: Optional event filter ("bash", "file", "stop", etc.)
 
@@ -210,11 +318,30 @@ def load_rules(event: Optional[str] = None) -> List[Rule]:
     pattern = os.path.join('.claude', 'hookify.*.local.md')
     files = glob.glob(pattern)
 
+    cache = _read_cache()
+    new_cache = {}
+
     for file_path in files:
         try:
-            rule = load_rule_file(file_path)
-            if not rule:
-                continue
+            st = os.stat(file_path)
+            entry = cache.get(file_path)
+
+            if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+                if entry['rule'] is None:
+                    new_cache[file_path] = entry
+                    print(entry['error'], file=sys.stderr)
+                    continue
+                rule = Rule.from_cache(entry['rule'], file_path)
+            else:
+                rule, error = parse_rule_file(file_path)
+                if not rule:
+                    print(error, file=sys.stderr)
+                    new_cache[file_path] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size,
+                                            'rule': None, 'error': error}
+                    continue
+                entry = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'rule': rule.to_cache()}
+
+            new_cache[file_path] = entry
 
             # Filter by event if specified
             if event:
@@ -238,15 +365,61 @@ def load_rules(event: Optional[str] = None) -> List[Rule]:
             print(f"Warning: Unexpected error loading {file_path} ({type(e).__name__}): {e}", file=sys.stderr)
             continue
 
+    if new_cache != cache:
+        _write_cache(new_cache)
+
     return rules
 
 
+def _read_cache() -> Dict[str, Any]:
+    """Read the rule cache, returning {} if missing, stale or corrupt."""
+    try:
+        with open(CACHE_FILE, 'r') as f:
+            data = json.load(f)
+        if data.get('version') != CACHE_VERSION:
+            return {}
+        return data.get('files', {})
+    except (IOError, OSError, ValueError, AttributeError):
+        return {}
+
+
+def _write_cache(files: Dict[str, Any]) -> None:
+    """Atomically write the rule cache. Failures are ignored."""
+    try:
+        make_cache_dir(CACHE_DIR)
+        tmp_path = f"{CACHE_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'files': files}, f)
+        os.replace(tmp_path, CACHE_FILE)
+    except (IOError, OSError, TypeError, ValueError):
+        pass
+
+
 def load_rule_file(file_path: str) -> Optional[Rule]:
     """Load a single rule file.
 
     Returns:
         Rule object or None if file is invalid.
     """
+    try:
+        rule, error = parse_rule_file(file_path)
+    except (IOError, OSError, PermissionError) as e:
+        print(f"Error: Cannot read {file_path}: {e}", file=sys.stderr)
+        return None
+    if error is not None:
+        print(error, file=sys.stderr)
+    return rule
+
+
+def parse_rule_file(file_path: str) -> Tuple[Optional[Rule], Optional[str]]:
+    """Load a single rule file without reporting problems.
+
+    Returns:
+        (rule, None), or (None, message) if the file is invalid
+
+    Raises:
+        OSError: If the file cannot be read (a later call may succeed)
+    """
     try:
         with open(file_path, 'r') as f:
             content = f.read()
@@ -254,24 +427,36 @@ def load_rule_file(file_path: str) -> Optional[Rule]:
         frontmatter, message = extract_frontmatter(content)
 
         if not frontmatter:
-            print(f"Warning: {file_path} missing YAML frontmatter (must start with ---)", file=sys.stderr)
-            return None
+            return None, f"Warning: {file_path} missing YAML frontmatter (must start with ---)"
 
         rule = Rule.from_dict(frontmatter, message)
-        return rule
+        rule.source = file_path
+        return rule, None
 
-    except (IOError, OSError, PermissionError) as e:
-        print(f"Error: Cannot read {file_path}: {e}", file=sys.stderr)
-        return None
+    except (IOError, OSError, PermissionError):
+        raise  # Not cached: the file may be readable next time
     except (ValueError, KeyError, AttributeError, TypeError) as e:
-        print(f"Error: Malformed rule file {file_path}: {e}", file=sys.stderr)
-        return None
+        return None, f"Error: Malformed rule file {file_path}: {e}"
     except UnicodeDecodeError as e:
-        print(f"Error: Invalid encoding in {file_path}: {e}", file=sys.stderr)
-        return None
+        return None, f"Error: Invalid encoding in {file_path}: {e}"
     except Exception as e:
-        print(f"Error: Unexpected error parsing {file_path} ({type(e).__name__}): {e}", file=sys.stderr)
-        return None
+        return None, f"Error: Unexpected error parsing {file_path} ({type(e).__name__}): {e}"
+
+
+def load_rule_message(file_path: str) -> str:
+    """Load just the message body of a rule file.
+
+    Returns:
+        Message body, or empty string if the file cannot be read.
+    """
+    try:
+        with open(file_path, 'r') as f:
+            content = f.read()
+        _, message = extract_frontmatter(content)
+        return message.strip()
+    except (IOError, OSError, UnicodeDecodeError) as e:
+        print(f"Warning: Cannot read message from {file_path}: {e}", file=sys.stderr)
+        return ''
 
 
 # For testing
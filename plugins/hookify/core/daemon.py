@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Long-lived rule evaluation daemon for hookify plugin.
+
+Keeps the parsed rules (and their compiled regexes) in memory and serves hook
+evaluations over a per-project Unix socket. Rule files are re-checked on every
+request and reloaded as soon as one is added, removed or modified, so edits
+still take effect on the very next tool use.
+
+Usage (from the project root):
+    python3 /path/to/hookify/core/daemon.py start    # start in background
+    python3 /path/to/hookify/core/daemon.py serve    # run in foreground
+    python3 /path/to/hookify/core/daemon.py status
+    python3 /path/to/hookify/core/daemon.py stop
+"""
+
+import os
+import sys
+import json
+import glob
+import time
+import subprocess
+import socketserver
+from typing import Any, Dict, List, Optional, Tuple
+
+# Running this file directly: put the hookify package on sys.path
+if __name__ == '__main__':
+    import runpy
+    runpy.run_path(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'utils', 'script_path.py'))
+
+from hookify.core.client import CLIENT_TIMEOUT, resolve_event, send_request, socket_dir_problem, socket_path
+from hookify.core.config_loader import Rule, load_rules
+from hookify.core.json_select import input_spec, select
+from hookify.core.rule_engine import RuleEngine, input_fields
+from hookify.core.settings import SETTINGS_FILE
+
+# Shut down after this many seconds without a request
+IDLE_TIMEOUT = 30 * 60
+
+# Evaluations end this many seconds before the client stops waiting for the
+# daemon (and would start evaluating all over again in-process)
+DEADLINE_MARGIN = 0.5
+
+
+def rules_fingerprint() -> Tuple[Tuple[str, int, int], ...]:
+    """Return (path, mtime_ns, size) for every rule file and the settings file, sorted by path."""
+    entries = []
+    for file_path in glob.glob(os.path.join('.claude', 'hookify.*.local.md')) + [SETTINGS_FILE]:
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            continue
+        entries.append((file_path, st.st_mtime_ns, st.st_size))
+    return tuple(sorted(entries))
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handles a single hook request: header line, raw payload, JSON reply."""
+
+    def handle(self):
+        server: HookifyDaemon = self.server
+        try:
+            header = json.loads(self.rfile.readline().decode('utf-8') or '{}')
+            payload = self.rfile.read()
+            reply = server.dispatch(header, payload)
+        except Exception as e:
+            reply = {"systemMessage": f"Hookify error: {str(e)}"}
+        self.wfile.write(json.dumps(reply).encode('utf-8'))
+
+
+class HookifyDaemon(socketserver.UnixStreamServer):
+    """Unix socket server that evaluates hook payloads against cached rules.
+
+    Requests are served one at a time on the main thread, so the rule cache
+    needs no locking.
+    """
+
+    def __init__(self, path: str, idle_timeout: float = IDLE_TIMEOUT):
+        self.socket_file = path
+        self.idle_timeout = idle_timeout
+        self.engine = RuleEngine()
+        self._fingerprint = None
+        self._rules: Optional[List[Rule]] = None
+        self._input_spec: Dict[str, Any] = {'*': True}  # Input keys the rules read
+        self._shutdown_requested = False
+
+        # makedirs accepts an existing directory whatever its owner and mode
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        problem = socket_dir_problem(os.path.dirname(path))
+        if problem is not None:
+            raise OSError(f"Refusing to serve on {path}: {problem}")
+        if os.path.lexists(path):
+            os.unlink(path)
+        super().__init__(path, _RequestHandler)
+        os.chmod(path, 0o600)
+
+    def get_rules(self) -> List[Rule]:
+        """Return all enabled rules, reloading if any rule file changed.
+
+        Rules for every event are kept in one list; the engine's dispatch
+        index selects the ones for each request's event and tool. Settings
+        are re-read together with the rules.
+        """
+        fingerprint = rules_fingerprint()
+        if fingerprint != self._fingerprint or self._rules is None:
+            self._fingerprint = fingerprint
+            self._rules = load_rules()
+            self._input_spec = input_spec(input_fields(self._rules))
+            self.engine.configure()
+            self.engine.deadline = min(self.engine.deadline or CLIENT_TIMEOUT,
+                                       CLIENT_TIMEOUT - DEADLINE_MARGIN)
+            if self.engine.telemetry is not None:
+                # Batches are written off the request path
+                self.engine.telemetry.start_background()
+        return self._rules
+
+    def dispatch(self, header: dict, payload: bytes) -> dict:
+        """Dispatch a decoded request.
+
+        Args:
+            header: Request header ({"hook": name} or {"command": name})
+            payload: Raw hook input JSON
+
+        Returns:
+            Response dict to send back to the client
+        """
+        command = header.get('command')
+        if command == 'ping':
+            return {"status": "ok", "pid": os.getpid(), "cwd": os.getcwd(),
+                    "stats": self.engine.stats.to_dict()}
+        elif command == 'shutdown':
+            self._shutdown_requested = True
+            return {"status": "stopping"}
+
+        rules = self.get_rules()
+        input_data = select(payload.decode('utf-8'), self._input_spec)
+        event = resolve_event(header.get('hook', ''), input_data)
+        return self.engine.evaluate_rules(rules, input_data, event=event)
+
+    def finish_request(self, request, client_address):
+        self._last_request = time.monotonic()
+        super().finish_request(request, client_address)
+
+    def serve(self):
+        """Serve requests until shutdown is requested or the idle timeout expires."""
+        self.timeout = 1.0
+        self._last_request = time.monotonic()
+        try:
+            while not self._shutdown_requested:
+                if time.monotonic() - self._last_request > self.idle_timeout:
+                    break
+                self.handle_request()
+        finally:
+            self.server_close()
+            try:
+                os.unlink(self.socket_file)
+            except OSError:
+                pass
+
+
+def _ping(path: str) -> Optional[dict]:
+    try:
+        return send_request({'command': 'ping'}, timeout=1.0, path=path)
+    except (OSError, ValueError):
+        return None
+
+
+def main(argv: List[str]) -> int:
+    """Command line entry point."""
+    command = argv[1] if len(argv) > 1 else 'status'
+    path = socket_path()
+
+    if command == 'serve':
+        if _ping(path):
+            print(f"hookify daemon already running on {path}", file=sys.stderr)
+            return 1
+        try:
+            daemon = HookifyDaemon(path)
+        except OSError as e:
+            # Hooks keep evaluating in-process
+            print(f"hookify daemon: {e}", file=sys.stderr)
+            return 1
+        daemon.serve()
+        return 0
+
+    elif command == 'start':
+        if _ping(path):
+            print(f"hookify daemon already running on {path}")
+            return 0
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), 'serve'],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, start_new_session=True
+        )
+        for _ in range(50):
+            if _ping(path):
+                print(f"hookify daemon started on {path}")
+                return 0
+            time.sleep(0.1)
+        print("hookify daemon failed to start", file=sys.stderr)
+        return 1
+
+    elif command == 'stop':
+        try:
+            send_request({'command': 'shutdown'}, timeout=1.0, path=path)
+        except (OSError, ValueError):
+            print("hookify daemon is not running")
+            return 0
+        print("hookify daemon stopped")
+        return 0
+
+    elif command == 'status':
+        info = _ping(path)
+        if info:
+            print(f"hookify daemon running (pid {info['pid']}) for {info['cwd']}")
+            for name, value in info.get('stats', {}).items():
+                print(f"  {name}: {value}")
+        else:
+            print("hookify daemon is not running")
+        return 0
+
+    print(f"Unknown command: {command} (expected start, serve, stop or status)", file=sys.stderr)
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
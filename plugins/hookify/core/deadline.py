@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Time budget for one rule evaluation in hookify plugin.
+
+Hooks are killed by Claude Code when they exceed their timeout (10 seconds in
+hooks.json), and a killed hook reports nothing. The engine instead evaluates
+under a Deadline slightly shorter than that: I/O-bound field fetches (such as
+reading the transcript) run in background threads, and once the deadline
+passes the engine stops waiting and answers with the rules it could evaluate.
+
+A running regex cannot be interrupted: re holds the GIL until it returns, and
+SIGALRM (the regex timeout) is only delivered to the main thread. Regexes that
+may backtrack catastrophically are therefore kept out of the background
+transcript scan and matched on the main thread under the regex timeout.
+"""
+
+import time
+from typing import Any, Callable, Optional
+
+
+class DeadlineExceeded(Exception):
+    """The evaluation ran out of time."""
+
+
+class Deadline:
+    """A point in time after which evaluation gives up (seconds <= 0: never)."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds if seconds > 0 else None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (never negative), or None without a deadline."""
+        if self.expires is None:
+            return None
+        return max(0.0, self.expires - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.expires is not None and time.monotonic() >= self.expires
+
+
+class BackgroundTask:
+    """Runs a function in a daemon thread; the result is waited for with a deadline.
+
+    Daemon threads do not keep the process alive, so a hook that gives up on
+    a slow fetch can still exit right away.
+    """
+
+    def __init__(self, func: Callable, *args: Any, **kwargs: Any):
+        # Only evaluations with I/O-bound fields pay for the import
+        import threading
+
+        self._done = threading.Event()
+        self._result: Any = None
+        self._error: Optional[BaseException] = None
+        thread = threading.Thread(target=self._run, args=(func, args, kwargs), daemon=True)
+        thread.start()
+
+    def _run(self, func: Callable, args: tuple, kwargs: dict) -> None:
+        try:
+            self._result = func(*args, **kwargs)
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._done.set()
+
+    def result(self, deadline: Deadline) -> Any:
+        """Return the function's result, re-raising its exception.
+
+        Raises:
+            DeadlineExceeded: If the deadline passes first
+        """
+        if not self._done.wait(deadline.remaining()):
+            raise DeadlineExceeded()
+        if self._error is not None:
+            raise self._error
+        return self._result
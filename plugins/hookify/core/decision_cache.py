@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""Session-scoped cache of hook decisions for hookify plugin.
+
+Agents repeat the same tool calls (`npm test`, `git status`, the same edit)
+many times per session. With the cache enabled, a hook that evaluates rules
+in-process stores its response in .claude/.hookify-cache/decisions.sqlite.
+The next hook process that sees an identical input gets the stored response
+without loading the rules or importing the rule engine.
+
+A decision is keyed by a hash of:
+
+- the ruleset version: the size and mtime of every rule file and of the
+  settings file, the HOOKIFY_* environment and every source file of the
+  core and matchers packages
+- the hook, session, hook event and tool name
+- only the input fields that the rules for this event actually read
+
+Events whose rules read the transcript (or any other state outside the hook
+input) are never cached, and neither are responses from evaluations in which
+a regex timed out or the deadline passed. The least recently used decisions
+are evicted once the cache holds more than decision_cache_size entries.
+
+Each decision keeps the names and actions of the rules it matched, so a
+cache hit still writes its telemetry records (see telemetry.py).
+
+Enable it with {"decision_cache": true} in .claude/hookify.settings.local.json
+or HOOKIFY_DECISION_CACHE=1.
+"""
+
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from hookify.core.client import RULE_PREFIX, RULE_SUFFIX, resolve_event
+from hookify.core.settings import CACHE_DIR, SETTINGS_FILE, get_number_setting, get_setting, load_settings
+from hookify.core.settings import make_cache_dir
+from hookify.core.telemetry import get_sink, telemetry_path
+
+CACHE_FILE = os.path.join(CACHE_DIR, 'decisions.sqlite')
+
+DEFAULT_MAX_ENTRIES = 5000
+SCHEMA_VERSION = 2
+
+# Seconds to wait for another hook process holding the database lock
+LOCK_TIMEOUT = 1.0
+
+# Fields whose value depends on state outside the hook input
+UNCACHEABLE_FIELDS = ('transcript',)
+
+# Packages whose source changes (e.g. a plugin update) invalidate decisions.
+# All their modules are included, so a new module on the evaluation path
+# cannot be missed.
+_ENGINE_PACKAGES = ('core', 'matchers')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS rulesets (
+    version TEXT NOT NULL,
+    hook TEXT NOT NULL,
+    event TEXT NOT NULL,
+    inputs TEXT,  -- JSON of the input keys read; NULL = not cacheable
+    PRIMARY KEY (version, hook, event)
+);
+CREATE TABLE IF NOT EXISTS decisions (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    matches TEXT NOT NULL,  -- JSON [[rule name, action], ...] for telemetry
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS decisions_used ON decisions (used);
+'''
+
+# Tables of an older schema are replaced; their decisions are unreachable
+# anyway, since the schema version is part of every key
+_MIGRATE = f'''
+BEGIN IMMEDIATE;
+DROP TABLE IF EXISTS rulesets;
+DROP TABLE IF EXISTS decisions;
+{_SCHEMA}
+PRAGMA user_version = {SCHEMA_VERSION};
+COMMIT;
+'''
+
+
+def ruleset_version(claude_dir: str = '.claude') -> str:
+    """Return a version string that changes whenever a decision could change.
+
+    Only stats files, so it is cheap enough for every hook call.
+    """
+    # The blake2 C module alone; hashlib would load OpenSSL (~4 ms)
+    try:
+        from _blake2 import blake2b
+    except ImportError:
+        from hashlib import blake2b
+
+    parts = [f'schema={SCHEMA_VERSION}']
+    try:
+        names = sorted(n for n in os.listdir(claude_dir)
+                       if n.startswith(RULE_PREFIX) and n.endswith(RULE_SUFFIX))
+    except OSError:
+        names = []
+    paths = [os.path.join(claude_dir, n) for n in names] + [SETTINGS_FILE] + _engine_files()
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        parts.append(f'{path}:{st.st_mtime_ns}:{st.st_size}')
+    parts.extend(f'{k}={v}' for k, v in sorted(os.environ.items()) if k.startswith('HOOKIFY_'))
+    return blake2b('\n'.join(parts).encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+
+def _engine_files() -> List[str]:
+    """Return the source files of the engine packages."""
+    plugin_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    paths = []
+    for package in _ENGINE_PACKAGES:
+        directory = os.path.join(plugin_root, package)
+        try:
+            names = sorted(n for n in os.listdir(directory) if n.endswith('.py'))
+        except OSError:
+            continue
+        paths.extend(os.path.join(directory, n) for n in names)
+    return paths
+
+
+def input_keys(rules: List[Any]) -> Optional[Dict[str, List[str]]]:
+    """Return the input keys the rules read, or None if they cannot be cached.
+
+    Returns:
+        {"tool_input": [...], "input": [...]} (see rule_engine.input_fields)
+    """
+    if any(c.field in UNCACHEABLE_FIELDS for rule in rules for c in rule.conditions):
+        return None
+    # Only called after an in-process evaluation, which loaded the engine
+    from hookify.core.rule_engine import input_fields
+    return input_fields(rules)
+
+
+class DecisionCache:
+    """Hook responses shared across the hook processes of a project."""
+
+    def __init__(self, hook: str, path: str = CACHE_FILE, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 telemetry: Any = None):
+        self.hook = hook
+        self.path = path
+        self.max_entries = max_entries
+        self.telemetry = telemetry  # TelemetrySink that hits are recorded to (None = disabled)
+        self.version = ruleset_version()
+        self._db = None
+        self._failed = False
+
+    def get(self, raw_input: str) -> Optional[str]:
+        """Return the cached response text for a hook input, or None.
+
+        Only the parts of the input JSON that the cached ruleset reads are
+        decoded.
+        """
+        started = time.perf_counter()
+        try:
+            import json
+            from hookify.core.json_select import HEADER_SPEC, input_spec, select
+
+            db = self._connect()
+            header = select(raw_input, HEADER_SPEC)
+            row = db.execute(
+                'SELECT inputs FROM rulesets WHERE version = ? AND hook = ? AND event = ?',
+                (self.version, self.hook, self._event(header))
+            ).fetchone()
+            if row is None or row[0] is None:
+                return None  # Ruleset not seen yet, or not cacheable
+
+            inputs = json.loads(row[0])
+            key = self._key(select(raw_input, input_spec(inputs)), inputs)
+            row = db.execute('SELECT response, matches FROM decisions WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            db.execute('UPDATE decisions SET used = ? WHERE key = ?', (time.time(), key))
+            if self.telemetry is not None:
+                self.telemetry.record_matches(header, json.loads(row[1]), time.perf_counter() - started)
+            return row[0]
+        except Exception as e:  # sqlite3.Error, OSError, bad JSON
+            self._warn(e)
+            return None
+
+    def put(self, input_data: Dict[str, Any], rules: List[Any], engine: Any, response: str) -> None:
+        """Store the response of an in-process evaluation.
+
+        Args:
+            input_data: Hook input that was evaluated
+            rules: Rules loaded for the input's event
+            engine: RuleEngine that evaluated them
+            response: Response JSON text printed by the hook
+        """
+        if engine.last_stats.regex_timeouts or engine.last_stats.deadline_skips:
+            return  # The outcome depended on timing
+
+        try:
+            import json
+            db = self._connect()
+            event = self._event(input_data)
+            inputs = input_keys(rules)
+            cursor = db.execute(
+                'INSERT OR IGNORE INTO rulesets (version, hook, event, inputs) VALUES (?, ?, ?, ?)',
+                (self.version, self.hook, event, json.dumps(inputs) if inputs is not None else None)
+            )
+            if cursor.rowcount:
+                # First decision of a new ruleset version: older ones are unreachable
+                db.execute('DELETE FROM rulesets WHERE version != ?', (self.version,))
+            if inputs is None:
+                return
+
+            matches = json.dumps([[rule.name, rule.action] for rule in engine.last_matches])
+            db.execute('INSERT OR REPLACE INTO decisions (key, response, matches, used) VALUES (?, ?, ?, ?)',
+                       (self._key(input_data, inputs), response, matches, time.time()))
+            db.execute(
+                'DELETE FROM decisions WHERE key IN '
+                '(SELECT key FROM decisions ORDER BY used DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+        except Exception as e:
+            self._warn(e)
+
+    def _connect(self):
+        if self._failed:
+            raise OSError('decision cache unavailable')
+        if self._db is None:
+            # Skip the sqlite3 package: it only wraps _sqlite3 and imports datetime
+            try:
+                import _sqlite3 as sqlite3
+            except ImportError:
+                import sqlite3
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                make_cache_dir(directory)
+            # isolation_level=None: statements commit on their own (_MIGRATE
+            # opens its own transaction). WAL: lookups never wait for a writer.
+            db = sqlite3.connect(self.path, timeout=LOCK_TIMEOUT, isolation_level=None)
+            db.execute('PRAGMA journal_mode = WAL')
+            db.execute('PRAGMA synchronous = NORMAL')
+            if db.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+                db.executescript(_MIGRATE)
+            self._db = db
+        return self._db
+
+    def _event(self, input_data: Dict[str, Any]) -> str:
+        return resolve_event(self.hook, input_data) or ''
+
+    def _key(self, input_data: Dict[str, Any], inputs: Dict[str, List[str]]) -> str:
+        import json
+        try:
+            from _blake2 import blake2b
+        except ImportError:
+            from hashlib import blake2b
+
+        tool_input = input_data.get('tool_input', {})
+        if not isinstance(tool_input, dict):
+            tool_input = {}
+        if '*' in inputs['tool_input']:
+            tool_values = tool_input
+        else:
+            # Absent keys are left out, so they differ from keys set to null
+            tool_values = {k: tool_input[k] for k in inputs['tool_input'] if k in tool_input}
+        material = json.dumps([
+            self.version, self.hook,
+            input_data.get('session_id'), input_data.get('hook_event_name'), input_data.get('tool_name'),
+            tool_values, {k: input_data[k] for k in inputs['input'] if k in input_data},
+        ], sort_keys=True)
+        return blake2b(material.encode('utf-8', 'surrogatepass'), digest_size=20).hexdigest()
+
+    def _warn(self, error: Exception) -> None:
+        if not self._failed:
+            print(f"Warning: hookify decision cache disabled: {error}", file=sys.stderr)
+        self._failed = True
+
+
+def open_decision_cache(hook: str) -> Optional[DecisionCache]:
+    """Return the project's decision cache for a hook, or None if it is disabled."""
+    settings = load_settings()
+    if not get_setting('decision_cache', env_var='HOOKIFY_DECISION_CACHE', default=False,
+                       settings=settings):
+        return None
+
+    size = get_number_setting('decision_cache_size', env_var='HOOKIFY_DECISION_CACHE_SIZE',
+                              default=DEFAULT_MAX_ENTRIES, settings=settings, kind=int)
+    return DecisionCache(hook, max_entries=max(1, size), telemetry=get_sink(telemetry_path(settings)))
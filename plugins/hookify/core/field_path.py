@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Structured field paths for hookify plugin conditions.
+
+Besides a plain field name ("command", "new_text", ...), a condition's field
+can be a path into the hook input:
+
+    edits[*].new_string          new_string of every MultiEdit edit
+    edits[0].old_string          old_string of the first edit
+    tool_input.todos[*].content  content of every TodoWrite item
+
+- ``name`` and ``.name`` step into an object key
+- ``[N]`` selects one list element (negative N counts from the end)
+- ``[*]`` selects every list element
+
+The first key is looked up in tool_input, then in the hook input itself (so
+``tool_input.…`` paths work too). A path yields the values it reaches one at
+a time: the engine checks the condition element by element and stops at the
+first element that decides it, instead of matching a concatenated copy.
+"""
+
+import re
+import sys
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+# How the elements reached by a path combine ("match" key of a condition):
+#   any  the condition matches if it matches at least one element
+#   all  the condition matches if it matches every element
+MATCH_MODES = ('any', 'all')
+
+# A path step: an object key, a list index, or None for every list element
+Step = Union[str, int, None]
+
+_STEP = re.compile(r'\.?([^.\[\]]+)|\[(\*|-?\d+)\]')
+
+
+@lru_cache(maxsize=256)
+def parse_path(field: str) -> Optional[Tuple[Step, ...]]:
+    """Parse a field path.
+
+    Returns:
+        The path's steps, or None if field is a plain field name (or a path
+        with invalid syntax, which is reported once)
+    """
+    if '.' not in field and '[' not in field:
+        return None
+
+    steps = []
+    position = 0
+    while position < len(field):
+        match = _STEP.match(field, position)
+        if match is None or (position == 0 and field[0] == '.'):
+            print(f"Warning: Invalid field path: {field!r}", file=sys.stderr)
+            return None
+        key, index = match.groups()
+        if key is not None:
+            steps.append(key)
+        else:
+            steps.append(None if index == '*' else int(index))
+        position = match.end()
+
+    if not isinstance(steps[0], str):
+        print(f"Warning: Invalid field path: {field!r} (must start with a key)", file=sys.stderr)
+        return None
+    return tuple(steps)
+
+
+def default_match(operator: str) -> str:
+    """Return the match mode of a condition that does not set one.
+
+    not_contains defaults to "all" (no element contains the pattern), the
+    other operators to "any".
+    """
+    return 'all' if operator == 'not_contains' else 'any'
+
+
+def iter_values(path: Tuple[Step, ...], tool_input: Dict[str, Any],
+                input_data: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+    """Yield the string values a parsed path reaches, in document order.
+
+    Numbers and booleans are converted with str(); a list at the end of the
+    path yields its elements. Objects, nulls and missing keys yield nothing.
+    """
+    root = tool_input if path[0] in tool_input else (input_data or {})
+    yield from _walk(root, path, 0)
+
+
+def _walk(value: Any, path: Tuple[Step, ...], position: int) -> Iterator[str]:
+    while position < len(path):
+        step = path[position]
+        position += 1
+        if isinstance(step, str):
+            if not isinstance(value, dict) or step not in value:
+                return
+            value = value[step]
+        elif not isinstance(value, list):
+            return
+        elif step is None:
+            for element in value:
+                yield from _walk(element, path, position)
+            return
+        else:
+            try:
+                value = value[step]
+            except IndexError:
+                return
+
+    if isinstance(value, list):
+        for element in value:
+            if not isinstance(element, (dict, list)) and element is not None:
+                yield element if isinstance(element, str) else str(element)
+    elif not isinstance(value, dict) and value is not None:
+        yield value if isinstance(value, str) else str(value)
+
+
+# For testing
+if __name__ == '__main__':
+    tool_input = {
+        'file_path': '/tmp/a.py',
+        'edits': [{'old_string': 'a', 'new_string': 'print(1)'},
+                  {'old_string': 'b', 'new_string': 'x = 2'}],
+    }
+    for field in ('edits[*].new_string', 'edits[-1].old_string', 'tool_input.file_path', 'edits[5].new_string'):
+        print(field, '->', list(iter_values(parse_path(field), tool_input, {'tool_input': tool_input})))
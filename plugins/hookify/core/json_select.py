@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Selective decoding of hook input JSON for hookify plugin.
+
+Hook inputs carry the whole tool call: the full `content` of a Write, the
+`tool_response` body of a PostToolUse. json.loads() builds Python objects
+for all of it even when the rules only read `tool_name` and `file_path`.
+select() decodes only the keys a spec asks for and drops the others as
+soon as they are scanned, so a hook holds only the values its rules read.
+
+Skipped strings with few quotes (prose, base64, most large `content`
+values) are passed over with str.find() without being decoded. Skipped
+arrays, and strings with many escaped quotes, still go through json's C
+scanner: a pure-Python structural scan is several times slower than that.
+
+A spec maps object keys to:
+
+- True: decode the value
+- a nested spec: decode only those keys of the value (if it is an object)
+- False: skip the value
+
+The "*" entry sets what happens to keys the spec does not list (default:
+skip).
+"""
+
+import json
+import re
+from json.decoder import scanstring
+from typing import Any, Dict, List, Tuple
+
+# Top-level keys that can be large; everything else in a hook input is small
+LARGE_KEYS = ('tool_input', 'tool_response')
+
+# Enough to pick a hook's event and look up the decision cache
+HEADER_SPEC: Dict[str, Any] = {'*': True, **dict.fromkeys(LARGE_KEYS, False)}
+
+# Escaped quotes a string may contain before skipping it falls back to
+# scanstring (which decodes it)
+MAX_QUOTE_PROBES = 16
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def input_spec(fields: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Build the spec for the input keys a ruleset reads.
+
+    Args:
+        fields: {"tool_input": [...], "input": [...]} as returned by
+            rule_engine.input_fields(); "*" stands for the whole tool_input
+    """
+    tool_keys = fields['tool_input']
+    return {
+        '*': True,
+        'tool_input': True if '*' in tool_keys else dict.fromkeys(tool_keys, True),
+        'tool_response': 'tool_response' in fields['input'],
+    }
+
+
+def select(text: str, spec: Dict[str, Any]) -> Any:
+    """Decode the parts of a JSON document that spec selects.
+
+    Raises:
+        ValueError: If the JSON is malformed (outside skipped values)
+    """
+    position = _WHITESPACE.match(text, 0).end()
+    if not text.startswith('{', position):
+        return json.loads(text)
+    try:
+        value, end = _select_object(text, position, spec)
+    except IndexError:
+        raise ValueError('Unterminated JSON object') from None
+    if _WHITESPACE.match(text, end).end() != len(text):
+        raise ValueError(f'Extra data at position {end}')
+    return value
+
+
+def _select_object(text: str, position: int, spec: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+    """Decode the selected members of the object at position; return it and its end."""
+    result: Dict[str, Any] = {}
+    default = spec.get('*', False)
+    position = _WHITESPACE.match(text, position + 1).end()
+    if text[position] == '}':
+        return result, position + 1
+
+    while True:
+        if text[position] != '"':
+            raise ValueError(f'Expecting property name at position {position}')
+        key, position = scanstring(text, position + 1)
+        position = _WHITESPACE.match(text, position).end()
+        if text[position] != ':':
+            raise ValueError(f"Expecting ':' at position {position}")
+        position = _WHITESPACE.match(text, position + 1).end()
+
+        wanted = spec.get(key, default)
+        if isinstance(wanted, dict) and text[position] == '{':
+            result[key], position = _select_object(text, position, wanted)
+        elif wanted:
+            result[key], position = _decoder.raw_decode(text, position)
+        else:
+            position = _skip_value(text, position)
+
+        position = _WHITESPACE.match(text, position).end()
+        if text[position] == ',':
+            position = _WHITESPACE.match(text, position + 1).end()
+        elif text[position] == '}':
+            return result, position + 1
+        else:
+            raise ValueError(f"Expecting ',' or '}}' at position {position}")
+
+
+def _skip_string(text: str, position: int) -> int:
+    """Return the end of the string whose opening quote is before position."""
+    start = position
+    for _ in range(MAX_QUOTE_PROBES):
+        quote = text.find('"', position)
+        if quote < 0:
+            raise ValueError(f'Unterminated string at position {start - 1}')
+        # The quote ends the string unless an odd number of backslashes precede it
+        backslash = quote
+        while text[backslash - 1] == '\\':
+            backslash -= 1
+        if (quote - backslash) % 2 == 0:
+            return quote + 1
+        position = quote + 1
+    return scanstring(text, start)[1]
+
+
+def _skip_value(text: str, position: int) -> int:
+    """Return the end of the value at position, dropping the value."""
+    char = text[position]
+    if char == '"':
+        return _skip_string(text, position + 1)
+    if char == '{':
+        # Objects in hook inputs have few, possibly large members: walk them
+        # so large strings take the fast path. Arrays (often many small
+        # elements) are cheaper to leave to the C scanner.
+        return _select_object(text, position, {})[1]
+    return _decoder.raw_decode(text, position)[1]
+
+
+# For testing
+if __name__ == '__main__':
+    import time
+    import tracemalloc
+
+    payload = json.dumps({
+        'session_id': 's', 'hook_event_name': 'PostToolUse', 'tool_name': 'Write',
+        'tool_input': {'file_path': '/tmp/notes.md', 'content': 'Lorem ipsum dolor sit amet.\n' * 200000},
+        'tool_response': {'filePath': '/tmp/notes.md', 'lines': ['é' * 60] * 50000},
+    })
+    spec = input_spec({'tool_input': ['file_path'], 'input': []})
+
+    for name, decode in (('json.loads', json.loads), ('select', lambda t: select(t, spec))):
+        start = time.perf_counter()
+        for _ in range(10):
+            decode(payload)
+        elapsed = (time.perf_counter() - start) * 100
+        tracemalloc.start()
+        data = decode(payload)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{name:<10} {elapsed:7.2f} ms  peak {peak / 1e6:6.2f} MB  "
+              f"tool_input={sorted(data['tool_input'])}")
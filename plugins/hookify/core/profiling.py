@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""Opt-in per-rule profiling for hookify plugin.
+
+When profiling is enabled, every evaluate_rules call appends one JSON line
+with the time spent per rule and per condition (field extraction, regex
+compilation, matching and transcript I/O) to
+.claude/.hookify-cache/profile.jsonl.
+
+Enable it with HOOKIFY_PROFILE=1 (or HOOKIFY_PROFILE=/path/to/file.jsonl), or
+with {"profile": true} in .claude/hookify.settings.local.json.
+
+Usage (from the project root):
+    python3 /path/to/hookify/core/profiling.py report [--top N] [--file PATH]
+"""
+
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+# Running this file directly: put the hookify package on sys.path
+if __name__ == '__main__':
+    import runpy
+    runpy.run_path(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'utils', 'script_path.py'))
+
+from hookify.core.settings import CACHE_DIR, get_setting, make_cache_dir
+
+PROFILE_FILE = os.path.join(CACHE_DIR, 'profile.jsonl')
+
+# Condition timing phases, in the order they are reported
+PHASES = ('extract', 'compile', 'match', 'io')
+
+
+def profile_path(settings: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Return the file profiling records are appended to, or None if disabled."""
+    value = get_setting('profile', env_var='HOOKIFY_PROFILE', default=False, settings=settings)
+    if value is True:
+        return PROFILE_FILE
+    if isinstance(value, str) and value:
+        return value
+    return None
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 4)
+
+
+class EvaluationProfile:
+    """Timings collected during one evaluate_rules call.
+
+    The engine reports each condition it checks and, once a rule is decided,
+    the rule itself; conditions reported since the previous rule belong to it.
+    Phase times (extract, compile, io) are added while a condition runs; the
+    rest of the condition's time is attributed to matching.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.compile_seconds = 0.0
+        self.rules: List[Dict[str, Any]] = []
+        self._conditions: List[Dict[str, Any]] = []
+        self._phases: Dict[str, float] = {}
+
+    def add_phase(self, phase: str, seconds: float) -> None:
+        """Attribute time to a phase of the condition currently being checked."""
+        self._phases[phase] = self._phases.get(phase, 0.0) + seconds
+
+    def add_condition(self, condition, result: bool, seconds: float, cached: bool) -> None:
+        """Record a checked condition (cached = result shared with an earlier rule)."""
+        phases = self._phases
+        self._phases = {}
+        timings = {f'{p}_ms': _ms(phases.get(p, 0.0)) for p in PHASES if p != 'match'}
+        timings['match_ms'] = _ms(max(0.0, seconds - sum(phases.values())))
+        self._conditions.append({
+            'field': condition.field,
+            'operator': condition.operator,
+            'pattern': condition.pattern,
+            'result': result,
+            'cached': cached,
+            'ms': _ms(seconds),
+            **timings,
+        })
+
+    def add_rule(self, rule, matched: bool, seconds: float, timed_out: bool = False) -> None:
+        """Record an evaluated rule with the conditions checked for it."""
+        self.rules.append({
+            'name': rule.name,
+            'source': rule.source,
+            'action': rule.action,
+            'matched': matched,
+            'timed_out': timed_out,
+            'ms': _ms(seconds),
+            'conditions': self._conditions,
+        })
+        self._conditions = []
+
+    def to_record(self, input_data: Dict[str, Any], event: Optional[str],
+                  stats: Dict[str, int]) -> Dict[str, Any]:
+        """Build the JSON line for this evaluation."""
+        total = time.perf_counter() - self.started
+        return {
+            'timestamp': round(time.time(), 3),
+            'pid': os.getpid(),
+            'session_id': input_data.get('session_id'),
+            'hook_event': input_data.get('hook_event_name', ''),
+            'tool_name': input_data.get('tool_name', ''),
+            'event': event,
+            'total_ms': _ms(total),
+            'compile_ms': _ms(self.compile_seconds),
+            'evaluate_ms': _ms(total - self.compile_seconds),
+            'stats': stats,
+            'rules': self.rules,
+        }
+
+
+def write_record(path: str, record: Dict[str, Any]) -> None:
+    """Append a profiling record as one JSON line. Failures are reported, not raised."""
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            make_cache_dir(directory)
+        # A single write of one line keeps concurrent hook processes from
+        # interleaving records
+        with open(path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+    except (IOError, OSError, TypeError, ValueError) as e:
+        print(f"Warning: Failed to write profile to {path}: {e}", file=sys.stderr)
+
+
+def read_records(path: str) -> List[Dict[str, Any]]:
+    """Read profiling records, skipping lines that are not valid JSON."""
+    records = []
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def summarize(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate profiling records.
+
+    Returns:
+        Dict with per-rule totals ("rules"), per-session totals ("sessions"),
+        regex cache counters ("regex_cache") and the overall evaluation count
+    """
+    rules: Dict[str, Dict[str, Any]] = {}
+    sessions: Dict[str, Dict[str, Any]] = {}
+    regex_hits = regex_misses = 0
+
+    for record in records:
+        session = sessions.setdefault(record.get('session_id') or '-', {
+            'evaluations': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'compile_ms': 0.0,
+        })
+        session['evaluations'] += 1
+        session['total_ms'] += record.get('total_ms', 0.0)
+        session['compile_ms'] += record.get('compile_ms', 0.0)
+        session['max_ms'] = max(session['max_ms'], record.get('total_ms', 0.0))
+
+        stats = record.get('stats', {})
+        regex_hits += stats.get('regex_cache_hits', 0)
+        regex_misses += stats.get('regex_cache_misses', 0)
+
+        for rule in record.get('rules', []):
+            entry = rules.setdefault(rule['name'], {
+                'evaluations': 0, 'matches': 0, 'timeouts': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                **{f'{p}_ms': 0.0 for p in PHASES},
+            })
+            entry['evaluations'] += 1
+            entry['matches'] += 1 if rule.get('matched') else 0
+            entry['timeouts'] += 1 if rule.get('timed_out') else 0
+            entry['total_ms'] += rule.get('ms', 0.0)
+            entry['max_ms'] = max(entry['max_ms'], rule.get('ms', 0.0))
+            for condition in rule.get('conditions', []):
+                for phase in PHASES:
+                    entry[f'{phase}_ms'] += condition.get(f'{phase}_ms', 0.0)
+
+    lookups = regex_hits + regex_misses
+    return {
+        'evaluations': len(records),
+        'rules': rules,
+        'sessions': sessions,
+        'regex_cache': {
+            'hits': regex_hits,
+            'misses': regex_misses,
+            'hit_rate': regex_hits / lookups if lookups else None,
+        },
+    }
+
+
+def print_report(summary: Dict[str, Any], top: int = 10) -> None:
+    """Print the slowest rules, regex cache hit rate and per-session overhead."""
+    print(f"{summary['evaluations']} evaluations profiled\n")
+
+    print(f"Slowest rules (top {top} by total time):")
+    print(f"  {'rule':<32} {'evals':>6} {'hits':>5} {'t/o':>4} {'total ms':>10} {'max ms':>9} "
+          f"{'extract':>8} {'compile':>8} {'match':>8} {'io':>8}")
+    slowest = sorted(summary['rules'].items(), key=lambda item: item[1]['total_ms'], reverse=True)
+    for name, entry in slowest[:top]:
+        print(f"  {name[:32]:<32} {entry['evaluations']:>6} {entry['matches']:>5} {entry['timeouts']:>4} "
+              f"{entry['total_ms']:>10.2f} {entry['max_ms']:>9.2f} "
+              + ' '.join(f"{entry[f'{p}_ms']:>8.2f}" for p in PHASES))
+
+    cache = summary['regex_cache']
+    rate = f"{cache['hit_rate']:.1%}" if cache['hit_rate'] is not None else 'n/a'
+    print(f"\nRegex cache: {cache['hits']} hits, {cache['misses']} misses ({rate} hit rate)")
+
+    print("\nHook overhead per session:")
+    print(f"  {'session':<38} {'evals':>6} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'compile ms':>11}")
+    for session_id, entry in sorted(summary['sessions'].items(),
+                                    key=lambda item: item[1]['total_ms'], reverse=True):
+        mean = entry['total_ms'] / entry['evaluations']
+        print(f"  {session_id[:38]:<38} {entry['evaluations']:>6} {entry['total_ms']:>10.2f} "
+              f"{mean:>9.2f} {entry['max_ms']:>9.2f} {entry['compile_ms']:>11.2f}")
+
+
+def main(argv: List[str]) -> int:
+    """Command line entry point."""
+    if len(argv) < 2 or argv[1] != 'report':
+        print("Usage: profiling.py report [--top N] [--file PATH]", file=sys.stderr)
+        return 2
+
+    top = int(argv[argv.index('--top') + 1]) if '--top' in argv else 10
+    path = argv[argv.index('--file') + 1] if '--file' in argv else (profile_path() or PROFILE_FILE)
+
+    try:
+        records = read_records(path)
+    except (IOError, OSError) as e:
+        print(f"Cannot read profile {path}: {e}", file=sys.stderr)
+        return 1
+
+    print_report(summarize(records), top=top)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
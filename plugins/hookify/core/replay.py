@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""Offline replay of recorded sessions against a hookify ruleset.
+
+Before rolling out a rule pack, replay shows which historical tool calls it
+would have blocked or warned about and what it costs per hook call. It streams
+Claude Code session transcripts (JSONL, e.g. ~/.claude/projects/*/*.jsonl)
+line by line, reconstructs the hook events they imply and evaluates them with
+RuleEngine:
+
+    PreToolUse   every tool_use block of an assistant message
+    PostToolUse  every tool_result, paired with its tool_use
+    Stop         the end of every assistant turn (before the next user
+                 prompt, and at the end of the transcript)
+
+Transcript conditions of a Stop event see the transcript only up to that
+point, as the hook did. Subagent (sidechain) messages produce tool events but
+no Stop events.
+
+Transcript files are distributed over a pool of worker processes; each file
+is read sequentially by one worker, so memory stays bounded however large the
+files are. Decisions are written as NDJSON in file order, followed by a
+summary of per-rule hits and timing on stderr.
+
+Usage:
+    python3 /path/to/hookify/core/replay.py [--project DIR] [--workers N]
+        [--output PATH] [--summary PATH] [--all] TRANSCRIPT_OR_DIR...
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+# Running this file directly: put the hookify package on sys.path
+if __name__ == '__main__':
+    import runpy
+    runpy.run_path(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'utils', 'script_path.py'))
+
+from hookify.core.client import resolve_event
+from hookify.core.config_loader import Condition, Rule, load_rules
+from hookify.core.rule_engine import EvaluationContext, RuleEngine
+from hookify.core.transcript import IncrementalScan
+
+
+class ReplayEngine(RuleEngine):
+    """RuleEngine that answers transcript conditions from the replayed prefix.
+
+    Profiling and telemetry records are never written during a replay, and
+    no transcript scan state is saved; per-rule timings are kept in
+    last_profile instead. Replays have no evaluation deadline.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.profile_path = None
+        self.telemetry = None
+        self.keep_profile = True
+        self.deadline = 0.0  # No host timeout offline, and no transcript is read
+        self.transcript_results: Dict[Tuple[str, str], bool] = {}
+        # Deferred scan of the risky regexes, so they run under the regex timeout
+        self.risky_scan: Optional[IncrementalScan] = None
+
+    def _check_transcript_condition(self, condition: Condition, input_data: Dict[str, Any],
+                                    context: EvaluationContext) -> bool:
+        if context.ruleset.is_risky_transcript_regex(condition):
+            return super()._check_transcript_condition(condition, input_data, context)
+        return self.transcript_results.get((condition.operator, condition.pattern), False)
+
+    def _scan_risky_transcript(self, input_data: Dict[str, Any],
+                               context: EvaluationContext) -> Dict[Tuple[str, str], bool]:
+        return self.risky_scan.results(guard=context.timer.run)
+
+
+def find_transcripts(paths: List[str]) -> List[str]:
+    """Expand files and directories (searched recursively) into .jsonl paths."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                found.extend(os.path.join(root, name) for name in sorted(files)
+                             if name.endswith('.jsonl'))
+        else:
+            found.append(path)
+    return [os.path.abspath(path) for path in found]
+
+
+def _content_blocks(record: Dict[str, Any]) -> List[Any]:
+    message = record.get('message')
+    content = message.get('content') if isinstance(message, dict) else None
+    return content if isinstance(content, list) else []
+
+
+def _is_prompt(record: Dict[str, Any]) -> bool:
+    """Check whether a user record is a prompt typed by the user."""
+    if record.get('isMeta') or record.get('isSidechain'):
+        return False
+    message = record.get('message')
+    content = message.get('content') if isinstance(message, dict) else None
+    if isinstance(content, str):
+        return True
+    return isinstance(content, list) and not any(
+        isinstance(block, dict) and block.get('type') == 'tool_result' for block in content
+    )
+
+
+def transcript_events(path: str, scans: Iterable[IncrementalScan] = ()
+                      ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Stream the hook events a transcript implies, as (line number, hook input).
+
+    Args:
+        path: Transcript JSONL file
+        scans: Incremental transcript scans, fed with every line read, so
+            that their results match the transcript as it was at each
+            yielded event
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    fallback_session = os.path.splitext(os.path.basename(path))[0]
+    base: Dict[str, Any] = {'session_id': fallback_session, 'transcript_path': path}
+    tool_uses: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+    in_turn = False
+    line_number = 0
+
+    with open(path, 'rb') as f:
+        for line in f:
+            line_number += 1
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+
+            if isinstance(record, dict):
+                if record.get('sessionId'):
+                    base['session_id'] = record['sessionId']
+                if record.get('cwd'):
+                    base['cwd'] = record['cwd']
+                kind = record.get('type')
+
+                if kind == 'user' and _is_prompt(record) and in_turn:
+                    # The previous turn ended before this prompt was written
+                    in_turn = False
+                    yield line_number, dict(base, hook_event_name='Stop', stop_hook_active=False)
+
+                for block in _content_blocks(record):
+                    if not isinstance(block, dict):
+                        continue
+                    if kind == 'assistant' and block.get('type') == 'tool_use':
+                        tool = (block.get('name', ''), block.get('input') or {})
+                        tool_uses[block.get('id', '')] = tool
+                        yield line_number, dict(base, hook_event_name='PreToolUse', tool_name=tool[0],
+                                                tool_input=tool[1], tool_use_id=block.get('id'))
+                    elif kind == 'user' and block.get('type') == 'tool_result':
+                        tool = tool_uses.pop(block.get('tool_use_id', ''), None)
+                        if tool is not None:
+                            response = record.get('toolUseResult', block.get('content'))
+                            yield line_number, dict(base, hook_event_name='PostToolUse', tool_name=tool[0],
+                                                    tool_input=tool[1], tool_response=response,
+                                                    tool_use_id=block.get('tool_use_id'))
+
+                if kind == 'assistant' and not record.get('isSidechain'):
+                    in_turn = True
+
+            for scan in scans:
+                scan.feed(line)
+
+    if in_turn:
+        yield line_number, dict(base, hook_event_name='Stop', stop_hook_active=False)
+
+
+def _decision(response: Dict[str, Any]) -> str:
+    if response.get('decision') == 'block' or \
+            response.get('hookSpecificOutput', {}).get('permissionDecision') == 'deny':
+        return 'block'
+    return 'warn' if response.get('systemMessage') else 'allow'
+
+
+def new_summary() -> Dict[str, Any]:
+    """Return an empty replay summary."""
+    return {'files': 0, 'unreadable_files': 0, 'events': {}, 'rules': {}}
+
+
+def merge_summary(total: Dict[str, Any], part: Dict[str, Any]) -> None:
+    """Add the summary of one transcript to a running total."""
+    for key in ('files', 'unreadable_files'):
+        total[key] += part[key]
+    for section in ('events', 'rules'):
+        for name, entry in part[section].items():
+            current = total[section].get(name)
+            if current is None:
+                total[section][name] = dict(entry)
+                continue
+            for key, value in entry.items():
+                if key == 'max_ms':
+                    current[key] = max(current[key], value)
+                elif isinstance(value, (int, float)):
+                    current[key] += value
+
+
+def replay_file(engine: ReplayEngine, rules: List[Rule], path: str, out: TextIO,
+                include_allowed: bool = False) -> Dict[str, Any]:
+    """Replay one transcript, writing decisions to out; return its summary."""
+    summary = new_summary()
+    summary['files'] = 1
+    ruleset = engine.compile(rules)
+    scanner = ruleset.transcript_scanner
+    scan = IncrementalScan(scanner) if scanner is not None else None
+    risky_scanner = ruleset.risky_transcript_scanner
+    engine.risky_scan = IncrementalScan(risky_scanner, deferred=True) if risky_scanner is not None else None
+    scans = [s for s in (scan, engine.risky_scan) if s is not None]
+
+    try:
+        for line_number, input_data in transcript_events(path, scans):
+            hook_event = input_data['hook_event_name']
+            if scan is not None and hook_event == 'Stop':
+                engine.transcript_results = scan.results()
+
+            event = resolve_event(hook_event.lower(), input_data)
+            start = time.perf_counter()
+            response = engine.evaluate_rules(rules, input_data, event)
+            ms = (time.perf_counter() - start) * 1000
+
+            decision = _decision(response)
+            stats = summary['events'].setdefault(hook_event, {
+                'events': 0, 'block': 0, 'warn': 0, 'allow': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+            })
+            stats['events'] += 1
+            stats[decision] += 1
+            stats['total_ms'] += ms
+            stats['max_ms'] = max(stats['max_ms'], ms)
+
+            matched, timed_out = [], []
+            for entry in engine.last_profile.rules:
+                rule_stats = summary['rules'].setdefault(entry['name'], {
+                    'action': entry['action'], 'evaluations': 0, 'hits': 0, 'timeouts': 0,
+                    'total_ms': 0.0, 'max_ms': 0.0,
+                })
+                rule_stats['evaluations'] += 1
+                rule_stats['total_ms'] += entry['ms']
+                rule_stats['max_ms'] = max(rule_stats['max_ms'], entry['ms'])
+                if entry['matched']:
+                    rule_stats['hits'] += 1
+                    matched.append(entry['name'])
+                if entry['timed_out']:
+                    rule_stats['timeouts'] += 1
+                    timed_out.append(entry['name'])
+
+            if include_allowed or matched or timed_out:
+                out.write(json.dumps({
+                    'transcript': path,
+                    'line': line_number,
+                    'session_id': input_data['session_id'],
+                    'hook_event': hook_event,
+                    'tool_name': input_data.get('tool_name'),
+                    'tool_use_id': input_data.get('tool_use_id'),
+                    'decision': decision,
+                    'rules': matched,
+                    'timed_out': timed_out,
+                    'ms': round(ms, 4),
+                }) + '\n')
+    except (IOError, OSError) as e:
+        print(f"Warning: Cannot read transcript {path}: {e}", file=sys.stderr)
+        summary['unreadable_files'] = 1
+
+    return summary
+
+
+# Per-process state of replay workers
+_worker_engine: Optional[ReplayEngine] = None
+_worker_rules: List[Rule] = []
+
+
+def _init_worker(rules: List[Rule]) -> None:
+    global _worker_engine, _worker_rules
+    _worker_engine = ReplayEngine()
+    _worker_rules = rules
+    _worker_engine.compile(rules)
+
+
+def _replay_to_file(path: str, part_path: str, include_allowed: bool) -> Dict[str, Any]:
+    """Replay one transcript in a worker, writing its decisions to part_path."""
+    with open(part_path, 'w') as out:
+        return replay_file(_worker_engine, _worker_rules, path, out, include_allowed)
+
+
+def replay(rules: List[Rule], paths: List[str], out: TextIO, workers: int = 1,
+           include_allowed: bool = False) -> Dict[str, Any]:
+    """Replay transcripts, writing decisions to out in file order; return the summary."""
+    summary = new_summary()
+    started = time.perf_counter()
+
+    if workers <= 1 or len(paths) <= 1:
+        engine = ReplayEngine()
+        for path in paths:
+            merge_summary(summary, replay_file(engine, rules, path, out, include_allowed))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with tempfile.TemporaryDirectory(prefix='hookify-replay-') as parts_dir, \
+                ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                    initargs=(rules,)) as pool:
+            part_paths = [os.path.join(parts_dir, f'{i}.ndjson') for i in range(len(paths))]
+            results = pool.map(_replay_to_file, paths, part_paths,
+                               [include_allowed] * len(paths))
+            # map yields in submission order, so parts are appended in file order
+            for part_path, part_summary in zip(part_paths, results):
+                with open(part_path, 'r') as part:
+                    shutil.copyfileobj(part, out)
+                os.remove(part_path)
+                merge_summary(summary, part_summary)
+
+    summary['wall_seconds'] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def print_summary(summary: Dict[str, Any], file: TextIO = sys.stderr) -> None:
+    """Print per-event and per-rule results of a replay."""
+    events = sum(entry['events'] for entry in summary['events'].values())
+    print(f"{summary['files']} transcript(s), {events} hook events replayed "
+          f"in {summary['wall_seconds']:.1f} s", file=file)
+    if summary['unreadable_files']:
+        print(f"{summary['unreadable_files']} transcript(s) could not be read", file=file)
+
+    print(f"\n  {'hook event':<14} {'events':>8} {'block':>7} {'warn':>7} {'mean ms':>9} {'max ms':>9}",
+          file=file)
+    for name, entry in sorted(summary['events'].items()):
+        mean = entry['total_ms'] / entry['events'] if entry['events'] else 0.0
+        print(f"  {name:<14} {entry['events']:>8} {entry['block']:>7} {entry['warn']:>7} "
+              f"{mean:>9.3f} {entry['max_ms']:>9.3f}", file=file)
+
+    print(f"\n  {'rule':<32} {'action':<6} {'evals':>8} {'hits':>7} {'t/o':>4} {'total ms':>10} {'max ms':>9}",
+          file=file)
+    for name, entry in sorted(summary['rules'].items(), key=lambda item: (-item[1]['hits'], item[0])):
+        print(f"  {name[:32]:<32} {entry['action']:<6} {entry['evaluations']:>8} {entry['hits']:>7} "
+              f"{entry['timeouts']:>4} {entry['total_ms']:>10.2f} {entry['max_ms']:>9.3f}", file=file)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('paths', nargs='+', metavar='TRANSCRIPT_OR_DIR',
+                        help='transcript files or directories searched for *.jsonl')
+    parser.add_argument('--project', default='.', help='project whose .claude rules to replay (default: .)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='worker processes (default: number of CPUs)')
+    parser.add_argument('--output', default='-', help='NDJSON decisions file (default: stdout)')
+    parser.add_argument('--summary', help='also write the summary as JSON to this file')
+    parser.add_argument('--all', action='store_true', help='also write events no rule matched')
+    args = parser.parse_args(argv)
+
+    paths = find_transcripts(args.paths)
+    cwd = os.getcwd()
+    try:
+        os.chdir(args.project)
+        rules = load_rules()
+        for rule in rules:
+            rule.get_message()  # Message bodies are read relative to the project
+    finally:
+        os.chdir(cwd)
+    if not rules:
+        print(f"No enabled hookify rules found in {args.project}/.claude", file=sys.stderr)
+        return 1
+
+    if args.output == '-':
+        summary = replay(rules, paths, sys.stdout, args.workers, args.all)
+    else:
+        with open(args.output, 'w') as out:
+            summary = replay(rules, paths, out, args.workers, args.all)
+
+    print_summary(summary)
+    if args.summary:
+        with open(args.summary, 'w') as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,11 +3,78 @@
 
 import re
 import sys
+import time
+from collections import deque
 from functools import lru_cache
-from typing import List, Dict, Any, Optional
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple
 
 # Import from local module
+from hookify.core.client import resolve_event
 from hookify.core.config_loader import Rule, Condition
+from hookify.core.deadline import BackgroundTask, Deadline, DeadlineExceeded
+from hookify.core.field_path import MATCH_MODES, default_match, iter_values, parse_path
+from hookify.core.profiling import EvaluationProfile, profile_path, write_record
+from hookify.core.rule_index import RuleIndex, parse_tool_matcher
+from hookify.core.settings import get_number_setting, get_setting, load_settings
+from hookify.core.telemetry import get_sink, telemetry_path
+from hookify.matchers.redos import RegexTimeout, RegexTimer, analyze_pattern
+
+# Fields with at least this many contains/not_contains literals are matched
+# with an Aho-Corasick automaton; below it, per-literal `in` checks (which run
+# in C) are faster. See matchers/aho_corasick.py for the benchmark.
+MIN_AUTOMATON_LITERALS = 1000
+
+# Default time budget for the regex matching of one rule, in milliseconds.
+# Override with "regex_timeout_ms" in the settings file or
+# HOOKIFY_REGEX_TIMEOUT_MS; 0 disables the limit.
+DEFAULT_REGEX_TIMEOUT_MS = 1000
+
+# Default time budget for a whole evaluation, in milliseconds: below the
+# 10 second hook timeout in hooks.json, leaving time for start-up and output.
+# Override with "deadline_ms" / HOOKIFY_DEADLINE_MS; 0 disables it.
+DEFAULT_DEADLINE_MS = 8000
+
+# Fields read from files rather than from the hook input. With a deadline,
+# they are fetched in background threads while other rules are evaluated.
+IO_FIELDS = ('transcript',)
+
+# Rules evaluated between two checks of the deadline clock
+DEADLINE_CHECK_INTERVAL = 16
+
+# tool_input keys a field is read from, besides the field name itself
+# (see RuleEngine._extract_field)
+TOOL_INPUT_KEYS = {
+    'content': ('content', 'new_string', 'edits'),
+    'new_text': ('new_string', 'edits'),
+    'new_string': ('new_string', 'edits'),
+    'old_text': ('old_string',),
+    'old_string': ('old_string',),
+}
+
+# Fields read from the top level of the hook input
+HOOK_INPUT_FIELDS = ('reason', 'user_prompt')
+
+# Inputs sent to a worker process at a time by evaluate_batch
+DEFAULT_BATCH_CHUNK_SIZE = 256
+
+# Relative cost estimates used to check a rule's cheapest conditions first.
+# Unknown operators never match, so they cost nothing and are checked first.
+OPERATOR_COSTS = {
+    'equals': 1, 'starts_with': 1, 'ends_with': 1,
+    'contains': 2, 'not_contains': 2,
+    'regex_match': 10,
+}
+RISKY_REGEX_COST = 100  # Patterns flagged by the backtracking analysis
+TRANSCRIPT_COST = 1000  # Conditions that read the transcript file
+
+# Condition orders ("condition_order" setting / HOOKIFY_CONDITION_ORDER):
+#   file      as written in the rule file
+#   cost      cheapest first, by the estimates above
+#   adaptive  by cost and by how often each condition was observed to pass,
+#             re-ranked every REORDER_INTERVAL evaluations
+CONDITION_ORDERS = ('file', 'cost', 'adaptive')
+REORDER_INTERVAL = 200
 
 
 # Cache compiled regexes (max 128 patterns)
@@ -24,42 +91,544 @@ def compile_regex(pattern: str) -> re.Pattern:
     return re.compile(pattern, re.IGNORECASE)
 
 
+class CompiledRuleset:
+    """Matching structures for a list of rules, built once per ruleset.
+
+    Regex patterns are compiled once per ruleset. Large sets of
+    contains/not_contains literals on a field are grouped into one AhoCorasick
+    automaton, so the field value is scanned once for all of them. Transcript
+    conditions are evaluated together by a streaming TranscriptScanner.
+
+    Regex conditions are matched one by one, and only when a rule reaches
+    them: combining a field's patterns into alternations was measured to be
+    slower than separate searches with re at every pattern count and value
+    length tried (30 to 3000 patterns, 50 bytes to 10 KB).
+
+    Patterns prone to catastrophic backtracking are reported on stderr. Each
+    rule's conditions are ranked so the cheapest are checked first.
+    """
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = list(rules)
+        self.index = RuleIndex(self.rules)
+
+        literals_by_field: Dict[str, List[str]] = {}
+        transcript_conditions: List[Condition] = []
+        risky_transcript_conditions: List[Condition] = []
+        self.risky_patterns: Dict[str, List[str]] = {}
+        # Parsed field paths (e.g. "edits[*].new_string"), matched element by element
+        self.field_paths: Dict[str, tuple] = {}
+        for rule in self.rules:
+            for condition in rule.conditions:
+                if condition.operator == 'regex_match':
+                    self._check_pattern(rule, condition.pattern)
+                if condition.match is not None and condition.match not in MATCH_MODES:
+                    print(f"Warning: Rule '{rule.name}': invalid match {condition.match!r} "
+                          f"(expected one of {', '.join(MATCH_MODES)})", file=sys.stderr)
+                path = parse_path(condition.field)
+                if path is not None:
+                    self.field_paths[condition.field] = path
+                elif condition.field == 'transcript':
+                    if self.is_risky_transcript_regex(condition):
+                        risky_transcript_conditions.append(condition)
+                    else:
+                        transcript_conditions.append(condition)
+                elif condition.operator in ('contains', 'not_contains'):
+                    literals_by_field.setdefault(condition.field, []).append(condition.pattern)
+
+        # Compiled regex patterns, filled as conditions are first evaluated
+        self.regexes: Dict[str, re.Pattern] = {}
+
+        # The automaton and transcript modules are only imported by rulesets
+        # that need them, keeping them off the hook start-up path
+        self.literal_sets: Dict[str, 'AhoCorasick'] = {}
+        for field, literals in literals_by_field.items():
+            if len(set(literals)) >= MIN_AUTOMATON_LITERALS:
+                from hookify.matchers.aho_corasick import AhoCorasick
+                self.literal_sets[field] = AhoCorasick(literals)
+
+        self.transcript_scanner: Optional['TranscriptScanner'] = None
+        self.risky_transcript_scanner: Optional['TranscriptScanner'] = None
+        if transcript_conditions:
+            from hookify.core.transcript import TranscriptScanner
+            self.transcript_scanner = TranscriptScanner(transcript_conditions)
+        if risky_transcript_conditions:
+            from hookify.core.transcript import TranscriptScanner
+            self.risky_transcript_scanner = TranscriptScanner(risky_transcript_conditions, '-risky')
+
+        # Ids of the rules that read I/O-bound fields through the scanner
+        self.io_rules: Set[int] = {
+            id(rule) for rule in self.rules
+            if any(c.field in IO_FIELDS and not self.is_risky_transcript_regex(c)
+                   for c in rule.conditions)
+        }
+
+        # Each rule's conditions, cheapest first (keyed by id of the rule)
+        self.ordered_conditions: Dict[int, List[Condition]] = {
+            id(rule): rule.conditions for rule in self.rules
+        }
+        # Outcomes of the conditions of multi-condition rules (the only ones
+        # whose order matters): (field, operator, pattern, match) -> [checked, passed]
+        self.observations: Dict[tuple, List[int]] = {
+            (c.field, c.operator, c.pattern, c.match): [0, 0]
+            for rule in self.rules if len(rule.conditions) > 1 for c in rule.conditions
+        }
+        self.unranked_evaluations = 0
+        self.rank_conditions()
+
+    def _check_pattern(self, rule: Rule, pattern: str) -> None:
+        """Analyze a regex for catastrophic backtracking and warn about it once."""
+        if pattern in self.risky_patterns:
+            return
+        problems = analyze_pattern(pattern)
+        if problems:
+            self.risky_patterns[pattern] = problems
+            print(f"Warning: Rule '{rule.name}': regex '{pattern}' may backtrack "
+                  f"catastrophically ({'; '.join(problems)})", file=sys.stderr)
+
+    def is_risky_transcript_regex(self, condition: Condition) -> bool:
+        """Check for a transcript regex that may backtrack catastrophically.
+
+        The streaming scan runs in a background thread, where neither the
+        regex timeout (SIGALRM) nor the deadline can interrupt a match: re
+        holds the GIL until it returns. Such patterns get a streaming scan
+        of their own (risky_transcript_scanner), run on the main thread with
+        each chunk's search under the regex timeout.
+        """
+        return condition.field == 'transcript' and condition.operator == 'regex_match' \
+            and condition.pattern in self.risky_patterns
+
+    def condition_cost(self, condition: Condition) -> float:
+        """Estimate the relative cost of checking a condition."""
+        if condition.field == 'transcript':
+            return TRANSCRIPT_COST
+        if condition.operator == 'regex_match' and condition.pattern in self.risky_patterns:
+            return RISKY_REGEX_COST
+        return OPERATOR_COSTS.get(condition.operator, 0)
+
+    def observe(self, condition_results: Dict[tuple, bool]) -> None:
+        """Record the condition outcomes of one evaluation, for adaptive ordering."""
+        observations = self.observations
+        for key, result in condition_results.items():
+            counts = observations.get(key)
+            if counts is not None:
+                counts[0] += 1
+                counts[1] += result
+        self.unranked_evaluations += 1
+        if self.unranked_evaluations >= REORDER_INTERVAL:
+            self.rank_conditions()
+
+    def rank_conditions(self) -> None:
+        """Order every rule's conditions by expected cost.
+
+        Conditions are ANDed, so the best order checks first the conditions
+        that are cheap and likely to fail: each is ranked by its cost divided
+        by its observed failure rate (estimated with add-one smoothing; 50%
+        for conditions never observed).
+        """
+        def rank(condition: Condition) -> float:
+            checked, passed = self.observations.get(
+                (condition.field, condition.operator, condition.pattern, condition.match), (0, 0))
+            failure_rate = (checked - passed + 1) / (checked + 2)
+            return self.condition_cost(condition) / failure_rate
+
+        for rule in self.rules:
+            if len(rule.conditions) > 1:
+                self.ordered_conditions[id(rule)] = sorted(rule.conditions, key=rank)
+        self.unranked_evaluations = 0
+
+    def is_for(self, rules: List[Rule]) -> bool:
+        """Check whether this ruleset was compiled from exactly these rules."""
+        return len(rules) == len(self.rules) and all(a is b for a, b in zip(rules, self.rules))
+
+
+class EvaluationStats:
+    """Counters showing how much work evaluation did and how much was shared.
+
+    A plain class rather than a dataclass: importing dataclasses costs the
+    in-process hook about 10 ms (see benchmarks/import_budget.py).
+    """
+
+    def __init__(self, rules_evaluated: int = 0, fields_extracted: int = 0,
+                 field_cache_hits: int = 0, conditions_evaluated: int = 0,
+                 condition_cache_hits: int = 0, regex_cache_hits: int = 0,
+                 regex_cache_misses: int = 0, regex_timeouts: int = 0,
+                 rules_skipped: int = 0, deadline_skips: int = 0):
+        self.rules_evaluated = rules_evaluated
+        self.fields_extracted = fields_extracted  # Field values actually extracted from the input
+        self.field_cache_hits = field_cache_hits  # Field lookups answered from the per-input memo
+        self.conditions_evaluated = conditions_evaluated  # Distinct (field, operator, pattern) checks run
+        self.condition_cache_hits = condition_cache_hits  # Condition checks shared with an earlier rule
+        self.regex_cache_hits = regex_cache_hits  # Regex conditions whose pattern the ruleset had compiled
+        self.regex_cache_misses = regex_cache_misses  # Regex patterns compiled for the ruleset
+        self.regex_timeouts = regex_timeouts  # Rules skipped because their regex ran out of time
+        self.rules_skipped = rules_skipped  # Rules not evaluated because a blocking rule already matched
+        self.deadline_skips = deadline_skips  # Rules skipped because the evaluation deadline passed
+
+    def add(self, other: 'EvaluationStats') -> None:
+        """Accumulate another set of counters into this one."""
+        for name, value in vars(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+    def to_dict(self) -> Dict[str, int]:
+        """Return the counters as a dict (JSON records, worker results)."""
+        return dict(vars(self))
+
+    def __repr__(self) -> str:
+        values = ', '.join(f'{name}={value}' for name, value in vars(self).items())
+        return f'EvaluationStats({values})'
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, EvaluationStats):
+            return NotImplemented
+        return vars(self) == vars(other)
+
+    __hash__ = None
+
+
+class EvaluationContext:
+    """Per-input state shared by all rules during one evaluate_rules call.
+
+    Each field is extracted at most once and each distinct (field, operator,
+    pattern, match) condition is evaluated at most once; every rule that uses the
+    same condition shares the result.
+    """
+
+    def __init__(self, ruleset: CompiledRuleset, profile: Optional[EvaluationProfile] = None,
+                 regex_timeout: float = 0.0, condition_order: str = 'file',
+                 deadline: Optional[Deadline] = None):
+        self.ruleset = ruleset
+        self.field_values: Dict[str, Optional[str]] = {}
+        self.condition_results: Dict[tuple, bool] = {}
+        self.literal_hits: Dict[str, Set[str]] = {}
+        self.transcript_results: Optional[Dict[tuple, bool]] = None
+        self.risky_transcript_results: Optional[Dict[tuple, bool]] = None
+        self.risky_transcript_timed_out = False
+        self.stats = EvaluationStats()
+        self.profile = profile  # Timings, only when profiling is enabled
+
+        # Time budget (seconds) for each regex scan; 0 = unbounded. The timer
+        # installs its signal handler once per evaluation (see RegexTimer).
+        self.regex_timeout = regex_timeout
+        self.timer = RegexTimer(regex_timeout)
+        self.timed_out_rules: List[Rule] = []
+        self.timed_out_conditions: Set[tuple] = set()
+
+        # Each rule's conditions in evaluation order (None = file order), and
+        # whether condition_results are recorded for adaptive ordering
+        self.ordered_conditions = ruleset.ordered_conditions if condition_order != 'file' else None
+        self.observe = condition_order == 'adaptive'
+
+        # Overall time budget, background fetches of I/O-bound fields and
+        # the rules skipped once the budget ran out
+        self.deadline = deadline or Deadline(0)
+        self.io_tasks: Dict[str, BackgroundTask] = {}
+        self.deadline_skipped: List[Rule] = []
+
+
+def input_fields(rules: List[Rule]) -> Dict[str, List[str]]:
+    """Return the keys of the hook input that evaluating rules can read.
+
+    Besides these, the engine reads small top-level keys of every input
+    (tool_name, hook_event_name, session_id, transcript_path).
+
+    Returns:
+        {"tool_input": [...], "input": [...]}: keys of tool_input and of the
+        top level of the hook input; "*" stands for the whole tool_input
+    """
+    tool_keys = set()
+    hook_keys = set()
+    for rule in rules:
+        for condition in rule.conditions:
+            field = condition.field
+            path = parse_path(field)
+            if path is not None:
+                # A path reads its first key from tool_input or the hook input
+                tool_keys.add(path[0])
+                if path[0] == 'tool_input' and len(path) > 1 and isinstance(path[1], str):
+                    tool_keys.add(path[1])
+                else:
+                    hook_keys.add(path[0])
+                continue
+            if not field.isidentifier():
+                tool_keys.add('*')  # Unknown field syntax: all of tool_input
+            tool_keys.add(field)
+            tool_keys.update(TOOL_INPUT_KEYS.get(field, ()))
+            if field in HOOK_INPUT_FIELDS:
+                hook_keys.add(field)
+    return {'tool_input': sorted(tool_keys), 'input': sorted(hook_keys)}
+
+
+def _duration_setting(name: str, env_var: str, default_ms: float,
+                      settings: Optional[Dict[str, Any]]) -> float:
+    """Read a duration setting given in milliseconds; return seconds (0 = off)."""
+    value = get_number_setting(name, env_var=env_var, default=default_ms, settings=settings)
+    return max(0.0, value / 1000)
+
+
+def regex_timeout(settings: Optional[Dict[str, Any]] = None) -> float:
+    """Return the per-rule regex time budget in seconds (0 = unbounded)."""
+    return _duration_setting('regex_timeout_ms', 'HOOKIFY_REGEX_TIMEOUT_MS',
+                             DEFAULT_REGEX_TIMEOUT_MS, settings)
+
+
+def evaluation_deadline(settings: Optional[Dict[str, Any]] = None) -> float:
+    """Return the time budget of one evaluation in seconds (0 = unbounded)."""
+    return _duration_setting('deadline_ms', 'HOOKIFY_DEADLINE_MS', DEFAULT_DEADLINE_MS, settings)
+
+
+def condition_order(settings: Optional[Dict[str, Any]] = None) -> str:
+    """Return the condition order setting (one of CONDITION_ORDERS)."""
+    value = get_setting('condition_order', env_var='HOOKIFY_CONDITION_ORDER',
+                        default='cost', settings=settings)
+    if value not in CONDITION_ORDERS:
+        print(f"Warning: Invalid condition_order setting: {value!r} "
+              f"(expected one of {', '.join(CONDITION_ORDERS)})", file=sys.stderr)
+        return 'cost'
+    return value
+
+
 class RuleEngine:
     """Evaluates rules against hook input data."""
 
     def __init__(self):
         """Initialize rule engine."""
-        # No need for instance cache anymore - using global lru_cache
-        pass
+        self._ruleset: Optional[CompiledRuleset] = None
+        self.configure()
+        # Keep the timings of the last evaluation in last_profile even when
+        # profiling to a file is disabled (used by replay)
+        self.keep_profile = False
+        self.last_profile: Optional[EvaluationProfile] = None
+        self.last_stats = EvaluationStats()  # Counters of the last evaluate_rules call
+        self.last_matches: List[Rule] = []  # Rules matched by the last evaluate_rules call
+        self.stats = EvaluationStats()  # Counters accumulated over all calls
 
-    def evaluate_rules(self, rules: List[Rule], input_data: Dict[str, Any]) -> Dict[str, Any]:
+    def configure(self, settings: Optional[Dict[str, Any]] = None) -> None:
+        """(Re)read the engine's settings (settings file and environment)."""
+        if settings is None:
+            settings = load_settings()
+        self.profile_path = profile_path(settings)  # Where profiling records go (None = disabled)
+        self.regex_timeout = regex_timeout(settings)
+        self.deadline = evaluation_deadline(settings)
+        self.telemetry = get_sink(telemetry_path(settings))  # Match records (None = disabled)
+        self.condition_order = condition_order(settings)
+        # Stop evaluating once a blocking rule matched: its message alone is
+        # reported, and warnings (dropped from blocking responses) are skipped
+        self.stop_at_first_block = bool(get_setting(
+            'stop_at_first_block', env_var='HOOKIFY_STOP_AT_FIRST_BLOCK', default=False, settings=settings
+        ))
+
+    def compile(self, rules: List[Rule]) -> CompiledRuleset:
+        """Return the compiled ruleset for rules, reusing the last one if unchanged."""
+        if self._ruleset is None or not self._ruleset.is_for(rules):
+            self._ruleset = CompiledRuleset(rules)
+        return self._ruleset
+
+    def evaluate_rules(self, rules: List[Rule], input_data: Dict[str, Any],
+                       event: Optional[str] = None) -> Dict[str, Any]:
         """Evaluate all rules and return combined results.
 
-        Checks all rules and accumulates matches. Blocking rules take priority
-        over warning rules. All matching rule messages are combined.
+        Checks all rules that can apply to the input's tool (and event) and
+        accumulates matches. Blocking rules take priority over warning rules.
+        All matching rule messages are combined. A rule whose regex matching
+        exceeds the time budget is skipped and reported in systemMessage.
+
+        With stop_at_first_block, blocking rules are checked first and
+        evaluation stops at the first one that matches.
+
+        I/O-bound fields (the transcript) are fetched in the background. If
+        the evaluation deadline passes, the rules not yet decided are skipped
+        and named in systemMessage; the response is built from the rules that
+        were evaluated.
 
         Args:
             rules: List of Rule objects to evaluate
             input_data: Hook input JSON (tool_name, tool_input, etc.)
+            event: Optional event filter ("bash", "file", "stop", etc.) for
+                rule lists that were not already filtered by load_rules
 
         Returns:
             Response dict with systemMessage, hookSpecificOutput, etc.
             Empty dict {} if no rules match.
         """
+        started = time.perf_counter() if self.telemetry is not None else 0.0
         hook_event = input_data.get('hook_event_name', '')
         blocking_rules = []
         warning_rules = []
 
-        for rule in rules:
-            if self._rule_matches(rule, input_data):
-                if rule.action == 'block':
-                    blocking_rules.append(rule)
-                else:
-                    warning_rules.append(rule)
+        # Timings are only collected when profiling is enabled
+        profile = EvaluationProfile() if self.profile_path or self.keep_profile else None
+
+        ruleset = self.compile(rules)
+        if profile is not None:
+            profile.compile_seconds = time.perf_counter() - profile.started
+        context = EvaluationContext(ruleset, profile, self.regex_timeout, self.condition_order,
+                                    Deadline(self.deadline))
+
+        candidates = ruleset.index.rules_for(input_data.get('tool_name', ''), event,
+                                             blocks_first=self.stop_at_first_block)
+        if ruleset.io_rules and self.deadline:
+            self._prefetch(context, input_data, candidates)
+
+        check_deadline = context.deadline.expires is not None
+        try:
+            for position, rule in enumerate(candidates):
+                if blocking_rules and self.stop_at_first_block:
+                    context.stats.rules_skipped = len(candidates) - position
+                    break
+                # Every few rules, and right away once a fetch ran out of time
+                if check_deadline and (context.deadline_skipped or not position % DEADLINE_CHECK_INTERVAL) \
+                        and context.deadline.expired():
+                    context.deadline_skipped.extend(candidates[position:])
+                    break
+                context.stats.rules_evaluated += 1
+                start = time.perf_counter() if profile is not None else 0.0
+                timed_out = False
+                try:
+                    matched = self._rule_matches(rule, input_data, context)
+                except RegexTimeout:
+                    matched = False
+                    timed_out = True
+                    context.timed_out_rules.append(rule)
+                    context.stats.regex_timeouts += 1
+                except DeadlineExceeded:
+                    matched = False
+                    timed_out = True
+                    context.deadline_skipped.append(rule)
+                if profile is not None:
+                    profile.add_rule(rule, matched, time.perf_counter() - start, timed_out=timed_out)
+
+                if matched:
+                    if rule.action == 'block':
+                        blocking_rules.append(rule)
+                    else:
+                        warning_rules.append(rule)
+        finally:
+            context.timer.close()
+
+        context.stats.deadline_skips = len(context.deadline_skipped)
+        if context.observe:
+            ruleset.observe(context.condition_results)
+
+        self.last_stats = context.stats
+        self.last_matches = blocking_rules + warning_rules
+        self.stats.add(context.stats)
+        if profile is not None:
+            self.last_profile = profile
+            if self.profile_path:
+                write_record(self.profile_path, profile.to_record(input_data, event, context.stats.to_dict()))
+
+        response = self._build_response(hook_event, blocking_rules, warning_rules)
+        if context.timed_out_rules:
+            self._report_timeouts(response, context.timed_out_rules)
+        if context.deadline_skipped:
+            self._report_deadline(response, context.deadline_skipped)
+        if self.telemetry is not None:
+            self.telemetry.record(input_data, self.last_matches, time.perf_counter() - started)
+        return response
+
+    def _prefetch(self, context: EvaluationContext, input_data: Dict[str, Any],
+                  candidates: List[Rule]) -> None:
+        """Start fetching the I/O-bound fields the candidate rules read.
 
+        The fetches run in background threads while the other rules are
+        evaluated; conditions on these fields wait for them only until the
+        deadline.
+        """
+        transcript_path = input_data.get('transcript_path')
+        if not transcript_path or 'transcript' in input_data.get('tool_input', {}):
+            return
+        if any(id(rule) in context.ruleset.io_rules for rule in candidates):
+            context.io_tasks['transcript'] = BackgroundTask(
+                context.ruleset.transcript_scanner.scan_file,
+                transcript_path, session_id=input_data.get('session_id')
+            )
+
+    def evaluate_batch(self, rules: List[Rule], inputs: Iterable[Dict[str, Any]],
+                       event: Optional[str] = None, resolve_events: bool = False,
+                       workers: int = 1,
+                       chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+        """Evaluate rules against many inputs, yielding one response per input.
+
+        The ruleset is compiled once (index, regexes, literal automata) and
+        reused for every input. Inputs are consumed lazily, so arbitrarily
+        long iterables (e.g. a stream of recorded tool calls) can be audited
+        in constant memory.
+
+        With workers > 1, inputs are sent in chunks to a pool of worker
+        processes that each compile the ruleset once. Responses are still
+        yielded in input order, and only a few chunks per worker are in
+        flight at a time. Counters from the workers are added to self.stats
+        (self.last_stats holds those of the last chunk).
+
+        Args:
+            rules: List of Rule objects to evaluate
+            inputs: Iterable of hook input dicts
+            event: Event filter applied to every input (see evaluate_rules)
+            resolve_events: Derive each input's event from its
+                hook_event_name and tool_name instead, as the hooks do
+            workers: Number of worker processes (1 = evaluate in this process)
+            chunk_size: Inputs per worker task
+
+        Yields:
+            Response dicts, in the order of inputs
+        """
+        if workers <= 1:
+            self.compile(rules)
+            for input_data in inputs:
+                yield self.evaluate_rules(rules, input_data, _batch_event(input_data, event, resolve_events))
+            return
+
+        # Only audits need processes; keep the import off the hook path
+        from concurrent.futures import ProcessPoolExecutor
+
+        inputs = iter(inputs)
+        chunks = iter(lambda: list(islice(inputs, max(1, chunk_size))), [])
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                 initargs=(rules,)) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_evaluate_batch_chunk, chunk, event, resolve_events))
+                if len(pending) >= 2 * workers:
+                    yield from self._collect_chunk(pending.popleft())
+            while pending:
+                yield from self._collect_chunk(pending.popleft())
+
+    def _collect_chunk(self, future) -> List[Dict[str, Any]]:
+        """Return a worker chunk's responses and merge its counters."""
+        responses, stats = future.result()
+        self.last_stats = EvaluationStats(**stats)
+        self.stats.add(self.last_stats)
+        return responses
+
+    def _report_timeouts(self, response: Dict[str, Any], rules: List[Rule]) -> None:
+        """Add a note about rules skipped for exceeding the regex time budget."""
+        names = ', '.join(f"'{r.name}'" for r in rules)
+        note = (f"**[hookify]** Skipped rule(s) {names}: regex matching took longer than "
+                f"{self.regex_timeout * 1000:.0f} ms. Check the pattern for catastrophic "
+                f"backtracking (e.g. nested quantifiers like (a+)+).")
+        if response.get('systemMessage'):
+            response['systemMessage'] += '\n\n' + note
+        else:
+            response['systemMessage'] = note
+
+    def _report_deadline(self, response: Dict[str, Any], rules: List[Rule]) -> None:
+        """Add a note about rules skipped because the evaluation deadline passed."""
+        names = ', '.join(f"'{r.name}'" for r in rules)
+        note = (f"**[hookify]** Evaluation stopped after {self.deadline * 1000:.0f} ms "
+                f"(deadline_ms); skipped rule(s) {names}. Their conditions were not checked, "
+                f"often because reading the transcript was slow.")
+        if response.get('systemMessage'):
+            response['systemMessage'] += '\n\n' + note
+        else:
+            response['systemMessage'] = note
+
+    def _build_response(self, hook_event: str, blocking_rules: List[Rule],
+                        warning_rules: List[Rule]) -> Dict[str, Any]:
+        """Build the hook response for the matched rules."""
         # If any blocking rules matched, block the operation
         if blocking_rules:
-            messages = [f"**[{r.name}]**\n{r.message}" for r in blocking_rules]
+            messages = [f"**[{r.name}]**\n{r.get_message()}" for r in blocking_rules]
             combined_message = "\n\n".join(messages)
 
             # Use appropriate blocking format based on event type
@@ -85,7 +654,7 @@ class RuleEngine:
 
         # If only warnings, show them but allow operation
         if warning_rules:
-            messages = [f"**[{r.name}]**\n{r.message}" for r in warning_rules]
+            messages = [f"**[{r.name}]**\n{r.get_message()}" for r in warning_rules]
             return {
                 "systemMessage": "\n\n".join(messages)
             }
@@ -93,12 +662,14 @@ class RuleEngine:
         # No matches - allow operation
         return {}
 
-    def _rule_matches(self, rule: Rule, input_data: Dict[str, Any]) -> bool:
+    def _rule_matches(self, rule: Rule, input_data: Dict[str, Any],
+                      context: Optional[EvaluationContext] = None) -> bool:
         """Check if rule matches input data.
 
         Args:
             rule: Rule to evaluate
             input_data: Hook input data
+            context: Shared per-input evaluation state (optional)
 
         Returns:
             True if rule matches, False otherwise
@@ -117,9 +688,12 @@ class RuleEngine:
         if not rule.conditions:
             return False
 
-        # All conditions must match
-        for condition in rule.conditions:
-            if not self._check_condition(condition, tool_name, tool_input, input_data):
+        # All conditions must match; check the cheapest first
+        conditions = rule.conditions
+        if context is not None and context.ordered_conditions is not None:
+            conditions = context.ordered_conditions[id(rule)]
+        for condition in conditions:
+            if not self._check_condition(condition, tool_name, tool_input, input_data, context):
                 return False
 
         return True
@@ -134,15 +708,13 @@ class RuleEngine:
         Returns:
             True if matches
         """
-        if matcher == '*':
-            return True
-
-        # Split on | for OR matching
-        patterns = matcher.split('|')
-        return tool_name in patterns
+        # Parsed once per matcher string (None = any tool)
+        tools = parse_tool_matcher(matcher)
+        return tools is None or tool_name in tools
 
     def _check_condition(self, condition: Condition, tool_name: str,
-                        tool_input: Dict[str, Any], input_data: Dict[str, Any] = None) -> bool:
+                        tool_input: Dict[str, Any], input_data: Dict[str, Any] = None,
+                        context: Optional[EvaluationContext] = None) -> bool:
         """Check if a single condition matches.
 
         Args:
@@ -150,35 +722,181 @@ class RuleEngine:
             tool_name: Tool being used
             tool_input: Tool input dict
             input_data: Full hook input data (for Stop events, etc.)
+            context: Shared per-input evaluation state (optional)
 
         Returns:
             True if condition matches
         """
-        # Extract the field value to check
-        field_value = self._extract_field(condition.field, tool_name, tool_input, input_data)
+        if context is None:
+            return self._evaluate_condition(condition, tool_name, tool_input, input_data)
+
+        # Identical conditions in different rules are evaluated once per input
+        key = (condition.field, condition.operator, condition.pattern, condition.match)
+        result = context.condition_results.get(key)
+        if result is not None:
+            context.stats.condition_cache_hits += 1
+            if context.profile is not None:
+                context.profile.add_condition(condition, result, 0.0, cached=True)
+            return result
+
+        # A condition that already ran out of time is not retried for other rules
+        if key in context.timed_out_conditions:
+            raise RegexTimeout()
+
+        try:
+            if context.profile is not None:
+                start = time.perf_counter()
+                result = self._evaluate_condition(condition, tool_name, tool_input, input_data, context)
+                context.profile.add_condition(condition, result, time.perf_counter() - start, cached=False)
+            else:
+                result = self._evaluate_condition(condition, tool_name, tool_input, input_data, context)
+        except RegexTimeout:
+            context.timed_out_conditions.add(key)
+            raise
+        context.condition_results[key] = result
+        context.stats.conditions_evaluated += 1
+        return result
+
+    def _evaluate_condition(self, condition: Condition, tool_name: str,
+                            tool_input: Dict[str, Any], input_data: Dict[str, Any] = None,
+                            context: Optional[EvaluationContext] = None) -> bool:
+        """Evaluate a single condition (uncached; see _check_condition)."""
+        # Transcript conditions are answered by shared streaming scans
+        if condition.field == 'transcript' and context is not None \
+                and 'transcript' not in tool_input and input_data:
+            return self._check_transcript_condition(condition, input_data, context)
+
+        # Field paths (e.g. edits[*].new_string) are matched element by element
+        field_paths = context.ruleset.field_paths if context is not None else None
+        path = field_paths.get(condition.field) if field_paths else None
+        if path is None and context is None:
+            path = parse_path(condition.field)
+        if path is not None:
+            return self._check_path_condition(condition, path, tool_input, input_data, context)
+
+        # Extract the field value to check (at most once per input)
+        if context is None:
+            field_value = self._extract_field(condition.field, tool_name, tool_input, input_data)
+        elif condition.field in context.field_values:
+            field_value = context.field_values[condition.field]
+            context.stats.field_cache_hits += 1
+        else:
+            start = time.perf_counter() if context.profile is not None else 0.0
+            field_value = self._extract_field(condition.field, tool_name, tool_input, input_data)
+            if context.profile is not None:
+                context.profile.add_phase('extract', time.perf_counter() - start)
+            context.field_values[condition.field] = field_value
+            context.stats.fields_extracted += 1
         if field_value is None:
             return False
 
-        # Apply operator
-        operator = condition.operator
-        pattern = condition.pattern
+        return self._apply_operator(condition.operator, condition.pattern, field_value,
+                                    context, condition.field)
 
+    def _apply_operator(self, operator: str, pattern: str, value: str,
+                        context: Optional[EvaluationContext] = None,
+                        field: Optional[str] = None) -> bool:
+        """Apply a condition's operator to one value.
+
+        Args:
+            operator: Condition operator
+            pattern: Condition pattern
+            value: Value to check
+            context: Shared per-input evaluation state (optional)
+            field: Field the value was extracted from, for the field's shared
+                regex and literal scans (None for path elements, which are
+                matched on their own)
+        """
         if operator == 'regex_match':
-            return self._regex_match(pattern, field_value)
+            return self._regex_match(pattern, value, context)
         elif operator == 'contains':
-            return pattern in field_value
+            return self._contains(context if field is not None else None, field, pattern, value)
         elif operator == 'equals':
-            return pattern == field_value
+            return pattern == value
         elif operator == 'not_contains':
-            return pattern not in field_value
+            return not self._contains(context if field is not None else None, field, pattern, value)
         elif operator == 'starts_with':
-            return field_value.startswith(pattern)
+            return value.startswith(pattern)
         elif operator == 'ends_with':
-            return field_value.endswith(pattern)
+            return value.endswith(pattern)
         else:
             # Unknown operator
             return False
 
+    def _check_path_condition(self, condition: Condition, path: tuple, tool_input: Dict[str, Any],
+                              input_data: Optional[Dict[str, Any]],
+                              context: Optional[EvaluationContext]) -> bool:
+        """Check a condition against each value a field path reaches.
+
+        Values are visited lazily and the check stops at the first value that
+        decides it: one match for "any", one mismatch for "all". A path that
+        reaches no value never matches, like a missing field.
+        """
+        operator = condition.operator
+        pattern = condition.pattern
+        values = iter_values(path, tool_input, input_data)
+        if (condition.match or default_match(operator)) != 'all':
+            return any(self._apply_operator(operator, pattern, v, context) for v in values)
+
+        seen = False
+        for value in values:
+            if not self._apply_operator(operator, pattern, value, context):
+                return False
+            seen = True
+        return seen
+
+    def _check_transcript_condition(self, condition: Condition, input_data: Dict[str, Any],
+                                    context: EvaluationContext) -> bool:
+        """Check a transcript condition against the shared streaming scan.
+
+        The first transcript condition evaluated reads the transcript once, in
+        chunks, for every transcript condition in the ruleset. Within a session
+        only the part appended since the previous evaluation is read.
+
+        Risky regexes (see CompiledRuleset.is_risky_transcript_regex) have a
+        scan of their own on the main thread, under the regex timeout.
+        """
+        transcript_path = input_data.get('transcript_path')
+        if not transcript_path:
+            return False
+
+        if context.ruleset.is_risky_transcript_regex(condition):
+            if context.risky_transcript_results is None:
+                # After a timeout, the other risky conditions fail without a rescan
+                if context.risky_transcript_timed_out:
+                    raise RegexTimeout()
+                start = time.perf_counter() if context.profile is not None else 0.0
+                try:
+                    context.risky_transcript_results = self._scan_risky_transcript(input_data, context)
+                except RegexTimeout:
+                    context.risky_transcript_timed_out = True
+                    raise
+                if context.profile is not None:
+                    context.profile.add_phase('io', time.perf_counter() - start)
+            return context.risky_transcript_results.get((condition.operator, condition.pattern), False)
+
+        if context.transcript_results is None:
+            start = time.perf_counter() if context.profile is not None else 0.0
+            task = context.io_tasks.get('transcript')
+            if task is not None:
+                # Prefetched in the background; raises DeadlineExceeded
+                context.transcript_results = task.result(context.deadline)
+            else:
+                context.transcript_results = context.ruleset.transcript_scanner.scan_file(
+                    transcript_path, session_id=input_data.get('session_id')
+                )
+            if context.profile is not None:
+                context.profile.add_phase('io', time.perf_counter() - start)
+        return context.transcript_results.get((condition.operator, condition.pattern), False)
+
+    def _scan_risky_transcript(self, input_data: Dict[str, Any],
+                               context: EvaluationContext) -> Dict[tuple, bool]:
+        """Run the scan of risky transcript regexes, each search under the regex timeout."""
+        return context.ruleset.risky_transcript_scanner.scan_file(
+            input_data['transcript_path'], session_id=input_data.get('session_id'),
+            guard=context.timer.run
+        )
+
     def _extract_field(self, field: str, tool_name: str,
                       tool_input: Dict[str, Any], input_data: Dict[str, Any] = None) -> Optional[str]:
         """Extract field value from tool input or hook input data.
@@ -247,25 +965,62 @@ class RuleEngine:
             if field == 'file_path':
                 return tool_input.get('file_path', '')
             elif field in ['new_text', 'content']:
-                # Concatenate all edits
+                # Concatenate all edits (edits[*].new_string matches edit by edit)
                 edits = tool_input.get('edits', [])
                 return ' '.join(e.get('new_string', '') for e in edits)
 
         return None
 
-    def _regex_match(self, pattern: str, text: str) -> bool:
+    def _contains(self, context: Optional[EvaluationContext], field: str,
+                  pattern: str, text: str) -> bool:
+        """Check a literal substring condition.
+
+        Uses the field's literal automaton when the ruleset has one; the first
+        literal condition on the field runs the scan and later ones reuse it.
+        """
+        automaton = context.ruleset.literal_sets.get(field) if context is not None else None
+        if automaton is None:
+            return pattern in text
+
+        hits = context.literal_hits.get(field)
+        if hits is None:
+            hits = context.literal_hits[field] = automaton.search(text)
+        return pattern in hits
+
+    def _regex_match(self, pattern: str, text: str,
+                     context: Optional[EvaluationContext] = None) -> bool:
         """Check if pattern matches text using regex.
 
         Args:
             pattern: Regex pattern
             text: Text to match against
+            context: Shared per-input evaluation state (optional; holds the
+                ruleset's compiled patterns and the regex timeout)
 
         Returns:
             True if pattern matches
         """
         try:
-            # Use cached compiled regex (LRU cache with max 128 patterns)
-            regex = compile_regex(pattern)
+            if context is None:
+                # Use cached compiled regex (LRU cache with max 128 patterns)
+                regex = compile_regex(pattern)
+            else:
+                regex = context.ruleset.regexes.get(pattern)
+                if regex is not None:
+                    context.stats.regex_cache_hits += 1
+                else:
+                    # Compiled once per ruleset; compile_regex's LRU cache
+                    # would thrash with more than 128 patterns
+                    start = time.perf_counter()
+                    try:
+                        regex = re.compile(pattern, re.IGNORECASE)
+                    finally:
+                        if context.profile is not None:
+                            context.profile.add_phase('compile', time.perf_counter() - start)
+                    context.ruleset.regexes[pattern] = regex
+                    context.stats.regex_cache_misses += 1
+            if context is not None:
+                return bool(context.timer.run(regex.search, text))
             return bool(regex.search(text))
 
         except re.error as e:
@@ -273,6 +1028,40 @@ class RuleEngine:
             return False
 
 
+def _batch_event(input_data: Dict[str, Any], event: Optional[str], resolve_events: bool) -> Optional[str]:
+    """Return the event filter for one evaluate_batch input."""
+    if resolve_events:
+        return resolve_event(input_data.get('hook_event_name', '').lower(), input_data)
+    return event
+
+
+# Per-process state of evaluate_batch workers
+_batch_engine: Optional[RuleEngine] = None
+_batch_rules: List[Rule] = []
+
+
+def _init_batch_worker(rules: List[Rule]) -> None:
+    """Compile the ruleset once in each evaluate_batch worker process."""
+    global _batch_engine, _batch_rules
+    _batch_engine = RuleEngine()
+    _batch_engine.telemetry = None  # Telemetry records hook evaluations, not audits
+    _batch_rules = rules
+    _batch_engine.compile(rules)
+
+
+def _evaluate_batch_chunk(chunk: List[Dict[str, Any]], event: Optional[str],
+                          resolve_events: bool) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Evaluate a chunk of inputs in a worker; return responses and counters."""
+    stats = EvaluationStats()
+    responses = []
+    for input_data in chunk:
+        responses.append(_batch_engine.evaluate_rules(
+            _batch_rules, input_data, _batch_event(input_data, event, resolve_events)
+        ))
+        stats.add(_batch_engine.last_stats)
+    return responses, stats.to_dict()
+
+
 # For testing
 if __name__ == '__main__':
     from hookify.core.config_loader import Condition, Rule
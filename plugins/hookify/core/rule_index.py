@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Dispatch index for hookify rules.
+
+Buckets a ruleset by tool name once, so evaluating an input only touches the
+rules that can apply to its event and tool instead of walking every rule and
+re-parsing every tool_matcher.
+"""
+
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from hookify.core.config_loader import Rule
+
+
+@lru_cache(maxsize=256)
+def parse_tool_matcher(matcher: Optional[str]) -> Optional[FrozenSet[str]]:
+    """Parse a tool_matcher like "Edit|Write" into a set of tool names.
+
+    Returns:
+        Set of tool names, or None if the matcher accepts every tool
+        (no matcher, empty matcher or "*")
+    """
+    if not matcher or matcher == '*':
+        return None
+    return frozenset(matcher.split('|'))
+
+
+def event_matches(rule: Rule, event: Optional[str]) -> bool:
+    """Check if a rule applies to an event (None = no event filter)."""
+    return event is None or rule.event == 'all' or rule.event == event
+
+
+class RuleIndex:
+    """Rules bucketed by tool name, with wildcard rules merged into each bucket."""
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = rules
+        self._wildcard: List[int] = []
+        self._by_tool: Dict[str, List[int]] = {}
+        self._buckets: Dict[Tuple[Optional[str], str, bool], List[Rule]] = {}
+
+        for position, rule in enumerate(rules):
+            tools = parse_tool_matcher(rule.tool_matcher)
+            if tools is None:
+                self._wildcard.append(position)
+            else:
+                for tool in tools:
+                    self._by_tool.setdefault(tool, []).append(position)
+
+    def rules_for(self, tool_name: str, event: Optional[str] = None,
+                  blocks_first: bool = False) -> List[Rule]:
+        """Return the rules that can apply to a tool and event, in ruleset order.
+
+        With blocks_first, blocking rules come before all other rules (each
+        group still in ruleset order).
+        """
+        key = (event, tool_name, blocks_first)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            positions = sorted(self._wildcard + self._by_tool.get(tool_name, []))
+            bucket = [self.rules[p] for p in positions if event_matches(self.rules[p], event)]
+            if blocks_first:
+                bucket.sort(key=lambda rule: rule.action != 'block')
+            self._buckets[key] = bucket
+        return bucket
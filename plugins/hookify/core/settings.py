@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Project settings for hookify plugin.
+
+Optional features are switched on per project in
+.claude/hookify.settings.local.json, for example:
+
+    {"profile": true}
+
+Each setting can also be overridden with an environment variable, which
+takes precedence over the file.
+"""
+
+import json
+import os
+import sys
+from typing import Any, Dict, Optional
+
+SETTINGS_FILE = os.path.join('.claude', 'hookify.settings.local.json')
+
+# Files hookify keeps for itself: rule cache, scan states, decisions, logs
+CACHE_DIR = os.path.join('.claude', '.hookify-cache')
+
+_FALSE_VALUES = ('', '0', 'false', 'no', 'off')
+_TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+
+def load_settings() -> Dict[str, Any]:
+    """Load the project settings file.
+
+    Returns:
+        Settings dict, or {} if the file is missing or invalid
+    """
+    try:
+        with open(SETTINGS_FILE, 'r') as f:
+            settings = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (IOError, OSError, ValueError) as e:
+        print(f"Warning: Failed to read {SETTINGS_FILE}: {e}", file=sys.stderr)
+        return {}
+
+    if not isinstance(settings, dict):
+        print(f"Warning: {SETTINGS_FILE} must contain a JSON object", file=sys.stderr)
+        return {}
+    return settings
+
+
+def make_cache_dir(directory: str = CACHE_DIR) -> None:
+    """Create a directory, keeping hookify's cache dir out of version control.
+
+    A directory inside CACHE_DIR makes sure CACHE_DIR holds a .gitignore
+    that ignores everything, so cached files never show up as untracked
+    changes in the project. Other directories (e.g. a custom log location)
+    are only created.
+
+    Raises:
+        OSError: If the directory cannot be created
+    """
+    os.makedirs(directory, exist_ok=True)
+    directory = os.path.normpath(directory)
+    if directory != CACHE_DIR and not directory.startswith(CACHE_DIR + os.sep):
+        return
+    ignore_file = os.path.join(CACHE_DIR, '.gitignore')
+    if os.path.exists(ignore_file):
+        return
+    try:
+        fd = os.open(ignore_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except OSError:
+        return  # Created by another hook process meanwhile, or read-only
+    try:
+        os.write(fd, b'*\n')
+    finally:
+        os.close(fd)
+
+
+def get_setting(name: str, env_var: Optional[str] = None, default: Any = None,
+                settings: Optional[Dict[str, Any]] = None) -> Any:
+    """Get a setting, letting an environment variable override the file.
+
+    String values, from the environment or the file, of "1"/"true"/"yes"/"on"
+    become True and ""/"0"/"false"/"no"/"off" become False; any other string
+    is returned as is (e.g. a path). Other file values are returned unchanged.
+
+    Args:
+        name: Key in the settings file
+        env_var: Environment variable that overrides the file (optional)
+        default: Value when neither is set
+        settings: Already loaded settings (loaded from disk if None)
+
+    Returns:
+        Setting value
+    """
+    if env_var and env_var in os.environ:
+        return _parse_string(os.environ[env_var])
+
+    if settings is None:
+        settings = load_settings()
+    value = settings.get(name, default)
+    return _parse_string(value) if isinstance(value, str) else value
+
+
+def _parse_string(value: str) -> Any:
+    """Turn a boolean-like string into a bool; return other strings stripped."""
+    value = value.strip()
+    if value.lower() in _TRUE_VALUES:
+        return True
+    if value.lower() in _FALSE_VALUES:
+        return False
+    return value
+
+
+def get_number_setting(name: str, env_var: Optional[str] = None, default: float = 0,
+                       settings: Optional[Dict[str, Any]] = None, kind: type = float) -> Any:
+    """Get a numeric setting, letting an environment variable override the file.
+
+    Unlike get_setting, environment values are not turned into booleans
+    ("1" is the number 1). Invalid values are reported on stderr and
+    replaced by the default.
+
+    Args:
+        name: Key in the settings file
+        env_var: Environment variable that overrides the file (optional)
+        default: Value when neither is set, or when the value is invalid
+        settings: Already loaded settings (loaded from disk if None)
+        kind: int or float
+
+    Returns:
+        Setting value
+    """
+    if env_var and env_var in os.environ:
+        value = os.environ[env_var].strip()
+    else:
+        if settings is None:
+            settings = load_settings()
+        value = settings.get(name, default)
+
+    if not isinstance(value, bool):
+        try:
+            number = kind(value)
+        except (TypeError, ValueError, OverflowError):
+            pass
+        else:
+            if number == number and abs(number) != float('inf'):  # Not NaN or infinite
+                return number
+    print(f"Warning: Invalid {name} setting: {value!r}", file=sys.stderr)
+    return default
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""Opt-in match telemetry for hookify plugin.
+
+When telemetry is enabled, every rule evaluation appends tab-separated
+records to .claude/.hookify-cache/telemetry.tsv:
+
+    timestamp  session  hook_event  tool  rule  action  eval_ms
+
+There is one record per matched rule, or one record with an empty rule and
+action "allow" when no rule matched. The records of one evaluation are
+adjacent and share timestamp, session and eval_ms.
+
+Records are buffered and written in batches, one append per batch. A hook
+process writes its batch at exit, after its response has been flushed; the
+daemon flushes from a background thread every few seconds. A decision
+answered by the decision cache is recorded with the rules it matched when
+it was stored, and eval_ms is the time of the cache lookup.
+
+Enable it with HOOKIFY_TELEMETRY=1 (or HOOKIFY_TELEMETRY=/path/to/file.tsv),
+or with {"telemetry": true} in .claude/hookify.settings.local.json.
+
+Usage (from the project root):
+    python3 /path/to/hookify/core/telemetry.py report [--top N] [--file PATH ...]
+"""
+
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Running this file directly: put the hookify package on sys.path
+if __name__ == '__main__':
+    import runpy
+    runpy.run_path(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'utils', 'script_path.py'))
+
+from hookify.core.settings import CACHE_DIR, get_setting, make_cache_dir
+
+TELEMETRY_FILE = os.path.join(CACHE_DIR, 'telemetry.tsv')
+
+FIELDS = ('timestamp', 'session', 'hook_event', 'tool', 'rule', 'action', 'eval_ms')
+
+# Background flushing (daemon): at most every FLUSH_INTERVAL seconds, or as
+# soon as MAX_BATCH records are buffered
+FLUSH_INTERVAL = 2.0
+MAX_BATCH = 1000
+
+# Distinct sessions counted per rule by the report
+MAX_SESSIONS = 10000
+
+_TRANSLATE = str.maketrans('\t\n\r', '   ')
+
+
+def telemetry_path(settings: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Return the file telemetry records are appended to, or None if disabled."""
+    value = get_setting('telemetry', env_var='HOOKIFY_TELEMETRY', default=False, settings=settings)
+    if value is True:
+        return TELEMETRY_FILE
+    if isinstance(value, str) and value:
+        return value
+    return None
+
+
+class TelemetrySink:
+    """Buffers telemetry records and appends them to a file in batches."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._buffer: List[str] = []
+        self._failed = False
+        self._exit_flush = False
+        self._wake = None  # Set by start_background()
+
+    def record(self, input_data: Dict[str, Any], rules: List[Any], seconds: float) -> None:
+        """Buffer the records of one evaluation.
+
+        Args:
+            input_data: Hook input that was evaluated
+            rules: Matched rules (blocking and warning)
+            seconds: Time the evaluation took
+        """
+        self.record_matches(input_data, [(r.name, r.action) for r in rules], seconds)
+
+    def record_matches(self, input_data: Dict[str, Any], matches: List[Tuple[str, str]],
+                       seconds: float) -> None:
+        """Buffer the records of one decision given as (rule name, action) pairs.
+
+        Used for decisions answered by the decision cache, which keeps the
+        names and actions of the matched rules but not the rules.
+        """
+        prefix = '\t'.join((
+            f'{time.time():.3f}',
+            _clean(input_data.get('session_id')),
+            _clean(input_data.get('hook_event_name')),
+            _clean(input_data.get('tool_name')),
+        ))
+        suffix = f'{seconds * 1000:.3f}\n'
+        if matches:
+            self._buffer.extend(f'{prefix}\t{_clean(name)}\t{_clean(action)}\t{suffix}'
+                                for name, action in matches)
+        else:
+            self._buffer.append(f'{prefix}\t\tallow\t{suffix}')
+
+        if self._wake is not None:
+            if len(self._buffer) >= MAX_BATCH:
+                self._wake.set()
+        elif not self._exit_flush:
+            # Short-lived hook process: one write at exit
+            import atexit
+            atexit.register(self._flush_at_exit)
+            self._exit_flush = True
+
+    def flush(self) -> None:
+        """Append the buffered records with a single write. Failures are reported once."""
+        # Slice and delete (each atomic under the GIL) rather than swapping
+        # lists, so records added meanwhile by another thread are kept
+        count = len(self._buffer)
+        if not count:
+            return
+        lines = self._buffer[:count]
+        del self._buffer[:count]
+        if self._failed:
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                make_cache_dir(directory)
+            # O_APPEND with one write per batch keeps concurrent hook
+            # processes from interleaving records
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, ''.join(lines).encode('utf-8', 'replace'))
+            finally:
+                os.close(fd)
+        except OSError as e:
+            self._failed = True
+            print(f"Warning: Failed to write telemetry to {self.path}: {e}", file=sys.stderr)
+
+    def start_background(self) -> None:
+        """Flush from a daemon thread instead of at exit (for long-lived processes)."""
+        if self._wake is not None:
+            return
+        import atexit
+        import threading
+
+        self._wake = threading.Event()
+        threading.Thread(target=self._flush_loop, daemon=True).start()
+        if not self._exit_flush:
+            atexit.register(self.flush)
+            self._exit_flush = True
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._wake.wait(FLUSH_INTERVAL)
+            self._wake.clear()
+            self.flush()
+
+    def _flush_at_exit(self) -> None:
+        # Deliver the hook's response before touching the telemetry file
+        try:
+            sys.stdout.flush()
+        except (OSError, ValueError):
+            pass
+        self.flush()
+
+
+_sinks: Dict[str, TelemetrySink] = {}
+
+
+def get_sink(path: Optional[str]) -> Optional[TelemetrySink]:
+    """Return the process-wide sink for a telemetry file (None if path is None)."""
+    if path is None:
+        return None
+    sink = _sinks.get(path)
+    if sink is None:
+        sink = _sinks[path] = TelemetrySink(path)
+    return sink
+
+
+def _clean(value: Any) -> str:
+    """Format a field value without tabs or newlines."""
+    return str(value).translate(_TRANSLATE) if value is not None else ''
+
+
+class LatencyCounts:
+    """Evaluation times counted by recorded value.
+
+    Values are recorded with 1 µs resolution, so memory is bounded by the
+    number of distinct values rather than by the number of records, and
+    percentiles are exact.
+    """
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self._sorted: Optional[List[Tuple[float, int]]] = None
+
+    def add(self, ms: str) -> None:
+        self.counts[ms] = self.counts.get(ms, 0) + 1
+        self._sorted = None
+
+    def values(self) -> List[Tuple[float, int]]:
+        """Return (ms, count) pairs in ascending order, skipping malformed values."""
+        if self._sorted is None:
+            pairs = []
+            for text, count in self.counts.items():
+                try:
+                    pairs.append((float(text), count))
+                except ValueError:
+                    continue
+            self._sorted = sorted(pairs)
+        return self._sorted
+
+    @property
+    def count(self) -> int:
+        return sum(count for _, count in self.values())
+
+    def mean(self) -> float:
+        total = self.count
+        return sum(ms * count for ms, count in self.values()) / total if total else 0.0
+
+    def max(self) -> float:
+        values = self.values()
+        return values[-1][0] if values else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """Return the smallest value at or above the given fraction of values."""
+        target = fraction * self.count
+        seen = 0
+        for ms, count in self.values():
+            seen += count
+            if seen >= target:
+                return ms
+        return 0.0
+
+
+def summarize(lines: Iterable[str]) -> Dict[str, Any]:
+    """Aggregate telemetry records in one streaming pass.
+
+    Memory grows with the number of rules, events and distinct latency
+    values, not with the number of records.
+
+    Returns:
+        Dict with per-rule hit counts ("rules"), per hook event and tool
+        latencies ("events"), and the evaluation and record counts
+    """
+    rules: Dict[str, Dict[str, Any]] = {}
+    events: Dict[str, LatencyCounts] = {}
+    records = evaluations = malformed = 0
+    previous = None
+    width = len(FIELDS)
+
+    for line in lines:
+        parts = line.split('\t')
+        if len(parts) != width:
+            malformed += 1
+            continue
+        records += 1
+        timestamp, session, hook_event, tool, rule, action, eval_ms = parts
+
+        # Adjacent records of the same evaluation share these fields
+        evaluation = (timestamp, session, hook_event, tool, eval_ms)
+        if evaluation != previous:
+            previous = evaluation
+            evaluations += 1
+            event = f'{hook_event}:{tool}' if tool else hook_event
+            latencies = events.get(event)
+            if latencies is None:
+                latencies = events[event] = LatencyCounts()
+            latencies.add(eval_ms.rstrip())
+
+        if rule:
+            entry = rules.get(rule)
+            if entry is None:
+                entry = rules[rule] = {'hits': 0, 'actions': {}, 'sessions': set(), 'last': ''}
+            entry['hits'] += 1
+            entry['actions'][action] = entry['actions'].get(action, 0) + 1
+            if len(entry['sessions']) < MAX_SESSIONS:
+                entry['sessions'].add(session)
+            if timestamp > entry['last']:  # Same width until the year 2286
+                entry['last'] = timestamp
+
+    return {
+        'records': records,
+        'evaluations': evaluations,
+        'malformed': malformed,
+        'rules': rules,
+        'events': events,
+    }
+
+
+def read_lines(paths: List[str]) -> Iterable[str]:
+    """Yield the lines of several telemetry files in turn."""
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            yield from f
+
+
+def print_report(summary: Dict[str, Any], top: int = 20) -> None:
+    """Print the most frequently matched rules and latency per event."""
+    print(f"{summary['evaluations']} evaluations, {summary['records']} records"
+          + (f", {summary['malformed']} malformed lines skipped" if summary['malformed'] else '') + '\n')
+
+    print(f"Most matched rules (top {top}):")
+    print(f"  {'rule':<32} {'hits':>9} {'block':>8} {'warn':>8} {'sessions':>9}  last match")
+    ranked = sorted(summary['rules'].items(), key=lambda item: item[1]['hits'], reverse=True)
+    for name, entry in ranked[:top]:
+        sessions = len(entry['sessions'])
+        try:
+            last = time.strftime('%Y-%m-%d %H:%M', time.localtime(float(entry['last'])))
+        except ValueError:
+            last = '?'
+        print(f"  {name[:32]:<32} {entry['hits']:>9} {entry['actions'].get('block', 0):>8} "
+              f"{entry['actions'].get('warn', 0):>8} "
+              f"{sessions if sessions < MAX_SESSIONS else f'{MAX_SESSIONS}+':>9}  {last}")
+    if not ranked:
+        print("  (no matches)")
+
+    print("\nEvaluation time per event (ms):")
+    print(f"  {'event':<32} {'evals':>9} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>9}")
+    for event, latencies in sorted(summary['events'].items(), key=lambda item: item[1].count, reverse=True):
+        print(f"  {event[:32]:<32} {latencies.count:>9} {latencies.mean():>8.2f} "
+              f"{latencies.percentile(0.5):>8.2f} {latencies.percentile(0.95):>8.2f} "
+              f"{latencies.percentile(0.99):>8.2f} {latencies.max():>9.2f}")
+
+
+def main(argv: List[str]) -> int:
+    """Command line entry point."""
+    if len(argv) < 2 or argv[1] != 'report':
+        print("Usage: telemetry.py report [--top N] [--file PATH ...]", file=sys.stderr)
+        return 2
+
+    top = int(argv[argv.index('--top') + 1]) if '--top' in argv else 20
+    paths = [argv[i + 1] for i, arg in enumerate(argv[:-1]) if arg == '--file']
+    if not paths:
+        paths = [telemetry_path() or TELEMETRY_FILE]
+
+    try:
+        summary = summarize(read_lines(paths))
+    except (IOError, OSError) as e:
+        print(f"Cannot read telemetry: {e}", file=sys.stderr)
+        return 1
+
+    print_report(summary, top=top)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
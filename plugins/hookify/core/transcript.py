@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""Streaming evaluation of transcript conditions for hookify plugin.
+
+Session transcripts can grow to hundreds of megabytes. Instead of reading the
+whole file into memory once per condition, TranscriptScanner evaluates every
+transcript condition of a ruleset in a single chunked pass with bounded memory.
+Consecutive chunks overlap so matches that straddle a chunk boundary are still
+found.
+
+Stop hooks fire many times per session, so the scan state (byte offset, which
+conditions already matched, head/tail windows) is persisted per session under
+.claude/.hookify-cache/transcripts/. Later evaluations only scan the bytes
+appended since the last run. The state is discarded when the transcript was
+truncated, replaced or rewritten, or when the set of conditions changed.
+
+A scan can run its regex searches through a guard, such as RegexTimer.run,
+one chunk window at a time; a guarded scan still keeps memory bounded.
+"""
+
+import codecs
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from hookify.core.config_loader import Condition
+from hookify.core.settings import CACHE_DIR, make_cache_dir
+from hookify.matchers.regex_set import RegexSet
+
+# Bytes read per chunk
+CHUNK_SIZE = 1024 * 1024
+
+# Characters of the previous chunk kept in front of the next one for regexes.
+# A regex match longer than this that spans a chunk boundary can be missed.
+REGEX_OVERLAP = 64 * 1024
+
+# A regex match only counts once this many characters of the transcript
+# follow it (or the transcript ends there), so $, \Z, \b and lookaheads are
+# not fooled by the end of a chunk. Must be smaller than REGEX_OVERLAP.
+REGEX_LOOKAHEAD = 4 * 1024
+
+# Scan states are stored here, one file per session
+STATE_DIR = os.path.join(CACHE_DIR, 'transcripts')
+STATE_VERSION = 2
+
+# Leading bytes hashed to detect a transcript that was rewritten in place
+HEAD_CHECK_SIZE = 4096
+
+# Scan states not updated for this long are removed
+STATE_MAX_AGE = 7 * 24 * 60 * 60
+
+ConditionKey = Tuple[str, str]
+
+# Runs a regex search: guard(func, *args) -> func(*args)
+Guard = Callable[..., Any]
+
+
+class TranscriptScanner:
+    """Evaluates a fixed set of transcript conditions in one streaming pass."""
+
+    def __init__(self, conditions: List[Condition], state_name: str = ''):
+        """Set up the scan of a ruleset's transcript conditions.
+
+        Args:
+            conditions: Transcript conditions (duplicates are scanned once)
+            state_name: Added to the saved state's file name, so that several
+                scanners of one ruleset keep separate per-session states
+        """
+        self.state_name = state_name
+        self.keys: List[ConditionKey] = list(dict.fromkeys(
+            (c.operator, c.pattern) for c in conditions
+        ))
+
+        self._literals = sorted({p for op, p in self.keys if op in ('contains', 'not_contains')})
+        self._regexes = RegexSet(p for op, p in self.keys if op == 'regex_match')
+        self._prefixes = {p for op, p in self.keys if op == 'starts_with'}
+        self._suffixes = {p for op, p in self.keys if op == 'ends_with'}
+        self._exact = {p for op, p in self.keys if op == 'equals'}
+
+        self._literal_overlap = max((len(p) for p in self._literals), default=1) - 1
+        self._head_size = max((len(p) for p in self._prefixes), default=0)
+        self._tail_size = max((len(p) for p in self._suffixes), default=0)
+
+    def scan_file(self, path: str, session_id: Optional[str] = None,
+                  guard: Optional[Guard] = None) -> Dict[ConditionKey, bool]:
+        """Scan a transcript file.
+
+        With a session_id, the scan resumes from the state saved by the
+        previous evaluation in the same session and saves its own state.
+        Exceptions raised by guard (e.g. RegexTimeout) propagate, and the
+        state is then not saved.
+
+        Read errors are reported on stderr and the transcript is treated as
+        empty, matching how unreadable transcripts have always been handled.
+        """
+        try:
+            with open(path, 'rb') as f:
+                if not session_id:
+                    return self.scan_stream(f, guard)
+                return self._scan_incremental(f, session_id, guard)
+        except FileNotFoundError:
+            print(f"Warning: Transcript file not found: {path}", file=sys.stderr)
+        except PermissionError:
+            print(f"Warning: Permission denied reading transcript: {path}", file=sys.stderr)
+        except (IOError, OSError) as e:
+            print(f"Warning: Error reading transcript {path}: {e}", file=sys.stderr)
+        return self.scan_stream(None, guard)
+
+    def scan_stream(self, stream, guard: Optional[Guard] = None) -> Dict[ConditionKey, bool]:
+        """Scan a binary stream (None = empty transcript) and return results."""
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        state = _ScanState(self)
+        state.guard = guard
+
+        if stream is not None:
+            self._read(stream, state, decoder)
+        state.feed(decoder.decode(b'', final=True))
+
+        return state.results()
+
+    def _read(self, stream, state: '_ScanState', decoder) -> None:
+        """Feed the rest of stream into state, stopping early once decided."""
+        while True:
+            data = stream.read(CHUNK_SIZE)
+            if not data:
+                break
+            state.offset += len(data)
+            state.feed(decoder.decode(data))
+            if state.done():
+                break
+
+    def _scan_incremental(self, f, session_id: str, guard: Optional[Guard]) -> Dict[ConditionKey, bool]:
+        """Scan only the bytes appended since the session's last saved state."""
+        st = os.fstat(f.fileno())
+        state_path = os.path.join(
+            STATE_DIR, hashlib.sha1(session_id.encode('utf-8')).hexdigest() + self.state_name + '.json'
+        )
+
+        state = self._load_state(state_path, f, st)
+        is_new = state is None
+        if state is None:
+            state = _ScanState(self)
+            state.identity = [st.st_dev, st.st_ino]
+        state.guard = guard
+        f.seek(state.offset)
+
+        # Bytes of an incomplete UTF-8 sequence at the end of the file stay
+        # in the decoder; they are not counted and are re-read next time.
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._read(f, state, decoder)
+        state.offset -= len(decoder.getstate()[0])
+
+        if state.head_hash is None or state.head_length < HEAD_CHECK_SIZE:
+            f.seek(0)
+            head = f.read(min(HEAD_CHECK_SIZE, state.offset))
+            state.head_length = len(head)
+            state.head_hash = hashlib.sha1(head).hexdigest()
+
+        self._save_state(state_path, state, is_new)
+        return state.results()
+
+    def _load_state(self, state_path: str, f, st: os.stat_result) -> Optional['_ScanState']:
+        """Load a saved scan state if it is still valid for this transcript."""
+        try:
+            with open(state_path, 'r') as sf:
+                data = json.load(sf)
+        except (IOError, OSError, ValueError):
+            return None
+
+        try:
+            if data.get('version') != STATE_VERSION:
+                return None
+            if [tuple(k) for k in data['keys']] != self.keys:
+                return None  # Conditions changed - rescan from the start
+            if data['identity'] != [st.st_dev, st.st_ino]:
+                return None  # Transcript replaced or rotated
+            if data['offset'] > st.st_size:
+                return None  # Transcript truncated
+
+            f.seek(0)
+            head = f.read(data['head_length'])
+            if hashlib.sha1(head).hexdigest() != data['head_hash']:
+                return None  # Transcript rewritten in place
+
+            return _ScanState.from_dict(self, data)
+        except (KeyError, TypeError, ValueError, OSError):
+            return None
+
+    def _save_state(self, state_path: str, state: '_ScanState', is_new: bool) -> None:
+        """Atomically save a scan state. Failures are ignored."""
+        try:
+            make_cache_dir(STATE_DIR)
+            if is_new:
+                _prune_states()
+            # Unique per thread: the daemon scans from several threads at once
+            tmp_path = f"{state_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as sf:
+                json.dump(state.to_dict(), sf)
+            os.replace(tmp_path, state_path)
+        except (IOError, OSError, TypeError, ValueError):
+            pass
+
+
+class IncrementalScan:
+    """A scan fed by the caller, with results available after every piece.
+
+    Used to replay a recorded session: the results after feeding the first
+    N bytes are what a Stop hook saw when the transcript was N bytes long.
+
+    A deferred scan only keeps the pieces fed, and scans them when results()
+    is called, so that its regexes run under the guard given there. Once a
+    guarded search raises, the scan is incomplete and results() raises the
+    same exception again.
+    """
+
+    def __init__(self, scanner: TranscriptScanner, deferred: bool = False):
+        self._state = _ScanState(scanner)
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._deferred = deferred
+        self._pending: List[bytes] = []
+        self._error: Optional[BaseException] = None
+
+    def feed(self, data: bytes) -> None:
+        """Append bytes of the transcript."""
+        if self._deferred:
+            self._pending.append(data)
+        elif not self._state.done():
+            self._feed(data)
+
+    def _feed(self, data: bytes) -> None:
+        self._state.offset += len(data)
+        self._state.feed(self._decoder.decode(data))
+
+    def results(self, guard: Optional[Guard] = None) -> Dict[ConditionKey, bool]:
+        """Return the results for the transcript fed so far."""
+        if self._error is not None:
+            raise self._error
+        self._state.guard = guard
+        try:
+            pending, self._pending = self._pending, []
+            for data in pending:
+                if self._state.done():
+                    break
+                self._feed(data)
+            if not self._state.length:
+                return self._state.scanner.scan_stream(None, guard)
+            return self._state.results()
+        except Exception as e:
+            self._error = e
+            raise
+        finally:
+            self._state.guard = None
+
+
+def _prune_states() -> None:
+    """Remove scan states of sessions that have not been evaluated recently."""
+    cutoff = time.time() - STATE_MAX_AGE
+    try:
+        with os.scandir(STATE_DIR) as entries:
+            for entry in entries:
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+
+
+class _ScanState:
+    """Mutable state of one scan; keeps at most a chunk plus overlaps in memory."""
+
+    def __init__(self, scanner: TranscriptScanner):
+        self.scanner = scanner
+        self.guard: Optional[Guard] = None  # Runs the regex searches (not saved)
+        self.found_literals = {''} if '' in scanner._literals else set()
+        self.found_regexes = set()  # Matches followed by REGEX_LOOKAHEAD characters
+        self.head = ''
+        self.tail = ''  # Last characters seen, for ends_with and chunk overlaps
+        self.length = 0
+        self.exact_candidates = {p for p in scanner._exact}
+
+        # Position in the transcript file and its identity, for incremental scans
+        self.offset = 0
+        self.identity: Optional[List[int]] = None
+        self.head_hash: Optional[str] = None
+        self.head_length = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the scan state to a JSON-serializable dict."""
+        return {
+            'version': STATE_VERSION,
+            'keys': self.scanner.keys,
+            'identity': self.identity,
+            'offset': self.offset,
+            'head_hash': self.head_hash,
+            'head_length': self.head_length,
+            'length': self.length,
+            'head': self.head,
+            'tail': self.tail,
+            'found_literals': sorted(self.found_literals),
+            'found_regexes': sorted(self.found_regexes),
+            'exact_candidates': sorted(self.exact_candidates),
+        }
+
+    @classmethod
+    def from_dict(cls, scanner: TranscriptScanner, data: Dict[str, Any]) -> '_ScanState':
+        """Restore a scan state saved with to_dict."""
+        state = cls(scanner)
+        state.identity = data['identity']
+        state.offset = data['offset']
+        state.head_hash = data['head_hash']
+        state.head_length = data['head_length']
+        state.length = data['length']
+        state.head = data['head']
+        state.tail = data['tail']
+        state.found_literals = set(data['found_literals'])
+        state.found_regexes = set(data['found_regexes'])
+        state.exact_candidates = set(data['exact_candidates'])
+        return state
+
+    def feed(self, text: str) -> None:
+        if not text:
+            return
+        scanner = self.scanner
+
+        if len(self.head) < scanner._head_size:
+            self.head += text[:scanner._head_size - len(self.head)]
+
+        for pattern in list(self.exact_candidates):
+            if pattern[self.length:self.length + len(text)] != text:
+                self.exact_candidates.discard(pattern)
+        seen = self.length
+        self.length += len(text)
+
+        if scanner._literals:
+            window = self.tail[-scanner._literal_overlap:] + text if scanner._literal_overlap else text
+            for literal in scanner._literals:
+                if literal not in self.found_literals and literal in window:
+                    self.found_literals.add(literal)
+
+        if len(scanner._regexes) > len(self.found_regexes):
+            # Matches near the end of the window are left to the next window
+            # (or to results()), which see the characters that follow them
+            context, pos = self._regex_context(seen)
+            window = context + text
+            end_limit = len(window) - REGEX_LOOKAHEAD
+            if end_limit > pos:
+                self.found_regexes |= self._search_regexes(window, pos, end_limit)
+
+        keep = max(REGEX_OVERLAP + 1 if len(scanner._regexes) else 0,
+                   scanner._literal_overlap, scanner._tail_size)
+        self.tail = (self.tail + text)[-keep:]
+
+    def _regex_context(self, seen: int) -> Tuple[str, int]:
+        """Return the text before new input and the index where matches may start.
+
+        One character more than REGEX_OVERLAP is kept and skipped with pos,
+        so ^, \\A, \\b and lookbehinds see the transcript as it is, not a
+        window that starts mid-text.
+        """
+        context = self.tail[-(REGEX_OVERLAP + 1):]
+        return context, (0 if len(context) == seen else 1)
+
+    def _final_regexes(self) -> Set[str]:
+        """Return the regexes that match, including near the transcript's end.
+
+        Matches at the end depend on where the transcript currently ends, so
+        they are checked for every result and never saved as found.
+        """
+        found = self.found_regexes
+        if len(found) == len(self.scanner._regexes):
+            return found
+        context, pos = self._regex_context(self.length)
+        return found | self._search_regexes(context, pos, None)
+
+    def _search_regexes(self, window: str, pos: int, end_limit: Optional[int]) -> Set[str]:
+        """Search a window for the regexes not found yet, through the guard."""
+        search = self.scanner._regexes.search
+        if self.guard is None:
+            return search(window, self.found_regexes, pos, end_limit)
+        return self.guard(search, window, self.found_regexes, pos, end_limit)
+
+    def done(self) -> bool:
+        """True once no further input can change any result."""
+        scanner = self.scanner
+        return (len(self.found_literals) == len(scanner._literals)
+                and len(self.found_regexes) == len(scanner._regexes)
+                and not scanner._suffixes
+                and not self.exact_candidates
+                and len(self.head) >= scanner._head_size)
+
+    def results(self) -> Dict[ConditionKey, bool]:
+        found_regexes = self._final_regexes()
+        results: Dict[ConditionKey, bool] = {}
+        for operator, pattern in self.scanner.keys:
+            if operator == 'contains':
+                value = pattern in self.found_literals
+            elif operator == 'not_contains':
+                value = pattern not in self.found_literals
+            elif operator == 'regex_match':
+                if pattern not in self.scanner._regexes:
+                    print(f"Invalid regex pattern '{pattern}'", file=sys.stderr)
+                value = pattern in found_regexes
+            elif operator == 'starts_with':
+                value = self.head.startswith(pattern)
+            elif operator == 'ends_with':
+                value = self.tail.endswith(pattern)
+            elif operator == 'equals':
+                value = pattern in self.exact_candidates and len(pattern) == self.length
+            else:
+                value = False
+            results[(operator, pattern)] = value
+        return results
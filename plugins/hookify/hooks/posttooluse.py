@@ -2,12 +2,13 @@
 """PostToolUse hook executor for hookify plugin.
 
 This script is called by Claude Code after a tool executes.
-It reads .claude/hookify.*.local.md files and evaluates rules.
+It answers immediately when the project has no rule files, forwards the
+input to the hookify daemon when one is running, and otherwise reads
+.claude/hookify.*.local.md files and evaluates rules.
 """
 
 import os
 import sys
-import json
 
 # CRITICAL: Add plugin root to Python path for imports
 PLUGIN_ROOT = os.environ.get('CLAUDE_PLUGIN_ROOT')
@@ -19,9 +20,9 @@ if PLUGIN_ROOT:
         sys.path.insert(0, PLUGIN_ROOT)
 
 try:
-    from hookify.core.config_loader import load_rules
-    from hookify.core.rule_engine import RuleEngine
+    from hookify.core.client import evaluate_hook
 except ImportError as e:
+    import json
     error_msg = {"systemMessage": f"Hookify import error: {e}"}
     print(json.dumps(error_msg), file=sys.stdout)
     sys.exit(0)
@@ -31,27 +32,13 @@ def main():
     """Main entry point for PostToolUse hook."""
     try:
         # Read input from stdin
-        input_data = json.load(sys.stdin)
-
-        # Determine event type based on tool
-        tool_name = input_data.get('tool_name', '')
-        event = None
-        if tool_name == 'Bash':
-            event = 'bash'
-        elif tool_name in ['Edit', 'Write', 'MultiEdit']:
-            event = 'file'
-
-        # Load rules
-        rules = load_rules(event=event)
-
-        # Evaluate rules
-        engine = RuleEngine()
-        result = engine.evaluate_rules(rules, input_data)
+        raw_input = sys.stdin.read()
 
         # Always output JSON (even if empty)
-        print(json.dumps(result), file=sys.stdout)
+        print(evaluate_hook('posttooluse', raw_input), file=sys.stdout)
 
     except Exception as e:
+        import json
         error_output = {
             "systemMessage": f"Hookify error: {str(e)}"
         }
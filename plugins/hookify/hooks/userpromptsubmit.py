@@ -2,12 +2,13 @@
 """UserPromptSubmit hook executor for hookify plugin.
 
 This script is called by Claude Code when user submits a prompt.
-It reads .claude/hookify.*.local.md files and evaluates rules.
+It answers immediately when the project has no rule files, forwards the
+input to the hookify daemon when one is running, and otherwise reads
+.claude/hookify.*.local.md files and evaluates rules.
 """
 
 import os
 import sys
-import json
 
 # CRITICAL: Add plugin root to Python path for imports
 PLUGIN_ROOT = os.environ.get('CLAUDE_PLUGIN_ROOT')
@@ -19,9 +20,9 @@ if PLUGIN_ROOT:
         sys.path.insert(0, PLUGIN_ROOT)
 
 try:
-    from hookify.core.config_loader import load_rules
-    from hookify.core.rule_engine import RuleEngine
+    from hookify.core.client import evaluate_hook
 except ImportError as e:
+    import json
     error_msg = {"systemMessage": f"Hookify import error: {e}"}
     print(json.dumps(error_msg), file=sys.stdout)
     sys.exit(0)
@@ -31,19 +32,13 @@ def main():
     """Main entry point for UserPromptSubmit hook."""
     try:
         # Read input from stdin
-        input_data = json.load(sys.stdin)
-
-        # Load user prompt rules
-        rules = load_rules(event='prompt')
-
-        # Evaluate rules
-        engine = RuleEngine()
-        result = engine.evaluate_rules(rules, input_data)
+        raw_input = sys.stdin.read()
 
         # Always output JSON (even if empty)
-        print(json.dumps(result), file=sys.stdout)
+        print(evaluate_hook('userpromptsubmit', raw_input), file=sys.stdout)
 
     except Exception as e:
+        import json
         error_output = {
             "systemMessage": f"Hookify error: {str(e)}"
         }
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""Catastrophic backtracking (ReDoS) checks for user-written regexes.
+
+Python's re module is a backtracking engine: a pattern such as ``(a+)+$`` run
+against a long non-matching input takes exponential time and would hang the
+hook until Claude Code kills it. This module provides two defenses:
+
+- analyze_pattern() inspects a parsed pattern and flags the two classic
+  causes of exponential backtracking: nested quantifiers whose inner
+  repetition competes with the outer one for the same characters, and
+  alternations inside a repetition whose branches can match the same text.
+  The analysis is heuristic; it errs on the side of flagging.
+
+- RegexTimer (and run_with_timeout() for a single call) aborts a match that
+  runs longer than a time budget. It uses SIGALRM, which the re engine
+  checks while matching, so it only works on Unix and in the main thread;
+  elsewhere the call runs unbounded.
+
+Usage (from the project root, to check the project's rules):
+    python3 /path/to/hookify/matchers/redos.py
+"""
+
+import os
+import re
+import signal
+import sys
+from functools import lru_cache
+from typing import Callable, FrozenSet, List, Tuple
+
+# Running this file directly: put the hookify package on sys.path
+if __name__ == '__main__':
+    import runpy
+    runpy.run_path(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'utils', 'script_path.py'))
+
+from hookify.matchers.regex_set import parse_pattern, sre_constants
+
+# Characters used to approximate character classes: ASCII plus a few
+# non-ASCII letters, digits and spaces that Unicode classes match
+_ALPHABET = frozenset(chr(i) for i in range(128)) | frozenset('éßΩ٣  中')
+
+_REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+_POSSESSIVE = {getattr(sre_constants, name) for name in ('POSSESSIVE_REPEAT', 'ATOMIC_GROUP')
+               if hasattr(sre_constants, name)}
+
+# A repeat with more iterations than this is treated as unbounded
+_LARGE_REPEAT = 32
+
+CharSet = FrozenSet[str]
+
+
+class RegexTimeout(Exception):
+    """A regex match exceeded its time budget."""
+
+
+@lru_cache(maxsize=None)
+def _category_chars(category) -> CharSet:
+    """Characters of the sample alphabet in an sre category (\\d, \\s, \\w, ...)."""
+    return frozenset(c for c in _ALPHABET if _category(category, c))
+
+
+def _category(category, char: str) -> bool:
+    """Check whether char is in an sre character category."""
+    name = str(category)
+    if 'DIGIT' in name:
+        result = char.isdecimal()
+    elif 'SPACE' in name:
+        result = char.isspace()
+    elif 'WORD' in name:
+        result = char.isalnum() or char == '_'
+    elif 'LINEBREAK' in name:
+        result = char == '\n'
+    else:
+        result = True
+    return not result if 'NOT_' in name else result
+
+
+def _in_set(items, ignore_case: bool) -> CharSet:
+    """Evaluate an IN (character class) item over the sample alphabet."""
+    negate = False
+    chars = set()
+    for op, av in items:
+        if op == sre_constants.NEGATE:
+            negate = True
+        elif op == sre_constants.LITERAL:
+            chars.add(chr(av))
+        elif op == sre_constants.RANGE:
+            chars.update(c for c in _ALPHABET if av[0] <= ord(c) <= av[1])
+        elif op == sre_constants.CATEGORY:
+            chars.update(_category_chars(av))
+        else:
+            chars.update(_ALPHABET)
+    if ignore_case:
+        chars.update({c.lower() for c in chars} | {c.upper() for c in chars})
+    result = frozenset(chars) & _ALPHABET
+    return _ALPHABET - result if negate else result
+
+
+def _literal(code: int, ignore_case: bool) -> CharSet:
+    char = chr(code)
+    return frozenset({char, char.lower(), char.upper()}) if ignore_case else frozenset({char})
+
+
+class _Analyzer:
+    """Walks a parsed pattern, collecting descriptions of risky constructs."""
+
+    def __init__(self, ignore_case: bool):
+        self.ignore_case = ignore_case
+        self.problems: List[str] = []
+
+    def first(self, seq) -> Tuple[CharSet, bool]:
+        """Characters a sequence can start with, and whether it can match ''."""
+        chars: CharSet = frozenset()
+        for item in seq:
+            item_chars, nullable = self.first_item(item)
+            chars |= item_chars
+            if not nullable:
+                return chars, False
+        return chars, True
+
+    def first_item(self, item) -> Tuple[CharSet, bool]:
+        op, av = item
+        if op == sre_constants.LITERAL:
+            return _literal(av, self.ignore_case), False
+        if op == sre_constants.NOT_LITERAL:
+            return _ALPHABET - _literal(av, self.ignore_case), False
+        if op == sre_constants.ANY:
+            return _ALPHABET - {'\n'}, False
+        if op == sre_constants.IN:
+            return _in_set(av, self.ignore_case), False
+        if op == sre_constants.SUBPATTERN:
+            return self.first(av[-1])
+        if op == sre_constants.BRANCH:
+            chars: CharSet = frozenset()
+            nullable = False
+            for alternative in av[1]:
+                alt_chars, alt_nullable = self.first(alternative)
+                chars |= alt_chars
+                nullable = nullable or alt_nullable
+            return chars, nullable
+        if op in _REPEATS or op in _POSSESSIVE and isinstance(av, tuple):
+            chars, nullable = self.first(av[2])
+            return chars, nullable or av[0] == 0
+        if op in _POSSESSIVE:  # Atomic group
+            return self.first(av)
+        if op == sre_constants.GROUPREF_EXISTS:
+            yes_chars, yes_nullable = self.first(av[1])
+            no_chars, no_nullable = self.first(av[2]) if av[2] else (frozenset(), True)
+            return yes_chars | no_chars, yes_nullable or no_nullable
+        if op == sre_constants.GROUPREF:
+            return _ALPHABET, True
+        # Anchors and lookarounds consume nothing
+        return frozenset(), True
+
+    def chars(self, seq) -> CharSet:
+        """All characters a sequence can consume anywhere."""
+        result: CharSet = frozenset()
+        for op, av in seq:
+            if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL,
+                      sre_constants.ANY, sre_constants.IN):
+                result |= self.first_item((op, av))[0]
+            elif op == sre_constants.SUBPATTERN:
+                result |= self.chars(av[-1])
+            elif op == sre_constants.BRANCH:
+                for alternative in av[1]:
+                    result |= self.chars(alternative)
+            elif op in _REPEATS or op in _POSSESSIVE and isinstance(av, tuple):
+                result |= self.chars(av[2])
+            elif op in _POSSESSIVE:
+                result |= self.chars(av)
+            elif op == sre_constants.GROUPREF:
+                result |= _ALPHABET
+        return result
+
+    def walk(self, seq, follow: CharSet, repeated: bool) -> None:
+        """Check a sequence.
+
+        Args:
+            seq: Parsed subpattern
+            follow: Characters that can come right after seq
+            repeated: True inside the body of an unbounded repetition
+        """
+        # What can follow each item, computed right to left in one pass
+        items = list(seq)
+        follows = []
+        after = follow
+        for item in reversed(items):
+            follows.append(after)
+            item_chars, nullable = self.first_item(item)
+            after = item_chars | after if nullable else item_chars
+        follows.reverse()
+
+        for (op, av), item_follow in zip(items, follows):
+            if op in _REPEATS:
+                low, high, body = av
+                unbounded = high == sre_constants.MAXREPEAT or high > _LARGE_REPEAT
+                if unbounded and repeated and self.chars(body) & item_follow:
+                    self.problems.append(
+                        'nested quantifier: a repetition inside another repetition '
+                        'can match the same characters in many ways'
+                    )
+                body_first, _ = self.first(body)
+                self.walk(body, body_first | item_follow if high > 1 else item_follow,
+                          repeated or unbounded)
+            elif op == sre_constants.SUBPATTERN:
+                self.walk(av[-1], item_follow, repeated)
+            elif op == sre_constants.BRANCH:
+                if repeated:
+                    self.check_alternatives(av[1], item_follow)
+                for alternative in av[1]:
+                    self.walk(alternative, item_follow, repeated)
+            elif op == sre_constants.GROUPREF_EXISTS:
+                for alternative in (av[1], av[2]):
+                    if alternative:
+                        self.walk(alternative, item_follow, repeated)
+            elif op in _POSSESSIVE:
+                # Possessive repeats and atomic groups never backtrack into
+                # their body, so ambiguity inside them is harmless
+                body = av[2] if isinstance(av, tuple) else av
+                self.walk(body, item_follow, False)
+
+    def check_alternatives(self, alternatives, follow: CharSet) -> None:
+        """Flag alternatives (inside a repetition) that can start the same way."""
+        starts = []
+        for alternative in alternatives:
+            chars, nullable = self.first(alternative)
+            starts.append(chars | follow if nullable else chars)
+        for i in range(len(starts)):
+            for j in range(i + 1, len(starts)):
+                if starts[i] & starts[j]:
+                    self.problems.append(
+                        'overlapping alternation: alternatives inside a repetition '
+                        'can match the same text'
+                    )
+                    return
+
+
+@lru_cache(maxsize=4096)
+def _analyze(pattern: str, flags: int) -> Tuple[str, ...]:
+    # Both causes need a repetition plus a second repetition or an
+    # alternation, so most patterns are cleared without parsing
+    quantifiers = pattern.count('*') + pattern.count('+') + pattern.count('{')
+    if quantifiers == 0 or (quantifiers == 1 and '|' not in pattern):
+        return ()
+
+    try:
+        parsed = parse_pattern(pattern, flags)
+    except (re.error, OverflowError, RecursionError):
+        return ()
+
+    analyzer = _Analyzer(bool((parsed.state.flags | flags) & re.IGNORECASE))
+    try:
+        analyzer.walk(parsed, frozenset(), False)
+    except RecursionError:
+        return ('pattern is too deeply nested to analyze',)
+    return tuple(dict.fromkeys(analyzer.problems))
+
+
+def analyze_pattern(pattern: str, flags: int = re.IGNORECASE) -> List[str]:
+    """Check a regex for constructs prone to catastrophic backtracking.
+
+    Args:
+        pattern: Regex pattern string
+        flags: Flags the pattern is compiled with
+
+    Returns:
+        Descriptions of the risky constructs found ([] if none or if the
+        pattern does not parse; invalid patterns are reported elsewhere)
+    """
+    return list(_analyze(pattern, flags))
+
+
+def _raise_timeout(signum, frame):
+    raise RegexTimeout()
+
+
+class RegexTimer:
+    """Bounds each regex scan to the same time budget.
+
+    Every run() arms the interval timer for its own call, so the budget
+    bounds a single match, never the time spent between matches (such as
+    reading a transcript). The SIGALRM handler is installed by the first
+    run() and restored by close(): a rule evaluation with many scans pays
+    for the handler once, and each scan costs two setitimer calls (about
+    2 us, against 10 us when the handler is swapped per scan).
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self._previous = None
+        self._installed = False
+        self._usable = seconds > 0 and hasattr(signal, 'setitimer')
+
+    def run(self, func: Callable, *args):
+        """Call func(*args), raising RegexTimeout if it runs longer than the budget."""
+        if not self._usable:
+            return func(*args)
+        if not self._installed:
+            try:
+                self._previous = signal.signal(signal.SIGALRM, _raise_timeout)
+            except ValueError:
+                self._usable = False  # Not the main thread
+                return func(*args)
+            self._installed = True
+
+        signal.setitimer(signal.ITIMER_REAL, self.seconds)
+        try:
+            return func(*args)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    def close(self) -> None:
+        """Restore the SIGALRM handler that was in place before the first run()."""
+        if self._installed:
+            signal.signal(signal.SIGALRM, self._previous)
+            self._installed = False
+
+
+def run_with_timeout(func: Callable, seconds: float, *args):
+    """Call func(*args), raising RegexTimeout if it runs longer than seconds.
+
+    The limit is enforced with SIGALRM, so it only applies on Unix in the
+    main thread; elsewhere (or with seconds <= 0) func runs unbounded.
+    """
+    timer = RegexTimer(seconds)
+    try:
+        return timer.run(func, *args)
+    finally:
+        timer.close()
+
+
+# Check the rules of the project in the current directory
+if __name__ == '__main__':
+    from hookify.core.config_loader import load_rules
+
+    risky = 0
+    for rule in load_rules():
+        for condition in rule.conditions:
+            if condition.operator != 'regex_match':
+                continue
+            for problem in analyze_pattern(condition.pattern):
+                risky += 1
+                print(f"{rule.name}: {condition.field} /{condition.pattern}/: {problem}")
+
+    print(f"{risky} risky pattern(s) found" if risky else "No risky patterns found")
+    sys.exit(1 if risky else 0)
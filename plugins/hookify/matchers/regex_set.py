@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Matching of many regex patterns against the same text.
+
+Each pattern is compiled once and searched separately. Combining patterns
+into alternations (to scan the text once for all of them) was measured to
+be slower with Python's re module at every pattern count and text length
+tried: an alternation loses the per-pattern literal prefix optimizations,
+and telling which alternative matched needs further scans.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Set
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+
+@lru_cache(maxsize=4096)
+def parse_pattern(pattern: str, flags: int = re.IGNORECASE):
+    """Parse a pattern into sre's syntax tree (cached; the tree must not be modified).
+
+    Raises:
+        re.error: If the pattern is invalid
+    """
+    return sre_parse.parse(pattern, flags)
+
+
+class RegexSet:
+    """A set of regex patterns matched against one text together."""
+
+    def __init__(self, patterns: Iterable[str], flags: int = re.IGNORECASE):
+        """Compile the patterns.
+
+        Invalid patterns are ignored; callers should check ``pattern in
+        regex_set`` and handle (and report) anything not contained.
+
+        Args:
+            patterns: Regex patterns
+            flags: Flags every pattern is compiled with
+        """
+        self._compiled: Dict[str, re.Pattern] = {}
+        for pattern in dict.fromkeys(patterns):
+            try:
+                self._compiled[pattern] = re.compile(pattern, flags)
+            except re.error:
+                continue
+
+    def __contains__(self, pattern: str) -> bool:
+        return pattern in self._compiled
+
+    def __len__(self) -> int:
+        return len(self._compiled)
+
+    def search(self, text: str, exclude: Iterable[str] = (), pos: int = 0,
+               end_limit: Optional[int] = None) -> Set[str]:
+        """Return the set of patterns that match text.
+
+        Args:
+            text: Text to search
+            exclude: Patterns not to search for (e.g. ones already found)
+            pos: Index where matches may start; ^, \\A, \\b and lookbehinds
+                still see the characters before it
+            end_limit: Only count matches ending at or before this index;
+                $, \\Z, \\b and lookaheads still see the characters after it
+        """
+        exclude = exclude if isinstance(exclude, (set, frozenset)) else set(exclude)
+        hits: Set[str] = set()
+        for pattern, regex in self._compiled.items():
+            if pattern in exclude:
+                continue
+            match = regex.search(text, pos)
+            if match is not None and (end_limit is None or match.end() <= end_limit):
+                hits.add(pattern)
+        return hits
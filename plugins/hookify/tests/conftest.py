@@ -0,0 +1,8 @@
+"""Make the plugin importable as the hookify package."""
+
+import os
+import sys
+
+PLUGINS_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PLUGINS_DIR not in sys.path:
+    sys.path.insert(0, PLUGINS_DIR)
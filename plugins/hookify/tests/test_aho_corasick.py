@@ -0,0 +1,53 @@
+"""AhoCorasick and contains conditions against the per-literal `in` loop."""
+
+import random
+
+from hookify.core import rule_engine
+from hookify.core.config_loader import Condition, Rule
+from hookify.core.rule_engine import RuleEngine
+from hookify.matchers.aho_corasick import AhoCorasick
+
+
+def random_text(rng, alphabet, length):
+    return ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, length)))
+
+
+def test_search_matches_substring_loop():
+    rng = random.Random(0)
+    for _ in range(500):
+        # A small alphabet gives overlapping, nested and repeated literals
+        literals = [random_text(rng, 'abc', 5) for _ in range(rng.randint(1, 15))]
+        automaton = AhoCorasick(literals)
+        for _ in range(10):
+            text = random_text(rng, 'abcd', 30)
+            assert automaton.search(text) == {p for p in literals if p in text}, (literals, text)
+
+
+def test_case_sensitive_and_empty_literal():
+    automaton = AhoCorasick(['Eval(', '', 'eval('])
+    assert len(automaton) == 2
+    assert automaton.search('x = eval(y)') == {'', 'eval('}
+    assert AhoCorasick([]).search('anything') == set()
+
+
+def test_contains_conditions_use_automaton_above_threshold(monkeypatch):
+    monkeypatch.setattr(rule_engine, 'MIN_AUTOMATON_LITERALS', 5)
+    rng = random.Random(1)
+    literals = sorted({random_text(rng, 'abc', 4) or 'a' for _ in range(30)})
+    rules = [
+        Rule(name=f'{operator}-{i}', enabled=True, event='bash',
+             conditions=[Condition(field='command', operator=operator, pattern=literal)])
+        for i, literal in enumerate(literals)
+        for operator in ('contains', 'not_contains')
+    ]
+    engine = RuleEngine()
+    assert engine.compile(rules).literal_sets
+    for _ in range(100):
+        command = random_text(rng, 'abcd ', 20)
+        input_data = {'hook_event_name': 'PreToolUse', 'tool_name': 'Bash',
+                      'tool_input': {'command': command}}
+        message = engine.evaluate_rules(rules, input_data).get('systemMessage', '')
+        for rule in rules:
+            condition = rule.conditions[0]
+            expected = (condition.pattern in command) == (condition.operator == 'contains')
+            assert (f'**[{rule.name}]**' in message) == expected, (rule.name, command)
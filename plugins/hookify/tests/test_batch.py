@@ -0,0 +1,96 @@
+"""evaluate_batch against evaluating each input on its own."""
+
+import itertools
+import os
+import random
+
+import pytest
+
+from hookify.core.client import resolve_event
+from hookify.core.config_loader import Condition, Rule
+from hookify.core.rule_engine import RuleEngine
+
+RULES = [
+    Rule(name="block-rm", enabled=True, event="bash", action="block", message="no rm",
+         conditions=[Condition(field="command", operator="regex_match", pattern=r"rm\s+-rf")]),
+    Rule(name="warn-sudo", enabled=True, event="bash", action="warn", message="sudo",
+         conditions=[Condition(field="command", operator="contains", pattern="sudo")]),
+    Rule(name="warn-env", enabled=True, event="file", action="warn", message="env file",
+         conditions=[Condition(field="file_path", operator="ends_with", pattern=".env")]),
+    Rule(name="block-eval", enabled=True, event="file", action="block", message="no eval",
+         conditions=[Condition(field="new_text", operator="contains", pattern="eval(")]),
+    Rule(name="stop-tests", enabled=True, event="stop", action="block", message="run tests",
+         conditions=[Condition(field="reason", operator="not_contains", pattern="tests pass")]),
+    Rule(name="any-secret", enabled=True, event="all", action="warn", message="secret",
+         conditions=[Condition(field="content", operator="regex_match", pattern=r"secret\w*")]),
+]
+
+
+def random_inputs(seed, count):
+    rng = random.Random(seed)
+    for i in range(count):
+        kind = rng.choice(["bash", "edit", "write", "stop"])
+        words = " ".join(rng.choice(["rm -rf", "sudo", "ls", "eval(x)", "secret_key", "tests pass"])
+                         for _ in range(rng.randint(0, 3)))
+        if kind == "bash":
+            yield {"hook_event_name": "PreToolUse", "session_id": f"s{i}", "tool_name": "Bash",
+                   "tool_input": {"command": words}}
+        elif kind == "edit":
+            yield {"hook_event_name": "PreToolUse", "session_id": f"s{i}", "tool_name": "Edit",
+                   "tool_input": {"file_path": rng.choice(["a.py", ".env"]), "old_string": "",
+                                  "new_string": words}}
+        elif kind == "write":
+            yield {"hook_event_name": "PostToolUse", "session_id": f"s{i}", "tool_name": "Write",
+                   "tool_input": {"file_path": "b.md", "content": words}}
+        else:
+            yield {"hook_event_name": "Stop", "session_id": f"s{i}", "reason": words}
+
+
+def serial(inputs):
+    """One fresh engine per input, with the event the hooks would resolve."""
+    return [
+        RuleEngine().evaluate_rules(RULES, input_data,
+                                    resolve_event(input_data["hook_event_name"].lower(), input_data))
+        for input_data in inputs
+    ]
+
+
+@pytest.fixture(autouse=True)
+def clean_environment(monkeypatch):
+    for name in list(os.environ):
+        if name.startswith("HOOKIFY_"):
+            monkeypatch.delenv(name)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_matches_serial_evaluation(workers):
+    expected = serial(random_inputs(0, 200))
+    engine = RuleEngine()
+    responses = list(engine.evaluate_batch(RULES, random_inputs(0, 200), resolve_events=True,
+                                           workers=workers, chunk_size=7))
+    assert responses == expected
+    assert any("permissionDecision" in str(r) for r in responses)
+    assert engine.stats.rules_evaluated == sum(
+        len(engine.compile(RULES).index.rules_for(
+            d.get("tool_name", ""), resolve_event(d["hook_event_name"].lower(), d)))
+        for d in random_inputs(0, 200)
+    )
+
+
+def test_fixed_event_filter():
+    inputs = list(random_inputs(1, 50))
+    expected = [RuleEngine().evaluate_rules(RULES, d, "bash") for d in inputs]
+    assert list(RuleEngine().evaluate_batch(RULES, inputs, event="bash")) == expected
+
+
+def test_inputs_are_consumed_lazily():
+    consumed = []
+
+    def inputs():
+        for input_data in random_inputs(2, 10**6):
+            consumed.append(input_data)
+            yield input_data
+
+    responses = RuleEngine().evaluate_batch(RULES, inputs(), resolve_events=True)
+    assert len(list(itertools.islice(responses, 5))) == 5
+    assert len(consumed) == 5
@@ -0,0 +1,131 @@
+"""Daemon socket checks and daemon vs in-process evaluation."""
+
+import json
+import os
+import socket
+import threading
+
+import pytest
+
+from hookify.core import client
+from hookify.core.client import request_evaluation, socket_dir_problem, socket_path
+from hookify.core.config_loader import load_rules
+from hookify.core.daemon import HookifyDaemon
+from hookify.core.rule_engine import RuleEngine
+
+RULES = {
+    "rm": "---\nname: block-rm\nenabled: true\nevent: bash\npattern: rm\\s+-rf\naction: block\n---\n\nDangerous rm!\n",
+    "env": ("---\nname: warn-env\nenabled: true\nevent: file\naction: warn\nconditions:\n"
+            "  - field: file_path\n    operator: regex_match\n    pattern: \\.env$\n"
+            "  - field: new_text\n    operator: contains\n    pattern: KEY\n---\n\nSecrets!\n"),
+    "stop": ("---\nname: tests\nenabled: true\nevent: stop\naction: block\nconditions:\n"
+             "  - field: transcript\n    operator: not_contains\n    pattern: pytest\n---\n\nRun tests!\n"),
+}
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    root = tmp_path / "project"
+    (root / ".claude").mkdir(parents=True)
+    for name, text in RULES.items():
+        (root / ".claude" / f"hookify.{name}.local.md").write_text(text)
+    (root / "transcript.jsonl").write_text('{"text": "ran pytest"}\n')
+    monkeypatch.chdir(root)
+    monkeypatch.setenv("TMPDIR", str(tmp_path))
+    monkeypatch.delenv("HOOKIFY_DAEMON", raising=False)
+    return root
+
+
+def fake_daemon(path, reply):
+    """Listen on path and answer one request with reply."""
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(1)
+
+    def answer():
+        connection, _ = server.accept()
+        connection.recv(65536)
+        connection.sendall(reply)
+        connection.close()
+        server.close()
+
+    threading.Thread(target=answer, daemon=True).start()
+
+
+def test_socket_directory_must_be_private(tmp_path):
+    directory = tmp_path / "sockets"
+    directory.mkdir(mode=0o700)
+    os.chmod(directory, 0o700)
+    assert socket_dir_problem(str(directory)) is None
+    os.chmod(directory, 0o755)
+    assert "mode 755" in socket_dir_problem(str(directory))
+    link = tmp_path / "link"
+    link.symlink_to(directory)
+    os.chmod(directory, 0o700)
+    assert "not a directory" in socket_dir_problem(str(link))
+
+
+def test_client_ignores_socket_in_shared_directory(project):
+    path = socket_path()
+    os.makedirs(os.path.dirname(path), mode=0o755)
+    os.chmod(os.path.dirname(path), 0o755)
+    fake_daemon(path, b'{"decision": "block"}')
+    assert request_evaluation("pretooluse", "{}") is None
+
+
+def test_client_uses_socket_in_private_directory(project):
+    path = socket_path()
+    os.makedirs(os.path.dirname(path), mode=0o700)
+    fake_daemon(path, b'{"decision": "block"}')
+    assert request_evaluation("pretooluse", "{}") == '{"decision": "block"}'
+
+
+def test_client_ignores_socket_of_another_user(project, monkeypatch):
+    path = socket_path()
+    os.makedirs(os.path.dirname(path), mode=0o700)
+    fake_daemon(path, b'{"decision": "block"}')
+    uid = os.getuid()
+    monkeypatch.setattr(client.os, "lstat", lambda p, _lstat=os.lstat: _fake_owner(_lstat(p), p, path, uid + 1))
+    assert request_evaluation("pretooluse", "{}") is None
+
+
+def _fake_owner(st, p, path, uid):
+    if p != path:
+        return st
+    fields = list(st)
+    fields[4] = uid  # st_uid
+    return os.stat_result(fields)
+
+
+def test_daemon_refuses_shared_directory(project):
+    path = socket_path()
+    os.makedirs(os.path.dirname(path), mode=0o755)
+    os.chmod(os.path.dirname(path), 0o755)
+    with pytest.raises(OSError, match="Refusing to serve"):
+        HookifyDaemon(path)
+
+
+def test_daemon_and_in_process_responses_are_identical(project):
+    daemon = HookifyDaemon(socket_path())
+    thread = threading.Thread(target=daemon.serve, daemon=True)
+    thread.start()
+    try:
+        transcript = str(project / "transcript.jsonl")
+        inputs = [
+            ("pretooluse", {"tool_name": "Bash", "tool_input": {"command": "rm -rf /tmp/x"}}),
+            ("pretooluse", {"tool_name": "Bash", "tool_input": {"command": "ls"}}),
+            ("pretooluse", {"tool_name": "Write", "tool_input": {"file_path": "a/.env", "content": "KEY=1"}}),
+            ("pretooluse", {"tool_name": "Write", "tool_input": {"file_path": "a/.env", "content": "x"}}),
+            ("stop", {"session_id": "s1", "transcript_path": transcript}),
+            ("stop", {"session_id": "s2", "transcript_path": str(project / "missing.jsonl")}),
+        ]
+        for hook, data in inputs:
+            data = dict(data, hook_event_name="Stop" if hook == "stop" else "PreToolUse")
+            reply = request_evaluation(hook, json.dumps(data))
+            assert reply is not None
+            event = client.resolve_event(hook, data)
+            expected = RuleEngine().evaluate_rules(load_rules(event=event), data)
+            assert json.loads(reply) == expected
+    finally:
+        daemon._shutdown_requested = True
+        thread.join(5)
@@ -0,0 +1,126 @@
+"""The evaluation deadline and the background transcript fetch."""
+
+import json
+import os
+import threading
+
+import pytest
+
+from hookify.core import transcript
+from hookify.core.config_loader import Condition, Rule
+from hookify.core.deadline import BackgroundTask, Deadline, DeadlineExceeded
+from hookify.core.decision_cache import DecisionCache
+from hookify.core.rule_engine import RuleEngine
+from hookify.core.transcript import TranscriptScanner
+
+RULES = [
+    # Evaluated before the transcript is waited for
+    Rule(name="reason", enabled=True, event="stop", action="warn", message="a reason",
+         conditions=[Condition(field="reason", operator="contains", pattern="finished")]),
+    Rule(name="needs-tests", enabled=True, event="stop", action="block", message="run the tests",
+         conditions=[Condition(field="transcript", operator="not_contains", pattern="pytest")]),
+    Rule(name="says-done", enabled=True, event="stop", action="warn", message="done",
+         conditions=[Condition(field="transcript", operator="contains", pattern="DONE")]),
+]
+
+
+@pytest.fixture
+def stop_input(tmp_path, monkeypatch):
+    for name in list(os.environ):
+        if name.startswith("HOOKIFY_"):
+            monkeypatch.delenv(name)
+    monkeypatch.setattr(transcript, "STATE_DIR", str(tmp_path / "states"))
+    path = tmp_path / "session.jsonl"
+    path.write_text(json.dumps({"type": "assistant", "message": {"content": [
+        {"type": "text", "text": "All DONE"}]}}) + "\n")
+    return {"hook_event_name": "Stop", "session_id": "s1", "reason": "finished",
+            "transcript_path": str(path)}
+
+
+@pytest.fixture
+def slow_scan(monkeypatch):
+    """Hold every transcript scan until the test ends."""
+    release = threading.Event()
+    scan_file = TranscriptScanner.scan_file
+
+    def held_scan_file(self, *args, **kwargs):
+        release.wait(5)
+        return scan_file(self, *args, **kwargs)
+
+    monkeypatch.setattr(TranscriptScanner, "scan_file", held_scan_file)
+    yield
+    release.set()
+
+
+def test_fast_fetch_matches_evaluation_without_a_deadline(stop_input, monkeypatch):
+    monkeypatch.setenv("HOOKIFY_DEADLINE_MS", "0")
+    expected = RuleEngine().evaluate_rules(RULES, stop_input, "stop")
+
+    # A fresh session, so the second evaluation scans the whole file too
+    stop_input["session_id"] = "s2"
+    monkeypatch.setenv("HOOKIFY_DEADLINE_MS", "5000")
+    engine = RuleEngine()
+    assert engine.evaluate_rules(RULES, stop_input, "stop") == expected
+    assert [r.name for r in engine.last_matches] == ["needs-tests", "reason", "says-done"]
+    assert engine.last_stats.deadline_skips == 0
+
+
+def test_slow_fetch_skips_its_rules(stop_input, slow_scan, monkeypatch):
+    monkeypatch.setenv("HOOKIFY_DEADLINE_MS", "100")
+    monkeypatch.setenv("HOOKIFY_STOP_AT_FIRST_BLOCK", "false")
+    engine = RuleEngine()
+    response = engine.evaluate_rules(RULES, stop_input, "stop")
+
+    # The rules evaluated before the deadline still match; the transcript
+    # rules are reported, not blocked on
+    assert "decision" not in response
+    assert response["systemMessage"].startswith("**[reason]**")
+    assert "Evaluation stopped after 100 ms" in response["systemMessage"]
+    assert "'needs-tests', 'says-done'" in response["systemMessage"]
+    assert [r.name for r in engine.last_matches] == ["reason"]
+    assert engine.last_stats.deadline_skips == 2
+
+
+def test_skipped_decisions_are_not_cached(stop_input, monkeypatch, tmp_path):
+    # Transcript rules are never cached; a deadline can also pass between other rules
+    rules = [Rule(name="block-rm", enabled=True, event="bash", action="block", message="no rm",
+                  conditions=[Condition(field="command", operator="contains", pattern="rm")])]
+    input_data = {"hook_event_name": "PreToolUse", "session_id": "s1", "tool_name": "Bash",
+                  "tool_input": {"command": "rm -rf /"}}
+    monkeypatch.chdir(tmp_path)
+
+    def evaluate_and_store():
+        engine = RuleEngine()
+        output = json.dumps(engine.evaluate_rules(rules, input_data, "bash"))
+        DecisionCache("pretooluse").put(input_data, rules, engine, output)
+        return engine, output
+
+    with monkeypatch.context() as m:
+        m.setattr(Deadline, "expired", lambda self: True)
+        engine, output = evaluate_and_store()
+    assert engine.last_stats.deadline_skips == 1
+    assert "deny" not in output
+    assert DecisionCache("pretooluse").get(json.dumps(input_data)) is None
+
+    engine, output = evaluate_and_store()
+    assert "deny" in output
+    assert DecisionCache("pretooluse").get(json.dumps(input_data)) == output
+
+
+def test_background_task():
+    assert BackgroundTask(sum, [1, 2]).result(Deadline(1)) == 3
+    with pytest.raises(ZeroDivisionError):
+        BackgroundTask(lambda: 1 / 0).result(Deadline(1))
+
+    release = threading.Event()
+    with pytest.raises(DeadlineExceeded):
+        BackgroundTask(release.wait, 5).result(Deadline(0.05))
+    release.set()
+
+
+def test_zero_deadline_never_expires():
+    deadline = Deadline(0)
+    assert deadline.remaining() is None
+    assert not deadline.expired()
+    assert Deadline(-1).expires is None
+    assert Deadline(10).remaining() > 9
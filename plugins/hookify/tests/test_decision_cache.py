@@ -0,0 +1,121 @@
+"""Decision cache hits and invalidation."""
+
+import json
+import os
+import sys
+
+import pytest
+
+from hookify.core import decision_cache
+from hookify.core.config_loader import load_rules
+from hookify.core.decision_cache import DecisionCache
+from hookify.core.rule_engine import RuleEngine
+
+RULE = """---
+name: block-rm
+enabled: true
+event: bash
+pattern: rm\\s+-rf
+action: block
+---
+
+Dangerous rm!
+"""
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    (tmp_path / ".claude").mkdir()
+    (tmp_path / ".claude" / "hookify.rm.local.md").write_text(RULE)
+    monkeypatch.chdir(tmp_path)
+    for name in list(os.environ):
+        if name.startswith("HOOKIFY_"):
+            monkeypatch.delenv(name)
+    return tmp_path
+
+
+def evaluate(raw_input):
+    """Evaluate in-process and store the decision, like the hooks do."""
+    cache = DecisionCache("pretooluse")
+    input_data = json.loads(raw_input)
+    rules = load_rules(event="bash")
+    engine = RuleEngine()
+    output = json.dumps(engine.evaluate_rules(rules, input_data))
+    cache.put(input_data, rules, engine, output)
+    return output
+
+
+def bash(command, session="s1"):
+    return json.dumps({"hook_event_name": "PreToolUse", "session_id": session,
+                       "tool_name": "Bash", "tool_input": {"command": command}})
+
+
+def test_identical_input_is_a_hit(project):
+    output = evaluate(bash("rm -rf /tmp/x"))
+    assert "deny" in output
+    assert DecisionCache("pretooluse").get(bash("rm -rf /tmp/x")) == output
+    assert DecisionCache("pretooluse").get(bash("rm -rf /tmp/y")) is None
+    assert DecisionCache("pretooluse").get(bash("rm -rf /tmp/x", session="s2")) is None
+
+
+def test_rule_file_change_invalidates(project):
+    evaluate(bash("ls"))
+    rule = project / ".claude" / "hookify.rm.local.md"
+    rule.write_text(RULE.replace("rm\\s+-rf", "ls"))
+    os.utime(rule, ns=(0, 10**18))
+    assert DecisionCache("pretooluse").get(bash("ls")) is None
+
+
+def test_new_rule_file_and_environment_invalidate(project, monkeypatch):
+    evaluate(bash("ls"))
+    monkeypatch.setenv("HOOKIFY_DEADLINE_MS", "100")
+    assert DecisionCache("pretooluse").get(bash("ls")) is None
+    monkeypatch.delenv("HOOKIFY_DEADLINE_MS")
+    assert DecisionCache("pretooluse").get(bash("ls")) is not None
+    (project / ".claude" / "hookify.ls.local.md").write_text(RULE.replace("block-rm", "ls"))
+    assert DecisionCache("pretooluse").get(bash("ls")) is None
+
+
+def test_engine_source_change_invalidates(project, monkeypatch):
+    evaluate(bash("ls"))
+    plugin = project / "plugin"
+    for package in decision_cache._ENGINE_PACKAGES:
+        (plugin / package).mkdir(parents=True)
+        (plugin / package / "module.py").write_text("")
+    monkeypatch.setattr(decision_cache, "__file__", str(plugin / "core" / "decision_cache.py"))
+    assert DecisionCache("pretooluse").get(bash("ls")) is None
+    evaluate(bash("ls"))
+    assert DecisionCache("pretooluse").get(bash("ls")) is not None
+    (plugin / "matchers" / "module.py").write_text("# changed")
+    assert DecisionCache("pretooluse").get(bash("ls")) is None
+
+
+def test_every_evaluation_module_is_versioned(project):
+    evaluate(bash("rm -rf /tmp/x"))
+    versioned = set(decision_cache._engine_files())
+    loaded = {
+        os.path.abspath(module.__file__) for name, module in list(sys.modules.items())
+        if name.startswith("hookify.") and getattr(module, "__file__", None)
+        and not name.endswith("__init__")
+    }
+    plugin_root = os.path.dirname(os.path.dirname(os.path.abspath(decision_cache.__file__)))
+    assert loaded - versioned <= {os.path.join(plugin_root, "utils", "__init__.py")}
+    assert os.path.join(plugin_root, "matchers", "regex_set.py") in versioned
+
+
+def test_older_schema_is_replaced(project):
+    import sqlite3
+
+    os.makedirs(os.path.dirname(decision_cache.CACHE_FILE))
+    db = sqlite3.connect(decision_cache.CACHE_FILE)
+    db.executescript("""
+        CREATE TABLE rulesets (version TEXT, hook TEXT, event TEXT, inputs TEXT);
+        CREATE TABLE decisions (key TEXT PRIMARY KEY, response TEXT NOT NULL, used REAL NOT NULL);
+    """)
+    db.close()
+
+    output = evaluate(bash("rm -rf /tmp/x"))
+    assert DecisionCache("pretooluse").get(bash("rm -rf /tmp/x")) == output
+    db = sqlite3.connect(decision_cache.CACHE_FILE)
+    assert db.execute("PRAGMA user_version").fetchone()[0] == decision_cache.SCHEMA_VERSION
+    db.close()
@@ -0,0 +1,130 @@
+"""Exit-code merge rules of examples/hooks/pretooluse_dispatcher.py."""
+
+import importlib.util
+import json
+import os
+
+import pytest
+
+PLUGIN_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DISPATCHER = os.path.join(os.path.dirname(os.path.dirname(PLUGIN_ROOT)),
+                          "examples", "hooks", "pretooluse_dispatcher.py")
+
+RULES = {
+    "hookify.rm.local.md": """---
+name: block-rm
+enabled: true
+event: bash
+pattern: rm\\s+-rf
+action: block
+---
+
+Dangerous rm!
+""",
+    "hookify.sudo.local.md": """---
+name: warn-sudo
+enabled: true
+event: bash
+pattern: sudo
+action: warn
+---
+
+Careful with sudo.
+""",
+}
+
+# Stand-ins for the bash validator: one that blocks on "curl", one that fails
+BLOCKING_CHECKER = """
+def evaluate(input_data):
+    command = input_data.get("tool_input", {}).get("command", "")
+    return ["no curl"] if "curl" in command else []
+"""
+FAILING_CHECKER = """
+def evaluate(input_data):
+    raise RuntimeError("boom")
+"""
+
+
+@pytest.fixture
+def dispatcher():
+    spec = importlib.util.spec_from_file_location("pretooluse_dispatcher", DISPATCHER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    (tmp_path / ".claude").mkdir()
+    for name, text in RULES.items():
+        (tmp_path / ".claude" / name).write_text(text)
+    monkeypatch.chdir(tmp_path)
+    for name in list(os.environ):
+        if name.startswith("HOOKIFY_"):
+            monkeypatch.delenv(name)
+    monkeypatch.setenv("HOOKIFY_DAEMON", "0")
+    return tmp_path
+
+
+def checker(project, source):
+    path = project / "checker.py"
+    path.write_text(source)
+    return {"hookify": PLUGIN_ROOT, "security": "", "bash-validator": str(path)}
+
+
+def bash(command):
+    return json.dumps({"hook_event_name": "PreToolUse", "session_id": "s1",
+                       "tool_name": "Bash", "tool_input": {"command": command}})
+
+
+def test_hookify_alone_prints_its_response(dispatcher, project):
+    paths = checker(project, BLOCKING_CHECKER)
+    code, stdout, stderr = dispatcher.dispatch(bash("rm -rf build"), paths)
+    assert code == 0
+    response = json.loads(stdout)
+    assert response["hookSpecificOutput"]["permissionDecision"] == "deny"
+    assert stderr == ""
+
+    code, stdout, stderr = dispatcher.dispatch(bash("ls"), paths)
+    assert (code, json.loads(stdout), stderr) == (0, {}, "")
+
+
+def test_checker_block_exits_2_with_hookify_message(dispatcher, project):
+    paths = checker(project, BLOCKING_CHECKER)
+    code, stdout, stderr = dispatcher.dispatch(bash("sudo curl example.com"), paths)
+    assert code == 2
+    assert stdout == ""
+    # Exit code 2 discards stdout, so hookify's warning moves to stderr first
+    assert stderr.index("warn-sudo") < stderr.index("• no curl")
+
+    code, _, stderr = dispatcher.dispatch(bash("rm -rf build && curl x"), paths)
+    assert code == 2
+    assert "block-rm" in stderr and "• no curl" in stderr
+
+
+def test_failing_checker_never_blocks(dispatcher, project):
+    paths = checker(project, FAILING_CHECKER)
+    code, stdout, stderr = dispatcher.dispatch(bash("ls"), paths)
+    assert (code, json.loads(stdout)) == (0, {})
+    assert "bash validator failed: boom" in stderr
+
+    # hookify's own decision still comes through on stdout
+    code, stdout, stderr = dispatcher.dispatch(bash("rm -rf build"), paths)
+    assert code == 0
+    assert json.loads(stdout)["hookSpecificOutput"]["permissionDecision"] == "deny"
+    assert "boom" in stderr
+
+
+def test_hookify_goes_through_the_decision_cache(dispatcher, project, monkeypatch):
+    monkeypatch.setenv("HOOKIFY_DECISION_CACHE", "1")
+    paths = checker(project, BLOCKING_CHECKER)
+    first = dispatcher.dispatch(bash("rm -rf build"), paths)
+
+    from hookify.core.decision_cache import DecisionCache
+    assert DecisionCache("pretooluse").get(bash("rm -rf build")) == first[1]
+    assert dispatcher.dispatch(bash("rm -rf build"), paths) == first
+
+
+def test_invalid_json_exits_1(dispatcher, project):
+    code, stdout, stderr = dispatcher.dispatch("{not json", checker(project, BLOCKING_CHECKER))
+    assert code == 1 and stdout == "" and "Invalid JSON" in stderr
@@ -0,0 +1,70 @@
+"""The per-input memo of EvaluationContext against evaluating each rule on its own."""
+
+import random
+
+import pytest
+
+from hookify.core.config_loader import Condition, Rule
+from hookify.core.rule_engine import RuleEngine
+
+FIELDS = ["command", "file_path", "new_text", "old_text", "content", "missing"]
+OPERATORS = ["regex_match", "contains", "not_contains", "equals", "starts_with", "ends_with"]
+WORDS = ["rm", "-rf", "src", ".env", "eval(", "x", "", "^src", r"\d+"]
+
+
+def random_rule(rng, i):
+    conditions = [
+        Condition(field=rng.choice(FIELDS), operator=rng.choice(OPERATORS), pattern=rng.choice(WORDS))
+        for _ in range(rng.randint(1, 3))
+    ]
+    return Rule(name=f"r{i}", enabled=True, event="all", action=rng.choice(["warn", "block"]),
+                message=f"r{i}", conditions=conditions)
+
+
+def random_input(rng):
+    text = " ".join(rng.choice(WORDS + ["plain", "42"]) for _ in range(rng.randint(0, 4)))
+    if rng.random() < 0.5:
+        return {"hook_event_name": "PreToolUse", "tool_name": "Bash", "tool_input": {"command": text}}
+    return {"hook_event_name": "PreToolUse", "tool_name": "Edit",
+            "tool_input": {"file_path": rng.choice(["src/.env", "x.py", ""]),
+                           "old_string": text[::-1], "new_string": text}}
+
+
+@pytest.mark.parametrize("condition_order", ["file", "cost", "adaptive"])
+def test_memo_matches_evaluating_rules_one_by_one(monkeypatch, condition_order):
+    monkeypatch.delenv("HOOKIFY_STOP_AT_FIRST_BLOCK", raising=False)
+    monkeypatch.delenv("HOOKIFY_CONDITION_ORDER", raising=False)
+    rng = random.Random(0)
+    engine = RuleEngine()
+    engine.configure({"condition_order": condition_order})
+    extracted = []
+    extract = engine._extract_field
+
+    def counting_extract(field, *args):
+        extracted.append(field)
+        return extract(field, *args)
+
+    monkeypatch.setattr(engine, "_extract_field", counting_extract)
+
+    for _ in range(40):
+        rules = [random_rule(rng, i) for i in range(rng.randint(1, 25))]
+        for _ in range(10):
+            input_data = random_input(rng)
+            # No context: every rule extracts its fields and checks its conditions itself
+            matched = [r for r in rules if engine._rule_matches(r, input_data)]
+            expected = [r.name for r in matched if r.action == "block"] + \
+                [r.name for r in matched if r.action != "block"]
+
+            del extracted[:]
+            engine.evaluate_rules(rules, input_data)
+            assert [r.name for r in engine.last_matches] == expected
+
+            # Each field is extracted once, each distinct condition checked once
+            stats = engine.last_stats
+            assert sorted(extracted) == sorted(set(extracted))
+            assert stats.fields_extracted == len(extracted)
+            keys = {(c.field, c.operator, c.pattern, c.match) for r in rules for c in r.conditions}
+            assert stats.conditions_evaluated <= len(keys)
+
+    # The memo was exercised, not just bypassed
+    assert engine.stats.field_cache_hits and engine.stats.condition_cache_hits
@@ -0,0 +1,34 @@
+"""MultiEdit fields: joined legacy names and per-edit field paths."""
+
+import pytest
+
+from hookify.core.config_loader import Condition, Rule
+from hookify.core.rule_engine import RuleEngine
+
+
+def matches(field, operator, pattern, edits, match=None):
+    rule = Rule(name="r", enabled=True, event="file", action="warn", message="hit",
+                conditions=[Condition(field=field, operator=operator, pattern=pattern, match=match)])
+    input_data = {"hook_event_name": "PreToolUse", "tool_name": "MultiEdit",
+                  "tool_input": {"file_path": "a.py", "edits": [{"new_string": e} for e in edits]}}
+    return "hit" in RuleEngine().evaluate_rules([rule], input_data).get("systemMessage", "")
+
+
+@pytest.mark.parametrize("field", ["new_text", "content"])
+def test_legacy_fields_match_the_joined_edits(field):
+    assert matches(field, "regex_match", r"foo bar", ["foo", "bar"])
+    assert matches(field, "equals", "foo bar", ["foo", "bar"])
+    assert not matches(field, "equals", "foo", ["foo", "bar"])
+    assert matches(field, "not_contains", "x", [])
+    assert matches(field, "ends_with", "bar", ["foo", "bar"])
+    assert matches(field, "contains", "o b", ["foo", "bar"])
+
+
+def test_edit_paths_match_edit_by_edit():
+    path = "edits[*].new_string"
+    assert not matches(path, "regex_match", r"foo bar", ["foo", "bar"])
+    assert matches(path, "equals", "foo", ["foo", "bar"])
+    assert not matches(path, "equals", "foo", ["foo", "bar"], match="all")
+    assert matches(path, "not_contains", "x", ["foo", "bar"])
+    assert not matches(path, "not_contains", "x", [])  # No edit: no value to check
+    assert matches("edits[1].new_string", "starts_with", "ba", ["foo", "bar"])
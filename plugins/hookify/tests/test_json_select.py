@@ -0,0 +1,101 @@
+"""select() against json.loads followed by dropping the unselected keys."""
+
+import json
+import random
+
+import pytest
+
+from hookify.core.json_select import HEADER_SPEC, MAX_QUOTE_PROBES, input_spec, select
+
+
+def project(value, spec):
+    """The reference: decode everything, then keep what spec selects."""
+    default = spec.get('*', False)
+    result = {}
+    for key, member in value.items():
+        wanted = spec.get(key, default)
+        if isinstance(wanted, dict) and isinstance(member, dict):
+            result[key] = project(member, wanted)
+        elif wanted:
+            result[key] = member
+    return result
+
+
+def random_string(rng):
+    pieces = ['a', 'é', '"', '\\', '\\"', '\n', '}', ',', ':', ' ', ' ', '[']
+    if rng.random() < 0.1:
+        # More escaped quotes than _skip_string probes for
+        return '"' * (MAX_QUOTE_PROBES + rng.randint(0, 4))
+    return ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+
+
+def random_value(rng, depth=0):
+    kind = rng.randrange(8 if depth < 3 else 5)
+    if kind == 0:
+        return random_string(rng)
+    if kind == 1:
+        return rng.choice([0, -1, 2.5, 1e20, 10 ** 30])
+    if kind == 2:
+        return rng.choice([True, False, None])
+    if kind == 3:
+        return ''
+    if kind == 4:
+        return rng.randint(-5, 5)
+    if kind == 5:
+        return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 3))]
+    return {f'k{i}{random_string(rng)}': random_value(rng, depth + 1) for i in range(rng.randint(0, 4))}
+
+
+def random_spec(rng, value, depth=0):
+    spec = {}
+    if rng.random() < 0.5:
+        spec['*'] = rng.choice([True, False])
+    for key, member in value.items():
+        choice = rng.randrange(4)
+        if choice == 0:
+            continue
+        if choice == 1 and isinstance(member, dict) and depth < 3:
+            spec[key] = random_spec(rng, member, depth + 1)
+        else:
+            spec[key] = rng.choice([True, False, {}])
+    return spec
+
+
+def test_select_matches_projected_json_loads():
+    rng = random.Random(0)
+    for _ in range(2000):
+        value = {f'k{i}': random_value(rng) for i in range(rng.randint(0, 6))}
+        spec = random_spec(rng, value)
+        text = json.dumps(value, ensure_ascii=rng.random() < 0.5,
+                          indent=rng.choice([None, 0, 2]),
+                          separators=rng.choice([None, (',', ':'), (' , ', ' : ')]))
+        assert select(text, spec) == project(json.loads(text), spec), (text, spec)
+
+
+def test_hook_input_specs():
+    payload = json.dumps({
+        'session_id': 's', 'hook_event_name': 'PreToolUse', 'tool_name': 'Write',
+        'tool_input': {'file_path': 'a.py', 'content': 'x = "\\"" # ' * 100},
+        'tool_response': {'lines': ['a'] * 10},
+    })
+    data = json.loads(payload)
+    assert select(payload, HEADER_SPEC) == {'session_id': 's', 'hook_event_name': 'PreToolUse',
+                                            'tool_name': 'Write'}
+    spec = input_spec({'tool_input': ['file_path'], 'input': []})
+    assert select(payload, spec)['tool_input'] == {'file_path': 'a.py'}
+    spec = input_spec({'tool_input': ['*'], 'input': ['tool_response']})
+    assert select(payload, spec) == data
+
+
+@pytest.mark.parametrize('text', [
+    '{"a": 1', '{"a" 1}', '{"a": 1,}', '{"a": 1} x', '{"a": "unterminated}', '{a: 1}',
+    '{"skipped": "x\\"}', '{"skipped": [1, 2}',
+])
+def test_malformed_input_raises_value_error(text):
+    with pytest.raises(ValueError):
+        select(text, {'a': True})
+
+
+def test_non_object_documents_are_decoded_whole():
+    assert select(' [1, {"a": 2}] ', {}) == [1, {'a': 2}]
+    assert select('"text"', {}) == 'text'
@@ -0,0 +1,101 @@
+"""Profiling records written by the engine, and the report over them."""
+
+import json
+import os
+
+import pytest
+
+from hookify.core.config_loader import Condition, Rule
+from hookify.core.profiling import PHASES, main, read_records, summarize
+from hookify.core.rule_engine import RuleEngine
+
+SHARED = Condition(field="command", operator="regex_match", pattern=r"rm\s+-rf")
+
+RULES = [
+    Rule(name="block-rm", enabled=True, event="bash", action="block", message="no", source="a.md",
+         conditions=[SHARED]),
+    Rule(name="warn-rm-tmp", enabled=True, event="bash", action="warn", message="careful", source="b.md",
+         conditions=[Condition(field="command", operator="regex_match", pattern=r"rm\s+-rf"),
+                     Condition(field="command", operator="contains", pattern="/tmp")]),
+    Rule(name="warn-sudo", enabled=True, event="bash", action="warn", message="sudo", source="c.md",
+         conditions=[Condition(field="command", operator="contains", pattern="sudo")]),
+]
+
+
+def bash(command, session="s1"):
+    return {"hook_event_name": "PreToolUse", "session_id": session,
+            "tool_name": "Bash", "tool_input": {"command": command}}
+
+
+@pytest.fixture
+def profiled(tmp_path, monkeypatch):
+    for name in list(os.environ):
+        if name.startswith("HOOKIFY_"):
+            monkeypatch.delenv(name)
+    path = tmp_path / "profile.jsonl"
+    monkeypatch.setenv("HOOKIFY_PROFILE", str(path))
+    monkeypatch.setenv("HOOKIFY_CONDITION_ORDER", "file")
+    return path
+
+
+def test_one_record_per_evaluation(profiled):
+    engine = RuleEngine()
+    inputs = [bash("rm -rf /tmp/x"), bash("sudo ls", session="s2")]
+    for input_data in inputs:
+        engine.evaluate_rules(RULES, input_data, event="bash")
+        assert engine.last_profile is not None
+
+    records = read_records(str(profiled))
+    assert len(records) == 2
+    for record, input_data in zip(records, inputs):
+        assert record["session_id"] == input_data["session_id"]
+        assert (record["hook_event"], record["tool_name"], record["event"]) == ("PreToolUse", "Bash", "bash")
+        # Every rule is reported, with the same outcome as checking it on its own
+        assert [(r["name"], r["source"], r["action"], r["matched"]) for r in record["rules"]] == [
+            (rule.name, rule.source, rule.action, engine._rule_matches(rule, input_data)) for rule in RULES
+        ]
+        assert record["total_ms"] >= record["compile_ms"] >= 0
+        for rule in record["rules"]:
+            assert not rule["timed_out"]
+            for condition in rule["conditions"]:
+                assert all(condition[f"{phase}_ms"] >= 0 for phase in PHASES)
+
+    first, second = records
+    # The shared regex is checked for the first rule and reused by the second
+    shared = [c for c in first["rules"][1]["conditions"] if c["pattern"] == SHARED.pattern]
+    assert shared == [dict(shared[0], cached=True, ms=0.0, match_ms=0.0)]
+    assert first["rules"][0]["conditions"][0]["cached"] is False
+    # Conditions after the first failing one are not checked
+    assert [c["pattern"] for c in second["rules"][1]["conditions"]] == [SHARED.pattern]
+    # The regex is compiled once per ruleset
+    assert first["stats"]["regex_cache_misses"] == 1
+    assert second["stats"]["regex_cache_misses"] == 0
+    assert second["stats"] == engine.last_stats.to_dict()
+
+
+def test_disabled_profiling_writes_nothing(profiled, monkeypatch):
+    monkeypatch.setenv("HOOKIFY_PROFILE", "0")
+    engine = RuleEngine()
+    engine.evaluate_rules(RULES, bash("rm -rf /tmp/x"), event="bash")
+    assert engine.last_profile is None
+    assert not profiled.exists()
+
+
+def test_report(profiled, capsys):
+    engine = RuleEngine()
+    for command in ("rm -rf /tmp/x", "rm -rf /", "ls"):
+        engine.evaluate_rules(RULES, bash(command), event="bash")
+    summary = summarize(read_records(str(profiled)))
+    assert summary["evaluations"] == 3
+    assert summary["rules"]["block-rm"]["matches"] == 2
+    assert summary["rules"]["warn-rm-tmp"]["matches"] == 1
+    assert summary["rules"]["warn-sudo"]["evaluations"] == 3
+    assert summary["sessions"]["s1"]["evaluations"] == 3
+
+    with open(profiled, "a") as f:
+        f.write("not json\n")
+    assert main(["profiling.py", "report", "--file", str(profiled)]) == 0
+    out = capsys.readouterr().out
+    assert out.startswith("3 evaluations profiled")
+    assert "block-rm" in out and "Regex cache:" in out
+    assert main(["profiling.py", "report", "--file", str(profiled) + ".missing"]) == 1
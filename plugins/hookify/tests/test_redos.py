@@ -0,0 +1,95 @@
+"""ReDoS analysis and the regex time budget."""
+
+import re
+import signal
+import threading
+
+import pytest
+
+from hookify.core.config_loader import Condition, Rule
+from hookify.core.rule_engine import RuleEngine
+from hookify.matchers.redos import RegexTimeout, RegexTimer, analyze_pattern, run_with_timeout
+
+# Flagged patterns, each with an input that makes re backtrack exponentially
+RISKY = [
+    (r"(a+)+$", "a" * 40 + "!"),
+    (r"(a|a)*b", "a" * 40),
+    (r"(\w+\s?)*$", "a" * 40 + "!"),
+    (r"([a-z]+)*\d", "a" * 40),
+    (r"(x+x+)+y", "x" * 40),
+    (r"(\d+)*\.", "1" * 40),
+]
+
+# Not flagged, each with an input of about 2000 characters that fails to
+# match (long enough that exponential backtracking would never finish)
+SAFE = [
+    (r"rm\s+-rf", "rm " * 700),
+    (r"^git push", " git push" * 200),
+    (r"(ab)+c", "ab" * 1000),
+    (r"\d+\.\d+", "1" * 2000),
+    (r"(a+b)+c", "aab" * 700),
+    (r"[a-z]+@[a-z]+\.com", "a" * 1000 + "@" + "a" * 1000),
+    (r"(?:foo|bar)+!", "foobar" * 350),
+    (r"a*b*c*d", "abc" * 700),
+    (r"(a|ab)*c", "ab" * 1000),
+    (r"(a|b)*c", "ab" * 1000),
+    (r"(\s*,\s*\w+)*;", ", a" * 700),
+]
+
+
+@pytest.mark.parametrize("pattern, text", RISKY, ids=[p for p, _ in RISKY])
+def test_risky_patterns_are_flagged_and_really_backtrack(pattern, text):
+    assert analyze_pattern(pattern)
+    with pytest.raises(RegexTimeout):
+        run_with_timeout(re.compile(pattern, re.IGNORECASE).search, 0.05, text)
+
+
+@pytest.mark.parametrize("pattern, text", SAFE, ids=[p for p, _ in SAFE])
+def test_safe_patterns_are_not_flagged_and_finish(pattern, text):
+    assert analyze_pattern(pattern) == []
+    assert run_with_timeout(re.compile(pattern, re.IGNORECASE).search, 1.0, text) is None
+
+
+def test_nested_empty_repetition_is_flagged():
+    assert analyze_pattern(r"(a*)*")
+
+
+def test_timer_restores_the_previous_handler():
+    previous = signal.getsignal(signal.SIGALRM)
+    timer = RegexTimer(0.05)
+    assert timer.run(str.upper, "x") == "X"
+    with pytest.raises(RegexTimeout):
+        timer.run(re.compile(RISKY[0][0]).search, RISKY[0][1])
+    # Still usable after a timeout, and the timer is disarmed between runs
+    assert timer.run(str.lower, "Y") == "y"
+    assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+    timer.close()
+    assert signal.getsignal(signal.SIGALRM) is previous
+
+
+def test_timer_outside_the_main_thread_runs_unbounded():
+    results = []
+    thread = threading.Thread(target=lambda: results.append(run_with_timeout(str.upper, 0.01, "x")))
+    thread.start()
+    thread.join()
+    assert results == ["X"]
+
+
+def test_timed_out_rule_is_skipped_and_reported(monkeypatch, capsys):
+    monkeypatch.setenv("HOOKIFY_REGEX_TIMEOUT_MS", "50")
+    monkeypatch.delenv("HOOKIFY_STOP_AT_FIRST_BLOCK", raising=False)
+    pattern, text = RISKY[0]
+    rules = [
+        Rule(name="slow", enabled=True, event="bash", action="block", message="slow",
+             conditions=[Condition(field="command", operator="regex_match", pattern=pattern)]),
+        Rule(name="fast", enabled=True, event="bash", action="warn", message="fast",
+             conditions=[Condition(field="command", operator="contains", pattern="a")]),
+    ]
+    engine = RuleEngine()
+    response = engine.evaluate_rules(rules, {"tool_name": "Bash", "tool_input": {"command": text}})
+    assert "permissionDecision" not in str(response)
+    assert response["systemMessage"].startswith("**[fast]**")
+    assert "Skipped rule(s) 'slow'" in response["systemMessage"]
+    assert engine.last_stats.regex_timeouts == 1
+    # Reported once at load time
+    assert capsys.readouterr().err.count(pattern) == 1
@@ -0,0 +1,65 @@
+"""RegexSet and regex conditions against matching each pattern on its own."""
+
+import random
+import re
+
+from hookify.core.config_loader import Condition, Rule
+from hookify.core.rule_engine import RuleEngine
+from hookify.matchers.regex_set import RegexSet
+
+PATTERNS = [
+    r"rm\s+-rf", r"^git push", r"--force$", r"\bsudo\b", r"(a|b)\1", r"(?P<x>x)y",
+    r"(?i)chmod 777", r"eval\(", r"[", r"password\s*=", r"\.env$", r"^$",
+]
+
+
+def naive(patterns, text):
+    hits = set()
+    for pattern in patterns:
+        try:
+            if re.search(pattern, text, re.IGNORECASE):
+                hits.add(pattern)
+        except re.error:
+            pass
+    return hits
+
+
+def test_search_matches_per_pattern_loop():
+    regex_set = RegexSet(PATTERNS)
+    rng = random.Random(0)
+    words = ["rm -rf /", "git push", "--force", "sudo", "aa", "xy", "CHMOD 777",
+             "eval(", "password = 1", ".env", "", "ls", "\n"]
+    for _ in range(500):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 5)))
+        assert regex_set.search(text) == naive(PATTERNS, text), text
+
+
+def test_invalid_patterns_are_left_out():
+    regex_set = RegexSet(PATTERNS)
+    assert "[" not in regex_set
+    assert r"eval\(" in regex_set
+    assert len(regex_set) == len(PATTERNS) - 1
+
+
+def test_search_skips_excluded_patterns():
+    regex_set = RegexSet([r"foo", r"bar"])
+    assert regex_set.search("foo bar", exclude={"foo"}) == {"bar"}
+
+
+def test_rules_with_many_patterns_match_like_single_rules():
+    rng = random.Random(1)
+    patterns = [f"tok{i}(x|y)+z" for i in range(300)]
+    rules = [
+        Rule(name=f"rule-{i}", enabled=True, event="bash",
+             conditions=[Condition(field="command", operator="regex_match", pattern=pattern)],
+             action="warn", message=f"<{i}>")
+        for i, pattern in enumerate(patterns)
+    ]
+    engine = RuleEngine()
+    for _ in range(50):
+        command = " ".join(f"tok{rng.randrange(400)}{rng.choice(['xz', 'yyz', 'q'])}" for _ in range(3))
+        input_data = {"hook_event_name": "PreToolUse", "tool_name": "Bash",
+                      "tool_input": {"command": command}}
+        expected = {i for i, pattern in enumerate(patterns) if re.search(pattern, command, re.IGNORECASE)}
+        message = engine.evaluate_rules(rules, input_data).get("systemMessage", "")
+        assert {int(i) for i in re.findall(r"<(\d+)>", message)} == expected
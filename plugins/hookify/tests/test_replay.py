@@ -0,0 +1,115 @@
+"""Replayed Stop decisions against a hook evaluating the transcript prefix."""
+
+import io
+import json
+import os
+import random
+
+import pytest
+
+from hookify.core import transcript
+from hookify.core.config_loader import Condition, Rule
+from hookify.core.replay import ReplayEngine, replay_file, transcript_events
+from hookify.core.rule_engine import RuleEngine
+
+WORDS = ["DONE", "pytest", "tests passed", "LATEMARKER", "word", "ok", "é"]
+
+
+def stop_rule(name, operator, pattern, action="block"):
+    return Rule(name=name, enabled=True, event="stop", action=action, message=name,
+                conditions=[Condition(field="transcript", operator=operator, pattern=pattern)])
+
+
+RULES = [
+    stop_rule("says-done", "contains", "DONE", action="warn"),
+    stop_rule("no-pytest", "not_contains", "pytest"),
+    stop_rule("passed", "regex_match", r"tests? passed", action="warn"),
+    # Flagged as risky (own chunked scan), but cheap on these transcripts
+    stop_rule("risky-ok", "regex_match", r"(o+)+k\b"),
+    stop_rule("starts-json", "regex_match", r"^\{", action="warn"),
+]
+
+
+def text(role, value, **extra):
+    return dict({"type": role, "message": {"content": [{"type": "text", "text": value}]}}, **extra)
+
+
+def random_transcript(rng):
+    records = []
+    for turn in range(rng.randint(1, 5)):
+        # Prompts mention the words too: a Stop before one must not see it
+        records.append({"type": "user", "message": {"content": f"prompt {rng.choice(WORDS)}"}})
+        for step in range(rng.randint(0, 3)):
+            words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+            if rng.random() < 0.5:
+                records.append(text("assistant", words, isSidechain=rng.random() < 0.2))
+            else:
+                tool_id = f"t{turn}-{step}"
+                records.append({"type": "assistant", "message": {"content": [
+                    {"type": "tool_use", "id": tool_id, "name": "Bash", "input": {"command": words}}]}})
+                records.append({"type": "user", "message": {"content": [
+                    {"type": "tool_result", "tool_use_id": tool_id, "content": words}]}})
+    if rng.random() < 0.3:
+        records.append({"type": "user", "message": {"content": f"last {rng.choice(WORDS)}"}})
+    return [json.dumps(record) + "\n" for record in records]
+
+
+@pytest.fixture
+def hook_engine(tmp_path, monkeypatch):
+    for name in list(os.environ):
+        if name.startswith("HOOKIFY_"):
+            monkeypatch.delenv(name)
+    monkeypatch.setattr(transcript, "STATE_DIR", str(tmp_path / "states"))
+    return RuleEngine()
+
+
+def test_stop_decisions_match_the_hook_on_the_prefix(tmp_path, hook_engine):
+    rng = random.Random(0)
+    checked = 0
+    for i in range(30):
+        lines = random_transcript(rng)
+        path = tmp_path / f"session{i}.jsonl"
+        path.write_text("".join(lines))
+        out = io.StringIO()
+        replay_file(ReplayEngine(), RULES, str(path), out, include_allowed=True)
+        stops = [d for d in map(json.loads, out.getvalue().splitlines()) if d["hook_event"] == "Stop"]
+
+        for stop in stops:
+            # A Stop before a prompt saw the lines before it; the final Stop saw them all
+            record = json.loads(lines[stop["line"] - 1])
+            before_prompt = record["type"] == "user" and isinstance(record["message"]["content"], str)
+            prefix = lines[:stop["line"] - 1] if before_prompt else lines
+            prefix_path = tmp_path / f"prefix{checked}.jsonl"
+            prefix_path.write_text("".join(prefix))
+            response = hook_engine.evaluate_rules(RULES, {
+                "hook_event_name": "Stop", "session_id": f"check{checked}",
+                "transcript_path": str(prefix_path),
+            }, "stop")
+            checked += 1
+            assert sorted(stop["rules"]) == sorted(r.name for r in hook_engine.last_matches), (lines, stop)
+            assert stop["decision"] == ("block" if "decision" in response
+                                        else "warn" if response else "allow")
+    assert checked > 30
+
+
+def test_events_of_a_transcript(tmp_path):
+    lines = [
+        {"type": "user", "message": {"content": "start"}, "sessionId": "abc"},
+        {"type": "assistant", "message": {"content": [
+            {"type": "tool_use", "id": "t1", "name": "Edit", "input": {"file_path": "a.py"}}]}},
+        {"type": "user", "message": {"content": [
+            {"type": "tool_result", "tool_use_id": "t1", "content": "ok"}]}, "toolUseResult": {"ok": True}},
+        text("assistant", "subagent", isSidechain=True),
+        {"type": "user", "message": {"content": "next"}},
+        text("assistant", "bye"),
+    ]
+    path = tmp_path / "events.jsonl"
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines) + "not json\n")
+    events = [(n, e["hook_event_name"], e.get("tool_name"), e["session_id"])
+              for n, e in transcript_events(str(path))]
+    assert events == [
+        (2, "PreToolUse", "Edit", "abc"),
+        (3, "PostToolUse", "Edit", "abc"),
+        (5, "Stop", None, "abc"),
+        (7, "Stop", None, "abc"),
+    ]
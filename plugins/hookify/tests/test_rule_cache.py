@@ -0,0 +1,115 @@
+"""The on-disk rule cache of load_rules against parsing every file."""
+
+import os
+
+import pytest
+
+from hookify.core import config_loader
+from hookify.core.config_loader import load_rule_file, load_rules
+
+RULE = """---
+name: {name}
+enabled: true
+event: bash
+pattern: {pattern}
+action: warn
+---
+
+Message for {name}.
+"""
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    (tmp_path / ".claude").mkdir()
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Count the rule files load_rules parses."""
+    calls = []
+    parse = config_loader.parse_rule_file
+
+    def counting(file_path):
+        calls.append(file_path)
+        return parse(file_path)
+
+    monkeypatch.setattr(config_loader, "parse_rule_file", counting)
+    return calls
+
+
+def write(path, text, mtime_ns=None):
+    path.write_text(text)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def loaded(rules):
+    return [(rule.name, rule.conditions[0].pattern, rule.get_message()) for rule in rules]
+
+
+def uncached(parses):
+    """What load_rules returns when every file is parsed (not counted as parses)."""
+    count = len(parses)
+    paths = sorted(f".claude/{name}" for name in os.listdir(".claude") if name.endswith(".local.md"))
+    rules = loaded(rule for rule in map(load_rule_file, paths) if rule is not None)
+    del parses[count:]
+    return rules
+
+
+def test_unchanged_files_are_not_reparsed(project, parses):
+    write(project / ".claude" / "hookify.a.local.md", RULE.format(name="a", pattern="foo"))
+    write(project / ".claude" / "hookify.b.local.md", RULE.format(name="b", pattern="bar"))
+    first = loaded(load_rules())
+    assert len(parses) == 2
+    assert loaded(load_rules()) == first
+    assert sorted(first) == sorted(uncached(parses))
+    assert len(parses) == 2
+
+
+def test_mtime_or_size_change_invalidates(project, parses):
+    path = project / ".claude" / "hookify.a.local.md"
+    write(path, RULE.format(name="a", pattern="foo"), mtime_ns=1_000_000_000)
+    load_rules()
+
+    # Same size, new mtime
+    write(path, RULE.format(name="a", pattern="bar"), mtime_ns=2_000_000_000)
+    assert loaded(load_rules()) == uncached(parses) == [("a", "bar", "Message for a.")]
+    assert len(parses) == 2
+
+    # Same mtime, new size
+    write(path, RULE.format(name="a", pattern="bazz"), mtime_ns=2_000_000_000)
+    assert loaded(load_rules()) == uncached(parses) == [("a", "bazz", "Message for a.")]
+    assert len(parses) == 3
+
+
+def test_parse_failures_are_cached(project, parses, capsys):
+    write(project / ".claude" / "hookify.a.local.md", RULE.format(name="a", pattern="foo"))
+    broken = project / ".claude" / "hookify.broken.local.md"
+    write(broken, "no frontmatter here\n", mtime_ns=1_000_000_000)
+
+    assert loaded(load_rules()) == uncached(parses)
+    assert len(parses) == 2
+    capsys.readouterr()
+
+    # Still reported on every call, but not read again
+    assert [name for name, _, _ in loaded(load_rules())] == ["a"]
+    assert len(parses) == 2
+    assert "hookify.broken.local.md missing YAML frontmatter" in capsys.readouterr().err
+
+    write(broken, RULE.format(name="fixed", pattern="x"), mtime_ns=1_000_000_000)
+    assert sorted(loaded(load_rules())) == sorted(uncached(parses))
+    assert len(parses) == 3
+
+
+def test_unreadable_files_are_retried(project, parses, monkeypatch):
+    path = project / ".claude" / "hookify.a.local.md"
+    write(path, RULE.format(name="a", pattern="foo"))
+    parse = config_loader.parse_rule_file
+    monkeypatch.setattr(config_loader, "parse_rule_file", lambda file_path: open("/nonexistent/x"))
+    assert load_rules() == []
+
+    monkeypatch.setattr(config_loader, "parse_rule_file", parse)
+    assert loaded(load_rules()) == [("a", "foo", "Message for a.")]
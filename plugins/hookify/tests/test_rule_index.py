@@ -0,0 +1,40 @@
+"""RuleIndex candidate selection against filtering every rule."""
+
+import random
+
+from hookify.core.config_loader import Rule
+from hookify.core.rule_index import RuleIndex
+
+TOOLS = ["Bash", "Edit", "Write", "MultiEdit", "Read", ""]
+EVENTS = ["bash", "file", "stop", "prompt", "all"]
+MATCHERS = [None, "", "*", "Bash", "Edit|Write", "Edit|Edit", "Read|Bash|MultiEdit", "Grep"]
+
+
+def naive(rules, tool_name, event, blocks_first):
+    """Walk every rule, as the engine did before the index."""
+    selected = [
+        rule for rule in rules
+        if (event is None or rule.event in ("all", event))
+        and (not rule.tool_matcher or rule.tool_matcher == "*" or tool_name in rule.tool_matcher.split("|"))
+    ]
+    if blocks_first:
+        selected = [r for r in selected if r.action == "block"] + [r for r in selected if r.action != "block"]
+    return selected
+
+
+def test_rules_for_matches_filtering_every_rule():
+    rng = random.Random(0)
+    for _ in range(50):
+        rules = [
+            Rule(name=f"r{i}", enabled=True, event=rng.choice(EVENTS),
+                 tool_matcher=rng.choice(MATCHERS), action=rng.choice(["warn", "block"]))
+            for i in range(rng.randint(0, 30))
+        ]
+        index = RuleIndex(rules)
+        for tool_name in TOOLS:
+            for event in EVENTS + [None]:
+                for blocks_first in (False, True):
+                    expected = naive(rules, tool_name, event, blocks_first)
+                    # Twice: the second call is answered from the bucket cache
+                    assert index.rules_for(tool_name, event, blocks_first) == expected
+                    assert index.rules_for(tool_name, event, blocks_first) == expected
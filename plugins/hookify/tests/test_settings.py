@@ -0,0 +1,113 @@
+"""Settings from the environment and the settings file."""
+
+import os
+
+import pytest
+
+from hookify.core.config_loader import Condition, Rule
+from hookify.core.rule_engine import RuleEngine, evaluation_deadline, regex_timeout
+from hookify.core.settings import get_number_setting, get_setting
+
+
+@pytest.mark.parametrize("value, expected", [("1", 0.001), ("0", 0.0), ("250", 0.25), (" 2.5 ", 0.0025)])
+def test_duration_from_environment_is_a_number(monkeypatch, value, expected):
+    monkeypatch.setenv("HOOKIFY_REGEX_TIMEOUT_MS", value)
+    monkeypatch.setenv("HOOKIFY_DEADLINE_MS", value)
+    assert regex_timeout({}) == expected
+    assert evaluation_deadline({}) == expected
+
+
+@pytest.mark.parametrize("value", ["true", "", "soon", "nan", "inf"])
+def test_invalid_duration_warns_and_uses_default(monkeypatch, capsys, value):
+    monkeypatch.setenv("HOOKIFY_DEADLINE_MS", value)
+    assert evaluation_deadline({}) == 8.0
+    assert "Invalid deadline_ms setting" in capsys.readouterr().err
+
+
+def test_settings_file_values(monkeypatch, capsys):
+    monkeypatch.delenv("HOOKIFY_REGEX_TIMEOUT_MS", raising=False)
+    assert regex_timeout({"regex_timeout_ms": 1}) == 0.001
+    assert regex_timeout({}) == 1.0
+    assert regex_timeout({"regex_timeout_ms": True}) == 1.0
+    assert "Invalid regex_timeout_ms setting" in capsys.readouterr().err
+
+
+def test_integer_setting(monkeypatch):
+    monkeypatch.setenv("HOOKIFY_DECISION_CACHE_SIZE", "1")
+    assert get_number_setting("decision_cache_size", env_var="HOOKIFY_DECISION_CACHE_SIZE",
+                              default=5000, settings={}, kind=int) == 1
+
+
+def test_cache_dir_is_ignored_by_git(tmp_path, monkeypatch):
+    from hookify.core.settings import CACHE_DIR, make_cache_dir
+
+    monkeypatch.chdir(tmp_path)
+    make_cache_dir(os.path.join(CACHE_DIR, "transcripts"))
+    assert (tmp_path / CACHE_DIR / "transcripts").is_dir()
+    assert (tmp_path / CACHE_DIR / ".gitignore").read_text() == "*\n"
+
+    make_cache_dir("logs")
+    assert (tmp_path / "logs").is_dir()
+    assert not (tmp_path / "logs" / ".gitignore").exists()
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("false", False), (" Off ", False), ("0", False), ("", False),
+    ("true", True), ("YES", True), ("1", True),
+    (False, False), (True, True), (0, 0), (None, None),
+    ("/tmp/telemetry.tsv", "/tmp/telemetry.tsv"),
+])
+def test_file_strings_parse_like_environment_values(monkeypatch, value, expected):
+    monkeypatch.delenv("HOOKIFY_TELEMETRY", raising=False)
+    assert get_setting("telemetry", env_var="HOOKIFY_TELEMETRY", settings={"telemetry": value}) == expected
+    if isinstance(value, str):
+        monkeypatch.setenv("HOOKIFY_TELEMETRY", value)
+        assert get_setting("telemetry", env_var="HOOKIFY_TELEMETRY", settings={}) == expected
+
+
+def rule(name, action, word):
+    return Rule(name=name, enabled=True, event="bash", action=action, message=f"{name} message",
+                conditions=[Condition(field="command", operator="contains", pattern=word)])
+
+
+RULES = [
+    rule("warn-a", "warn", "a"),
+    rule("block-b", "block", "b"),
+    rule("warn-c", "warn", "c"),
+    rule("block-c", "block", "c"),
+    rule("block-d", "block", "d"),
+]
+
+
+def naive_first_block(rules, command):
+    """The first matching blocking rule in ruleset order, else every matching warning."""
+    matched = [r for r in rules if r.conditions[0].pattern in command]
+    blocks = [r for r in matched if r.action == "block"]
+    return [r.name for r in (blocks[:1] or matched)]
+
+
+@pytest.mark.parametrize("setting", ["false", "0", False])
+def test_stop_at_first_block_off(monkeypatch, setting):
+    monkeypatch.delenv("HOOKIFY_STOP_AT_FIRST_BLOCK", raising=False)
+    engine = RuleEngine()
+    engine.configure({"stop_at_first_block": setting})
+    assert not engine.stop_at_first_block
+    message = engine.evaluate_rules(RULES, {"tool_name": "Bash", "tool_input": {"command": "a c d"}})["systemMessage"]
+    assert "block-c message" in message and "block-d message" in message
+
+
+@pytest.mark.parametrize("command", ["", "a", "a c", "c d", "a b c d", "d c b", "a d"])
+def test_stop_at_first_block_ordering(monkeypatch, command):
+    monkeypatch.delenv("HOOKIFY_STOP_AT_FIRST_BLOCK", raising=False)
+    engine = RuleEngine()
+    engine.configure({"stop_at_first_block": "true"})
+    assert engine.stop_at_first_block
+    response = engine.evaluate_rules(RULES, {"hook_event_name": "PreToolUse", "tool_name": "Bash",
+                                             "tool_input": {"command": command}})
+    expected = naive_first_block(RULES, command)
+    assert [r.name for r in engine.last_matches] == expected
+    assert response.get("systemMessage", "") == "\n\n".join(f"**[{n}]**\n{n} message" for n in expected)
+    if any(r.action == "block" for r in engine.last_matches):
+        # Blocking rules are checked first, and nothing after the first match
+        position = [r.name for r in RULES if r.action == "block"].index(expected[0])
+        assert engine.last_stats.rules_evaluated == position + 1
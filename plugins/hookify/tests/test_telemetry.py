@@ -0,0 +1,213 @@
+"""Telemetry sink batching and the report aggregation."""
+
+import json
+import math
+import os
+import random
+import time
+
+import pytest
+
+from hookify.core import telemetry
+from hookify.core.config_loader import load_rules
+from hookify.core.decision_cache import DecisionCache
+from hookify.core.rule_engine import RuleEngine
+from hookify.core.telemetry import LatencyCounts, TelemetrySink, main, summarize
+
+RULES = {
+    "hookify.rm.local.md": """---
+name: block-rm
+enabled: true
+event: bash
+pattern: rm\\s+-rf
+action: block
+---
+
+Dangerous rm!
+""",
+    "hookify.sudo.local.md": """---
+name: warn-sudo
+enabled: true
+event: bash
+pattern: sudo
+action: warn
+---
+
+Careful with sudo.
+""",
+}
+
+
+class Rule:
+    def __init__(self, name, action):
+        self.name = name
+        self.action = action
+
+
+def bash(command, session="s1"):
+    return {"hook_event_name": "PreToolUse", "session_id": session,
+            "tool_name": "Bash", "tool_input": {"command": command}}
+
+
+def read_records(path):
+    with open(path) as f:
+        return [line.rstrip("\n").split("\t") for line in f]
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    (tmp_path / ".claude").mkdir()
+    for name, text in RULES.items():
+        (tmp_path / ".claude" / name).write_text(text)
+    monkeypatch.chdir(tmp_path)
+    for name in list(os.environ):
+        if name.startswith("HOOKIFY_"):
+            monkeypatch.delenv(name)
+    monkeypatch.setattr(telemetry, "_sinks", {})
+    return tmp_path
+
+
+def test_records_are_buffered_until_flush(tmp_path, monkeypatch):
+    registered = []
+    monkeypatch.setattr("atexit.register", registered.append)
+    path = tmp_path / "sub" / "telemetry.tsv"
+    sink = TelemetrySink(str(path))
+
+    sink.record(bash("rm -rf x"), [Rule("block-rm", "block"), Rule("warn\trm", "warn")], 0.0015)
+    sink.record(bash("ls", session="s\n2"), [], 0.0002)
+    assert not path.exists()
+    # One exit flush per process, however many evaluations
+    assert registered == [sink._flush_at_exit]
+
+    sink.flush()
+    records = read_records(path)
+    assert [r[1:] for r in records] == [
+        ["s1", "PreToolUse", "Bash", "block-rm", "block", "1.500"],
+        ["s1", "PreToolUse", "Bash", "warn rm", "warn", "1.500"],
+        ["s 2", "PreToolUse", "Bash", "", "allow", "0.200"],
+    ]
+    # The records of one evaluation share their timestamp
+    assert records[0][0] == records[1][0]
+
+    sink.flush()  # Nothing buffered: no write
+    sink.record(bash("ls"), [], 0.0)
+    sink.flush()
+    assert len(read_records(path)) == 4
+
+
+def test_unwritable_file_is_reported_once(tmp_path, capsys):
+    (tmp_path / "file").write_text("")
+    sink = TelemetrySink(str(tmp_path / "file" / "telemetry.tsv"))
+    for _ in range(2):
+        sink.record(bash("ls"), [], 0.0)
+        sink.flush()
+    assert capsys.readouterr().err.count("Failed to write telemetry") == 1
+    assert sink._buffer == []
+
+
+def test_background_flush_wakes_on_a_full_batch(tmp_path, monkeypatch):
+    monkeypatch.setattr(telemetry, "MAX_BATCH", 3)
+    monkeypatch.setattr("atexit.register", lambda func: None)
+    path = tmp_path / "telemetry.tsv"
+    sink = TelemetrySink(str(path))
+    sink.start_background()
+    sink.record(bash("ls"), [], 0.0)
+    sink.record(bash("ls"), [], 0.0)
+    assert not sink._wake.is_set()
+    sink.record(bash("ls"), [], 0.0)
+    # Written well before the FLUSH_INTERVAL tick
+    deadline = time.monotonic() + telemetry.FLUSH_INTERVAL / 2
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(read_records(path)) == 3
+
+
+def test_engine_records_matches_and_allow_rows(project, monkeypatch):
+    path = project / "telemetry.tsv"
+    monkeypatch.setenv("HOOKIFY_TELEMETRY", str(path))
+    engine = RuleEngine()
+    rules = load_rules(event="bash")
+    engine.evaluate_rules(rules, bash("sudo rm -rf /tmp/x"))
+    engine.evaluate_rules(rules, bash("ls"))
+    engine.telemetry.flush()
+    assert sorted((r[4], r[5]) for r in read_records(path)) == [
+        ("", "allow"), ("block-rm", "block"), ("warn-sudo", "warn"),
+    ]
+
+
+def test_decision_cache_hits_are_recorded(project, monkeypatch):
+    path = project / "telemetry.tsv"
+    monkeypatch.setenv("HOOKIFY_TELEMETRY", str(path))
+    sink = telemetry.get_sink(str(path))
+    rules = load_rules(event="bash")
+
+    for command in ("sudo rm -rf /tmp/x", "ls"):
+        engine = RuleEngine()
+        input_data = bash(command)
+        output = json.dumps(engine.evaluate_rules(rules, input_data))
+        DecisionCache("pretooluse").put(input_data, rules, engine, output)
+    sink.flush()
+    evaluated = read_records(path)
+
+    cache = DecisionCache("pretooluse", telemetry=sink)
+    assert "deny" in cache.get(json.dumps(bash("sudo rm -rf /tmp/x")))
+    assert cache.get(json.dumps(bash("ls"))) == "{}"
+    sink.flush()
+    hits = read_records(path)[len(evaluated):]
+    assert [r[1:6] for r in hits] == [r[1:6] for r in evaluated]
+
+
+def naive_percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def test_percentiles_match_a_sorted_list():
+    rng = random.Random(7)
+    values = [round(rng.expovariate(1.0), 3) for _ in range(500)] + [1.0] * 50
+    counts = LatencyCounts()
+    for value in values:
+        counts.add(f"{value:.3f}")
+    assert counts.count == len(values)
+    assert counts.max() == max(values)
+    assert counts.mean() == pytest.approx(sum(values) / len(values))
+    for fraction in (0.01, 0.5, 0.9, 0.95, 0.99, 1.0):
+        assert counts.percentile(fraction) == naive_percentile(values, fraction)
+
+
+def test_summarize_groups_adjacent_records():
+    lines = [
+        "1.000\ts1\tPreToolUse\tBash\tblock-rm\tblock\t2.000\n",
+        "1.000\ts1\tPreToolUse\tBash\twarn-sudo\twarn\t2.000\n",
+        "2.000\ts2\tPreToolUse\tBash\tblock-rm\tblock\t1.000\n",
+        "3.000\ts2\tStop\t\t\tallow\t0.500\n",
+        "not a record\n",
+    ]
+    summary = summarize(lines)
+    assert (summary["records"], summary["evaluations"], summary["malformed"]) == (4, 3, 1)
+    assert summary["rules"]["block-rm"]["hits"] == 2
+    assert summary["rules"]["block-rm"]["sessions"] == {"s1", "s2"}
+    assert summary["rules"]["block-rm"]["last"] == "2.000"
+    assert summary["events"]["PreToolUse:Bash"].count == 2
+    assert summary["events"]["Stop"].count == 1
+    assert "" not in summary["rules"]
+
+
+def test_report_cli(tmp_path, capsys):
+    first = tmp_path / "a.tsv"
+    second = tmp_path / "b.tsv"
+    first.write_text("".join(
+        f"{i}.000\ts1\tPreToolUse\tBash\tblock-rm\tblock\t{i}.000\n" for i in range(1, 101)))
+    second.write_text("200.000\ts2\tPreToolUse\tBash\twarn-sudo\twarn\t1.000\n"
+                      "201.000\ts2\tPreToolUse\tBash\t\tallow\t1.000\n")
+
+    assert main(["telemetry.py", "report", "--top", "1", "--file", str(first), "--file", str(second)]) == 0
+    out = capsys.readouterr().out
+    assert out.startswith("102 evaluations, 102 records\n")
+    assert "block-rm" in out and "warn-sudo" not in out
+    row = next(line for line in out.splitlines() if line.strip().startswith("PreToolUse:Bash"))
+    # evals, mean, p50, p95, p99, max
+    assert row.split()[1:] == ["102", "49.53", "49.00", "95.00", "99.00", "100.00"]
+
+    assert main(["telemetry.py", "report", "--file", str(tmp_path / "missing.tsv")]) == 1
+    assert main(["telemetry.py"]) == 2
@@ -0,0 +1,251 @@
+"""Streaming transcript scans against evaluating the whole transcript at once."""
+
+import json
+import os
+import random
+import re
+import threading
+
+import pytest
+
+from hookify.core import transcript
+from hookify.core.config_loader import Condition
+from hookify.core.transcript import IncrementalScan, TranscriptScanner
+
+REGEXES = [
+    r"filler $", r"^abc", r"\bab\b", r"c\Z", r"(?m)^b c$", r"a(?!b)", r"(?<=a)b",
+    r"ab+c", r"\Aab", r"b\s*$", r"^$",
+]
+LITERALS = ["ab c", "filler", "é"]
+
+
+def conditions():
+    return (
+        [Condition(field="transcript", operator="regex_match", pattern=p) for p in REGEXES]
+        + [Condition(field="transcript", operator="contains", pattern=p) for p in LITERALS]
+        + [Condition(field="transcript", operator="not_contains", pattern="zz")]
+        + [Condition(field="transcript", operator="starts_with", pattern="ab")]
+        + [Condition(field="transcript", operator="ends_with", pattern="c\n")]
+        + [Condition(field="transcript", operator="equals", pattern="abc")]
+    )
+
+
+def expected(text):
+    results = {("regex_match", p): bool(re.search(p, text, re.IGNORECASE)) for p in REGEXES}
+    results.update({("contains", p): p in text for p in LITERALS})
+    results[("not_contains", "zz")] = "zz" not in text
+    results[("starts_with", "ab")] = text.startswith("ab")
+    results[("ends_with", "c\n")] = text.endswith("c\n")
+    results[("equals", "abc")] = text == "abc"
+    return results
+
+
+def random_text(rng):
+    return "".join(rng.choice(["a", "b", "c", " ", "\n", "filler ", "é", "z"])
+                   for _ in range(rng.randint(0, 200)))
+
+
+@pytest.fixture
+def small_chunks(monkeypatch, tmp_path):
+    """Tiny chunks and overlaps, so every transcript spans many chunk boundaries."""
+    monkeypatch.setattr(transcript, "CHUNK_SIZE", 7)
+    monkeypatch.setattr(transcript, "REGEX_OVERLAP", 12)
+    monkeypatch.setattr(transcript, "REGEX_LOOKAHEAD", 3)
+    monkeypatch.setattr(transcript, "STATE_DIR", str(tmp_path / "states"))
+    return tmp_path
+
+
+def test_chunked_scan_matches_whole_text(small_chunks):
+    scanner = TranscriptScanner(conditions())
+    rng = random.Random(0)
+    for i in range(300):
+        text = random_text(rng)
+        path = small_chunks / f"t{i}.jsonl"
+        path.write_bytes(text.encode("utf-8"))
+        assert scanner.scan_file(str(path)) == expected(text), repr(text)
+
+
+def test_anchors_do_not_match_at_chunk_boundaries(small_chunks):
+    scanner = TranscriptScanner([
+        Condition(field="transcript", operator="regex_match", pattern=p)
+        for p in (r"filler $", r"^more", r"\bab\b", r"end\Z")
+    ])
+    # Each anchor falls on a chunk boundary (chunks of 7 bytes) mid-text
+    text = "filler more text abxy end and more"
+    path = small_chunks / "t.jsonl"
+    path.write_text(text)
+    assert not any(scanner.scan_file(str(path)).values())
+
+
+def test_incremental_scan_matches_whole_text(small_chunks):
+    scanner = TranscriptScanner(conditions())
+    rng = random.Random(1)
+    for session in range(40):
+        path = small_chunks / f"s{session}.jsonl"
+        data = b""
+        path.write_bytes(data)
+        for _ in range(8):
+            # Appends may end inside a multi-byte character
+            data += random_text(rng).encode("utf-8")[:rng.randint(0, 60)]
+            with open(path, "r+b") as f:
+                f.seek(0)
+                f.write(data)
+            text = data.decode("utf-8", errors="replace")
+            if text.endswith("�") and not data.endswith("�".encode("utf-8")):
+                continue  # Incomplete character; re-read once it is complete
+            assert scanner.scan_file(str(path), session_id=f"s{session}") == expected(text), repr(text)
+
+
+def test_end_anchor_is_rechecked_after_append(small_chunks):
+    scanner = TranscriptScanner([Condition(field="transcript", operator="regex_match", pattern=r"done\Z")])
+    path = small_chunks / "t.jsonl"
+    path.write_text("work work done")
+    assert scanner.scan_file(str(path), session_id="s") == {("regex_match", r"done\Z"): True}
+    with open(path, "a") as f:
+        f.write(" and more")
+    assert scanner.scan_file(str(path), session_id="s") == {("regex_match", r"done\Z"): False}
+
+
+def test_resume_after_truncation_and_rotation(small_chunks):
+    scanner = TranscriptScanner(conditions())
+    path = small_chunks / "t.jsonl"
+    path.write_text("filler abc\nab c zz\n")
+    scanner.scan_file(str(path), session_id="s")
+
+    # Truncated and rewritten with different content
+    path.write_text("ab")
+    assert scanner.scan_file(str(path), session_id="s") == expected("ab")
+
+    # Replaced by a new file (rotation)
+    rotated = small_chunks / "new.jsonl"
+    rotated.write_text("b c\nabc")
+    os.replace(rotated, path)
+    assert scanner.scan_file(str(path), session_id="s") == expected("b c\nabc")
+
+
+def test_concurrent_state_saves_do_not_share_a_temp_file(small_chunks, monkeypatch):
+    scanner = TranscriptScanner(conditions())
+    short, long = small_chunks / "short.jsonl", small_chunks / "long.jsonl"
+    short.write_text("ab c")
+    long.write_text("filler abc\n" * 20)
+
+    # Both threads are inside json.dump at once
+    barrier = threading.Barrier(2, timeout=5)
+    dump = json.dump
+
+    def waiting_dump(data, f):
+        barrier.wait()
+        dump(data, f)
+
+    monkeypatch.setattr(json, "dump", waiting_dump)
+    results = {}
+    threads = [threading.Thread(target=lambda p=p: results.update({p: scanner.scan_file(str(p), session_id="s")}))
+               for p in (short, long)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {short: expected("ab c"), long: expected("filler abc\n" * 20)}
+    names = os.listdir(transcript.STATE_DIR)
+    assert len(names) == 1 and not names[0].endswith(".tmp")
+    with open(os.path.join(transcript.STATE_DIR, names[0])) as f:
+        assert json.load(f)["offset"] in (len("ab c"), len("filler abc\n" * 20))
+
+
+def test_incremental_scan_results_after_each_piece(small_chunks):
+    scanner = TranscriptScanner(conditions())
+    rng = random.Random(2)
+    for _ in range(30):
+        scan = IncrementalScan(scanner)
+        text = ""
+        for _ in range(5):
+            piece = random_text(rng)[:30]
+            scan.feed(piece.encode("utf-8"))
+            text += piece
+            assert scan.results() == expected(text), repr(text)
+
+
+def test_risky_transcript_regex_runs_under_the_regex_timeout(tmp_path, monkeypatch):
+    from hookify.core.config_loader import Rule
+    from hookify.core.rule_engine import CompiledRuleset, RuleEngine
+
+    monkeypatch.setattr(transcript, "STATE_DIR", str(tmp_path / "states"))
+    risky = Condition(field="transcript", operator="regex_match", pattern=r"(a+)+$")
+    safe = Condition(field="transcript", operator="contains", pattern="pytest")
+    rules = [
+        Rule(name="risky", enabled=True, event="stop", conditions=[risky], action="block", message="risky"),
+        Rule(name="safe", enabled=True, event="stop", conditions=[safe], action="warn", message="safe"),
+    ]
+    ruleset = CompiledRuleset(rules)
+    assert ruleset.transcript_scanner.keys == [("contains", "pytest")]
+    assert ruleset.io_rules == {id(rules[1])}
+
+    path = tmp_path / "t.jsonl"
+    path.write_text("ran pytest\n" + "a" * 40 + "!")
+    engine = RuleEngine()
+    engine.regex_timeout = 0.2
+    response = engine.evaluate_rules(rules, {
+        "hook_event_name": "Stop", "session_id": "s", "transcript_path": str(path),
+    })
+    assert "Skipped rule(s) 'risky'" in response["systemMessage"]
+    assert "safe" in response["systemMessage"]
+    assert "decision" not in response
+
+
+def test_risky_transcript_regex_is_scanned_in_chunks(tmp_path, monkeypatch, small_chunks):
+    from hookify.core.config_loader import Rule
+    from hookify.core.rule_engine import RuleEngine
+
+    monkeypatch.setattr(transcript, "STATE_DIR", str(tmp_path / "states"))
+    risky = Condition(field="transcript", operator="regex_match", pattern=r"(\w+\s?)*LATEMARKER")
+    rules = [Rule(name="late", enabled=True, event="stop", conditions=[risky], action="block",
+                  message="late")]
+    path = tmp_path / "t.jsonl"
+    path.write_text("word " * 50)
+    input_data = {"hook_event_name": "Stop", "session_id": "s", "transcript_path": str(path)}
+
+    def read_all(*args, **kwargs):
+        raise AssertionError("transcript read whole")
+
+    engine = RuleEngine()
+    monkeypatch.setattr(engine, "_extract_field", read_all)
+    assert engine.evaluate_rules(rules, input_data) == {}
+    with open(path, "a") as f:
+        f.write("and LATEMARKER")
+    assert engine.evaluate_rules(rules, input_data)["decision"] == "block"
+    # Saved apart from the state of the background scan
+    assert [name.endswith("-risky.json") for name in os.listdir(tmp_path / "states")] == [True]
+
+
+def test_replay_sees_only_the_transcript_prefix(tmp_path):
+    import io
+    import json
+
+    from hookify.core.config_loader import Rule
+    from hookify.core.replay import ReplayEngine, replay_file
+
+    def text(role, value):
+        return {"type": role, "message": {"content": [{"type": "text", "text": value}]}}
+
+    records = [
+        {"type": "user", "message": {"content": "start"}},
+        text("assistant", "working on it"),
+        {"type": "user", "message": {"content": "next"}},  # Stop at line 3
+        text("assistant", "done LATEMARKER"),  # Stop at the end (line 4)
+    ]
+    path = tmp_path / "session.jsonl"
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    rules = [
+        Rule(name=name, enabled=True, event="stop", action="block", message=name,
+             conditions=[Condition(field="transcript", operator="regex_match", pattern=pattern)])
+        for name, pattern in (("risky", r"(\w+\s?)*LATEMARKER"), ("safe", r"LATE\w+"))
+    ]
+
+    out = io.StringIO()
+    replay_file(ReplayEngine(), rules, str(path), out, include_allowed=True)
+    stops = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [(d["line"], d["decision"], d["rules"]) for d in stops] == [
+        (3, "allow", []), (4, "block", ["risky", "safe"]),
+    ]
+
@@ -0,0 +1,22 @@
+"""Make the hookify package importable from a module run as a script.
+
+`python3 core/daemon.py` starts with only core/ on sys.path, so the module
+cannot import hookify (nor this file) yet. Such modules run this file by
+path first:
+
+    if __name__ == '__main__':
+        import runpy
+        runpy.run_path(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    'utils', 'script_path.py'))
+
+It adds the parent of the plugin directory to sys.path.
+"""
+
+import os
+import sys
+
+PLUGIN_ROOT = os.environ.get('CLAUDE_PLUGIN_ROOT') or \
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+parent_dir = os.path.dirname(PLUGIN_ROOT)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
@@ -0,0 +1,6 @@
+"""Support modules of the security reminder hook.
+
+A package rather than loose modules next to the hook, so that nothing with
+a generic name (state_store, debug_logger, ...) is put on sys.path: the
+hook loads this package from its own directory under this name only.
+"""
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Buffered debug log for the security reminder hook.
+
+Records are JSON lines:
+
+    {"ts": "2026-01-01T12:00:00.123", "level": "info", "session": "...",
+     "logger": "security_reminder_hook", "msg": "...", ...extra fields}
+
+Nothing touches the disk while the hook runs. Records at or above the
+configured level are buffered per session; the buffer is written at
+process exit with one append, and records of one session stay together.
+Below the level, a call costs one integer comparison. When the file grows
+past the size limit it is rotated (security-guidance.log.1, .2, ...).
+
+Configuration (environment):
+    SECURITY_REMINDER_LOG_LEVEL      debug, info, warning (default), error or off
+    SECURITY_REMINDER_LOG_DIR        log directory (default: ~/.claude/logs)
+    SECURITY_REMINDER_LOG_MAX_BYTES  rotation size (default: 1048576)
+    SECURITY_REMINDER_LOG_BACKUPS    rotated files kept (default: 3)
+"""
+
+import os
+import time
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40, "off": 100}
+DEFAULT_LEVEL = "warning"
+
+DEFAULT_LOG_DIR = os.path.join("~", ".claude", "logs")
+LOG_NAME = "security-guidance.log"
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_BACKUPS = 3
+
+
+def _env_int(name, default):
+    try:
+        return max(0, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+class DebugLogger:
+    """Buffers log records in memory and appends them to the log file at exit."""
+
+    def __init__(self, name, level=None, path=None, max_bytes=None, backups=None):
+        self.name = name
+        level = (level or os.environ.get("SECURITY_REMINDER_LOG_LEVEL") or DEFAULT_LEVEL).lower()
+        self.level = LEVELS.get(level, LEVELS[DEFAULT_LEVEL])
+        if path is None:
+            directory = os.environ.get("SECURITY_REMINDER_LOG_DIR") or DEFAULT_LOG_DIR
+            path = os.path.join(os.path.expanduser(directory), LOG_NAME)
+        self.path = path
+        self.max_bytes = max_bytes if max_bytes is not None else \
+            _env_int("SECURITY_REMINDER_LOG_MAX_BYTES", DEFAULT_MAX_BYTES)
+        self.backups = backups if backups is not None else \
+            _env_int("SECURITY_REMINDER_LOG_BACKUPS", DEFAULT_BACKUPS)
+        self.session_id = None  # Set once the hook input is read
+        self._buffers = {}  # Session -> JSON lines
+        self._exit_flush = False
+
+    def debug(self, message, **fields):
+        if self.level <= 10:
+            self._record("debug", message, fields)
+
+    def info(self, message, **fields):
+        if self.level <= 20:
+            self._record("info", message, fields)
+
+    def warning(self, message, **fields):
+        if self.level <= 30:
+            self._record("warning", message, fields)
+
+    def error(self, message, **fields):
+        if self.level <= 40:
+            self._record("error", message, fields)
+
+    def _record(self, level, message, fields):
+        import json
+
+        now = time.time()
+        record = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(now)) + f".{int(now % 1 * 1000):03d}",
+            "level": level,
+            "session": self.session_id,
+            "logger": self.name,
+            "msg": message,
+        }
+        record.update(fields)
+        line = json.dumps(record, default=str, ensure_ascii=False) + "\n"
+        self._buffers.setdefault(self.session_id, []).append(line)
+        if not self._exit_flush:
+            import atexit
+            atexit.register(self.flush)
+            self._exit_flush = True
+
+    def flush(self):
+        """Append the buffered records with a single write, then rotate if needed."""
+        if not self._buffers:
+            return
+        data = "".join(line for lines in self._buffers.values() for line in lines)
+        self._buffers = {}
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+            # O_APPEND with one write keeps concurrent hooks from interleaving
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, data.encode("utf-8", "replace"))
+                st = os.fstat(fd)
+            finally:
+                os.close(fd)
+            if self.max_bytes and st.st_size > self.max_bytes:
+                self._rotate(st)
+        except OSError:
+            pass  # Logging must never disrupt the hook
+
+    def _rotate(self, st):
+        """Shift log -> log.1 -> log.2 ...; the oldest file is dropped."""
+        try:
+            # Another process may have rotated the file we wrote to already
+            if os.stat(self.path).st_ino != st.st_ino:
+                return
+        except OSError:
+            return
+        if self.backups == 0:
+            os.remove(self.path)
+            return
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+_loggers = {}
+
+
+def get_logger(name):
+    """Return the process-wide logger with the given name."""
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = DebugLogger(name)
+    return logger
+
+
+# For testing
+if __name__ == "__main__":
+    import tempfile
+
+    directory = tempfile.mkdtemp(prefix="security-log-")
+    logger = DebugLogger("test", level="debug", path=os.path.join(directory, LOG_NAME), max_bytes=4096)
+    for i in range(100):
+        logger.session_id = f"session-{i % 3}"
+        logger.info("checked file", file_path=f"src/{i}.js", rules=["eval_injection"])
+        if i % 10 == 9:
+            logger.flush()
+    print(sorted((n, os.path.getsize(os.path.join(directory, n))) for n in os.listdir(directory)))
+
+    disabled = DebugLogger("test", level="off", path=os.path.join(directory, "unused.log"))
+    start = time.perf_counter()
+    for _ in range(100000):
+        disabled.debug("checked file", file_path="src/a.js")
+    print(f"disabled call: {(time.perf_counter() - start) * 10:.3f} µs")
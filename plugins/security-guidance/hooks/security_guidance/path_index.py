@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Compiled index of the path-based security rules.
+
+Rules select files declaratively instead of with Python callables:
+
+    "paths":         globs over "/"-separated segments. "*", "?" and
+                     "[...]" match within one segment; "**" matches any
+                     number of segments (including none).
+    "path_prefixes": strings the path starts with (e.g. "infra/")
+    "path_suffixes": strings the path ends with (e.g. ".pem", "/.env")
+
+Paths are matched without leading slashes, case-sensitively.
+
+All globs of all rules are compiled into one trie over path segments. A
+path is matched by walking its segments once, following literal children
+by dictionary lookup and "*suffix" segments (the common "*.yml" form)
+through a per-node suffix table, so the cost depends on the path's depth
+and not on the number of globs. Prefixes and suffixes of whole paths are
+looked up in tables keyed by the string, once per distinct length.
+"""
+
+_MAGIC = frozenset("*?[")
+
+
+class _Node:
+    """Trie node; one per distinct glob segment position."""
+
+    __slots__ = ("literal", "suffixes", "wildcards", "globstar", "loops", "rules")
+
+    def __init__(self, loops=False):
+        self.literal = {}  # Segment -> node
+        self.suffixes = {}  # Suffix of a "*suffix" segment -> node
+        self.wildcards = []  # (compiled segment pattern, node) for other wildcards
+        self.globstar = None  # Child for a "**" segment
+        self.loops = loops  # True for "**" nodes: they also consume any segment
+        self.rules = set()  # Rules whose glob ends here
+
+
+class PathIndex:
+    """Matches a path against the path selectors of many rules at once."""
+
+    def __init__(self, rules):
+        """Compile the index.
+
+        Args:
+            rules: Iterable of (key, selectors) pairs, where selectors is a
+                dict with optional "paths", "path_prefixes" and
+                "path_suffixes" lists (see module docstring). The key is
+                reported for matching paths.
+        """
+        self._root = _Node()
+        self._prefixes = {}  # Prefix -> keys
+        self._suffixes = {}  # Suffix -> keys
+        for key, selectors in rules:
+            for glob in selectors.get("paths", ()):
+                self._add_glob(glob, key)
+            for prefix in selectors.get("path_prefixes", ()):
+                self._prefixes.setdefault(prefix.lstrip("/"), set()).add(key)
+            for suffix in selectors.get("path_suffixes", ()):
+                self._suffixes.setdefault(suffix, set()).add(key)
+        self._prefix_lengths = sorted({len(p) for p in self._prefixes})
+        self._suffix_lengths = sorted({len(s) for s in self._suffixes if s})
+
+    def _add_glob(self, glob, key):
+        node = self._root
+        for segment in _segments(glob):
+            if segment == "**":
+                if node.globstar is None:
+                    node.globstar = _Node(loops=True)
+                node = node.globstar
+            elif not _MAGIC.intersection(segment):
+                node = node.literal.setdefault(segment, _Node())
+            elif segment[0] == "*" and not _MAGIC.intersection(segment[1:]):
+                node = node.suffixes.setdefault(segment[1:], _Node())
+            else:
+                import fnmatch
+                import re
+
+                pattern = re.compile(fnmatch.translate(segment))
+                for existing, child in node.wildcards:
+                    if existing.pattern == pattern.pattern:
+                        node = child
+                        break
+                else:
+                    child = _Node()
+                    node.wildcards.append((pattern, child))
+                    node = child
+        node.rules.add(key)
+
+    def match(self, path):
+        """Return the keys of all rules whose selectors match path."""
+        path = path.lstrip("/")
+        keys = set()
+
+        for length in self._prefix_lengths:
+            if length > len(path):
+                break
+            keys.update(self._prefixes.get(path[:length], ()))
+        for length in self._suffix_lengths:
+            if length > len(path):
+                break
+            keys.update(self._suffixes.get(path[-length:], ()))
+
+        states = _closure([self._root])
+        for segment in _segments(path):
+            next_states = []
+            for node in states:
+                child = node.literal.get(segment)
+                if child is not None:
+                    next_states.append(child)
+                if node.suffixes:
+                    next_states.extend(_suffix_matches(node.suffixes, segment))
+                for pattern, child in node.wildcards:
+                    if pattern.match(segment):
+                        next_states.append(child)
+                if node.loops:
+                    next_states.append(node)
+            if not next_states:
+                return keys
+            states = _closure(next_states)
+
+        for node in states:
+            keys.update(node.rules)
+        return keys
+
+
+def _segments(path):
+    """Split a path into its non-empty segments."""
+    return [segment for segment in path.split("/") if segment]
+
+
+def _closure(nodes):
+    """Add the "**" children (matching zero segments) of the given nodes."""
+    result = []
+    seen = set()
+    for node in nodes:
+        while node is not None and id(node) not in seen:
+            seen.add(id(node))
+            result.append(node)
+            node = node.globstar
+    return result
+
+
+def _suffix_matches(suffixes, segment):
+    """Return the nodes of the suffix table entries that segment ends with."""
+    matches = []
+    for start in range(len(segment) + 1):
+        child = suffixes.get(segment[start:])
+        if child is not None:
+            matches.append(child)
+    return matches
+
+
+# For testing
+if __name__ == "__main__":
+    import random
+    import time
+
+    index = PathIndex([
+        ("github_actions_workflow", {"paths": ["**/.github/workflows/**/*.yml", "**/.github/workflows/**/*.yaml"]}),
+        ("private_key", {"path_suffixes": [".pem", "/id_rsa"]}),
+        ("terraform", {"path_prefixes": ["infra/"], "paths": ["**/*.tf"]}),
+    ])
+    for path in ("/repo/.github/workflows/ci.yml", ".github/workflows/sub/x.yaml", ".github/ci.yml",
+                 "home/.ssh/id_rsa", "infra/main.tf", "src/app.js"):
+        print(f"{path:<36} {sorted(index.match(path))}")
+
+    rng = random.Random(0)
+    words = ["src", "lib", "infra", "deploy", "config", "secrets", "app", "web", "k8s", "ci", "docs"]
+    scopes = [(rng.sample(words, 2), f"{rng.choice(['yml', 'json', 'tf', 'env'])}{i}") for i in range(5000)]
+    rules = [
+        (f"rule_{i}", {"paths": [f"**/{first}/{second}/*.{extension}"], "path_suffixes": [f".ext{i}"]})
+        for i, ((first, second), extension) in enumerate(scopes)
+    ]
+    start = time.perf_counter()
+    big = PathIndex(rules)
+    built = time.perf_counter() - start
+    paths = []
+    for _ in range(2000):
+        name, selectors = rng.choice(rules)
+        directories = [rng.choice(words) for _ in range(rng.randint(0, 6))]
+        paths.append("/".join(directories + selectors["paths"][0].split("/")[1:3] + ["file" + selectors["paths"][0].split("/")[-1][1:]]))
+    start = time.perf_counter()
+    hits = sum(len(big.match(path)) for path in paths)
+    elapsed = time.perf_counter() - start
+    print(f"5000 rules: build {built * 1000:.1f} ms, {elapsed / len(paths) * 1e6:.1f} µs per path ({hits} hits)")
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Warning state store for the security reminder hook.
+
+Records which reminders were shown in which session, so each one is shown
+once per file and session. All sessions share one SQLite database,
+~/.claude/security_warnings_state.sqlite, in WAL mode:
+
+- claim() inserts the warning keys with INSERT OR IGNORE. Each key is
+  claimed by exactly one hook process, even when several run in parallel
+  for the same session. SQLite's file locking serializes the writers.
+- Checking whether a key was shown is a primary key lookup; nothing is
+  rewritten when a warning is added.
+- Entries older than MAX_AGE_DAYS are deleted through an index on the time
+  they were shown. Old sessions are never found by listing a directory.
+
+The first time the database is created, the per-session JSON files of
+earlier versions (~/.claude/security_warnings_state_<session>.json) are
+imported and removed.
+
+Usage (benchmark):
+    python3 state_store.py --benchmark [--sessions N] [--workers N] [--warnings N] [--calls N]
+"""
+
+import json
+import os
+import time
+
+STATE_DIR = os.path.expanduser("~/.claude")
+STATE_FILE = os.path.join(STATE_DIR, "security_warnings_state.sqlite")
+
+# Entries older than this are deleted
+MAX_AGE_DAYS = 30
+
+# Seconds to wait for another hook process holding the database lock
+LOCK_TIMEOUT = 2.0
+
+# Per-session JSON files written by earlier versions
+LEGACY_PREFIX = "security_warnings_state_"
+LEGACY_SUFFIX = ".json"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shown_warnings (
+    session_id TEXT NOT NULL,
+    warning_key TEXT NOT NULL,
+    shown REAL NOT NULL,
+    PRIMARY KEY (session_id, warning_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS shown_warnings_shown ON shown_warnings (shown);
+"""
+
+
+class WarningStateStore:
+    """Shown warnings of all sessions, shared by concurrent hook processes."""
+
+    def __init__(self, path=STATE_FILE):
+        self.path = path
+        self._db = None
+
+    def claim(self, session_id, warning_keys):
+        """Mark warnings as shown in a session.
+
+        Args:
+            session_id: Session the warnings are shown in
+            warning_keys: Keys of the warnings about to be shown
+
+        Returns:
+            The keys that were not shown in the session before, in order.
+            A key claimed concurrently by another process is returned by
+            only one of them.
+
+        Raises:
+            sqlite3.Error, OSError: If the database cannot be used
+        """
+        db = self._connect()
+        # Primary key lookups without the write lock: most warnings were
+        # already shown, and then nothing is written
+        unseen = [
+            key for key in warning_keys
+            if db.execute(
+                "SELECT 1 FROM shown_warnings WHERE session_id = ? AND warning_key = ?",
+                (session_id, key),
+            ).fetchone() is None
+        ]
+        if not unseen:
+            return []
+
+        now = time.time()
+        claimed = []
+        # One write transaction for all keys. INSERT OR IGNORE decides, so a
+        # key claimed by another process since the lookup is not returned.
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            for key in unseen:
+                cursor = db.execute(
+                    "INSERT OR IGNORE INTO shown_warnings (session_id, warning_key, shown) "
+                    "VALUES (?, ?, ?)",
+                    (session_id, key, now),
+                )
+                if cursor.rowcount:
+                    claimed.append(key)
+            if claimed:
+                # Writes are rare (a new warning), so expiry runs with them
+                db.execute(
+                    "DELETE FROM shown_warnings WHERE shown < ?",
+                    (now - MAX_AGE_DAYS * 24 * 60 * 60,),
+                )
+            db.execute("COMMIT")
+        except BaseException:
+            # A failed statement may already have ended the transaction; a
+            # ROLLBACK then would raise and hide the original error
+            if db.in_transaction:
+                db.rollback()
+            raise
+        return claimed
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _connect(self):
+        if self._db is None:
+            # Every Edit and Write runs this hook; _sqlite3 spares it the
+            # sqlite3 package's adapters and their imports
+            try:
+                import _sqlite3 as sqlite3
+            except ImportError:
+                import sqlite3
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            is_new = not os.path.exists(self.path)
+            # claim() manages its own transaction (BEGIN IMMEDIATE), so the
+            # module's implicit transactions are turned off
+            db = sqlite3.connect(self.path, timeout=LOCK_TIMEOUT, isolation_level=None)
+            db.execute("PRAGMA journal_mode = WAL")
+            db.execute("PRAGMA synchronous = NORMAL")
+            db.executescript(_SCHEMA)
+            self._db = db
+            if is_new:
+                self._import_legacy_files(directory)
+        return self._db
+
+    def _import_legacy_files(self, directory):
+        """Move recent per-session JSON state into the database; remove all of it."""
+        try:
+            names = [
+                n for n in os.listdir(directory)
+                if n.startswith(LEGACY_PREFIX) and n.endswith(LEGACY_SUFFIX)
+            ]
+        except OSError:
+            return
+        cutoff = time.time() - MAX_AGE_DAYS * 24 * 60 * 60
+        rows = []
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                shown = os.path.getmtime(path)
+                if shown >= cutoff:
+                    session_id = name[len(LEGACY_PREFIX):-len(LEGACY_SUFFIX)]
+                    with open(path, "r") as f:
+                        rows.extend((session_id, str(key), shown) for key in json.load(f))
+            except (OSError, ValueError, TypeError):
+                pass  # Unreadable state is dropped like expired state
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        if rows:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO shown_warnings (session_id, warning_key, shown) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+
+
+def _legacy_claim(directory, session_id, warning_keys):
+    """The per-session JSON file update of earlier versions (for the benchmark)."""
+    path = os.path.join(directory, f"{LEGACY_PREFIX}{session_id}{LEGACY_SUFFIX}")
+    try:
+        with open(path, "r") as f:
+            shown = set(json.load(f))
+    except (OSError, ValueError):
+        shown = set()
+    claimed = [key for key in warning_keys if key not in shown]
+    if claimed:
+        shown.update(claimed)
+        with open(path, "w") as f:
+            json.dump(list(shown), f)
+    return claimed
+
+
+def _benchmark_worker(args):
+    """Claim warnings for random sessions; return (claimed keys, seconds per call)."""
+    import random
+
+    backend, directory, sessions, warnings, calls, seed = args
+    rng = random.Random(seed)
+    claimed = []
+    start = time.perf_counter()
+    for _ in range(calls):
+        session_id = f"session-{rng.randrange(sessions)}"
+        key = f"src/file_{rng.randrange(warnings)}.js-eval_injection"
+        if backend == "sqlite":
+            # A new connection per call, like one hook process per tool call
+            store = WarningStateStore(os.path.join(directory, "state.sqlite"))
+            new = store.claim(session_id, [key])
+            store.close()
+        else:
+            try:
+                new = _legacy_claim(directory, session_id, [key])
+            except OSError:
+                new = [key]  # The hook shows the warning when saving fails
+        claimed.extend((session_id, k) for k in new)
+    return claimed, (time.perf_counter() - start) / calls
+
+
+def benchmark(sessions, workers, warnings, calls):
+    """Run concurrent hook-like workers against both stores and compare.
+
+    Every (session, warning) pair should be claimed exactly once. Pairs
+    claimed more than once are reminders shown again; they come from lost
+    updates (one process's rewrite overwriting another's).
+    """
+    import multiprocessing
+    import shutil
+    import statistics
+    import tempfile
+
+    print(f"{workers} concurrent workers x {calls} calls, {sessions} sessions, "
+          f"{warnings} warning keys per session\n")
+    print(f"{'store':<8} {'calls/s':>9} {'mean ms':>8} {'claimed':>8} {'distinct':>9} "
+          f"{'shown again':>12} {'files':>6}")
+    for backend in ("json", "sqlite"):
+        directory = tempfile.mkdtemp(prefix="security-state-bench-")
+        try:
+            if backend == "sqlite":
+                WarningStateStore(os.path.join(directory, "state.sqlite"))._connect()
+            jobs = [(backend, directory, sessions, warnings, calls, seed) for seed in range(workers)]
+            start = time.perf_counter()
+            with multiprocessing.Pool(workers) as pool:
+                results = pool.map(_benchmark_worker, jobs)
+            elapsed = time.perf_counter() - start
+            claimed = [pair for pairs, _ in results for pair in pairs]
+            distinct = len(set(claimed))
+            print(f"{backend:<8} {workers * calls / elapsed:>9.0f} "
+                  f"{statistics.mean(t for _, t in results) * 1000:>8.3f} {len(claimed):>8} "
+                  f"{distinct:>9} {len(claimed) - distinct:>12} {len(os.listdir(directory)):>6}")
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+# For testing
+if __name__ == "__main__":
+    import sys
+
+    argv = sys.argv[1:]
+    if "--benchmark" not in argv:
+        print("Usage: state_store.py --benchmark [--sessions N] [--workers N] [--warnings N] [--calls N]",
+              file=sys.stderr)
+        sys.exit(2)
+
+    def option(name, default):
+        return int(argv[argv.index(name) + 1]) if name in argv else default
+
+    benchmark(
+        sessions=option("--sessions", 200),
+        workers=option("--workers", 16),
+        warnings=option("--warnings", 20),
+        calls=option("--calls", 500),
+    )
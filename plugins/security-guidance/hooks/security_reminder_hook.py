@@ -6,33 +6,52 @@ This hook checks for security patterns in file edits and warns about potential v
 
 import json
 import os
-import random
 import sys
-from datetime import datetime
 
-# Debug log file
-DEBUG_LOG_FILE = "/tmp/security-warnings-log.txt"
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+PACKAGE = "security_guidance"
 
 
-def debug_log(message):
-    """Append debug message to log file with timestamp."""
-    try:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        with open(DEBUG_LOG_FILE, "a") as f:
-            f.write(f"[{timestamp}] {message}\n")
-    except Exception as e:
-        # Silently ignore logging errors to avoid disrupting the hook
-        pass
+def _load_package():
+    """Import the security_guidance package from this file's directory.
+
+    The package is loaded by its path rather than through sys.path, both
+    when this file runs as a script and when a dispatcher loads it by path,
+    so a module of the same name elsewhere on sys.path can neither shadow
+    the package nor be shadowed by it.
+    """
+    directory = os.path.join(HOOKS_DIR, PACKAGE)
+    package = sys.modules.get(PACKAGE)
+    if package is not None and list(getattr(package, "__path__", ())) == [directory]:
+        return
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE, os.path.join(directory, "__init__.py"), submodule_search_locations=[directory]
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE] = package
+    spec.loader.exec_module(package)
+
+
+_load_package()
 
+from security_guidance.debug_logger import get_logger
+from security_guidance.path_index import PathIndex
+from security_guidance.pattern_scanner import PatternScanner
+from security_guidance.state_store import WarningStateStore
 
-# State file to track warnings shown (session-scoped using session ID)
+logger = get_logger("security_reminder_hook")
 
-# Security patterns configuration
+
+# Security patterns configuration. A pattern selects files by path ("paths"
+# globs, "path_prefixes", "path_suffixes"; see security_guidance/path_index.py) and/or by
+# "substrings" of the new content. More patterns of the same form can be
+# added in a JSON file (see load_security_patterns).
 SECURITY_PATTERNS = [
     {
         "ruleName": "github_actions_workflow",
-        "path_check": lambda path: ".github/workflows/" in path
-        and (path.endswith(".yml") or path.endswith(".yaml")),
+        "paths": ["**/.github/workflows/**/*.yml", "**/.github/workflows/**/*.yaml"],
         "reminder": """You are editing a GitHub Actions workflow file. Be aware of these security risks:
 
 1. **Command Injection**: Never use untrusted input (like issue titles, PR descriptions, commit messages) directly in run: commands without proper escaping
@@ -126,77 +145,105 @@ Only use exec() if you absolutely need shell features and the input is guarantee
 ]
 
 
-def get_state_file(session_id):
-    """Get session-specific state file path."""
-    return os.path.expanduser(f"~/.claude/security_warnings_state_{session_id}.json")
+# Additional patterns: a JSON list of objects shaped like SECURITY_PATTERNS
+PATTERNS_FILE = os.environ.get(
+    "SECURITY_REMINDER_PATTERNS_FILE",
+    os.path.expanduser("~/.claude/security-patterns.json"),
+)
 
+SELECTOR_KEYS = ("paths", "path_prefixes", "path_suffixes", "substrings")
 
-def cleanup_old_state_files():
-    """Remove state files older than 30 days."""
-    try:
-        state_dir = os.path.expanduser("~/.claude")
-        if not os.path.exists(state_dir):
-            return
-
-        current_time = datetime.now().timestamp()
-        thirty_days_ago = current_time - (30 * 24 * 60 * 60)
-
-        for filename in os.listdir(state_dir):
-            if filename.startswith("security_warnings_state_") and filename.endswith(
-                ".json"
-            ):
-                file_path = os.path.join(state_dir, filename)
-                try:
-                    file_mtime = os.path.getmtime(file_path)
-                    if file_mtime < thirty_days_ago:
-                        os.remove(file_path)
-                except (OSError, IOError):
-                    pass  # Ignore errors for individual file cleanup
-    except Exception:
-        pass  # Silently ignore cleanup errors
-
-
-def load_state(session_id):
-    """Load the state of shown warnings from file."""
-    state_file = get_state_file(session_id)
-    if os.path.exists(state_file):
-        try:
-            with open(state_file, "r") as f:
-                return set(json.load(f))
-        except (json.JSONDecodeError, IOError):
-            return set()
-    return set()
-
-
-def save_state(session_id, shown_warnings):
-    """Save the state of shown warnings to file."""
-    state_file = get_state_file(session_id)
-    try:
-        os.makedirs(os.path.dirname(state_file), exist_ok=True)
-        with open(state_file, "w") as f:
-            json.dump(list(shown_warnings), f)
-    except IOError as e:
-        debug_log(f"Failed to save state file: {e}")
-        pass  # Fail silently if we can't save state
+_patterns = None
+_content_scanner = None
+_path_index = None
 
 
-def check_patterns(file_path, content):
-    """Check if file path or content matches any security patterns."""
-    # Normalize path by removing leading slashes
-    normalized_path = file_path.lstrip("/")
+def load_security_patterns():
+    """Return SECURITY_PATTERNS followed by the valid patterns of PATTERNS_FILE."""
+    global _patterns
+    if _patterns is not None:
+        return _patterns
 
-    for pattern in SECURITY_PATTERNS:
-        # Check path-based patterns
-        if "path_check" in pattern and pattern["path_check"](normalized_path):
-            return pattern["ruleName"], pattern["reminder"]
+    _patterns = list(SECURITY_PATTERNS)
+    try:
+        with open(PATTERNS_FILE, "r") as f:
+            extra = json.load(f)
+    except FileNotFoundError:
+        return _patterns
+    except (OSError, ValueError) as e:
+        logger.warning("Cannot read security patterns file", path=PATTERNS_FILE, error=str(e))
+        return _patterns
+
+    if not isinstance(extra, list):
+        logger.warning("Security patterns file must contain a list", path=PATTERNS_FILE)
+        return _patterns
+    for pattern in extra:
+        if (
+            isinstance(pattern, dict)
+            and isinstance(pattern.get("ruleName"), str)
+            and isinstance(pattern.get("reminder"), str)
+            and any(key in pattern for key in SELECTOR_KEYS)
+            and all(
+                isinstance(pattern.get(key, []), list)
+                and all(isinstance(value, str) for value in pattern.get(key, []))
+                for key in SELECTOR_KEYS
+            )
+        ):
+            _patterns.append(pattern)
+        else:
+            logger.warning("Skipping invalid security pattern", path=PATTERNS_FILE, pattern=pattern)
+    return _patterns
+
+
+def get_content_scanner():
+    """Return the scanner for all content substrings, compiling it on first use."""
+    global _content_scanner
+    if _content_scanner is None:
+        _content_scanner = PatternScanner(
+            (substring, index)
+            for index, pattern in enumerate(load_security_patterns())
+            for substring in pattern.get("substrings", ())
+        )
+    return _content_scanner
+
+
+def get_path_index():
+    """Return the index of all path selectors, compiling it on first use."""
+    global _path_index
+    if _path_index is None:
+        _path_index = PathIndex(enumerate(load_security_patterns()))
+    return _path_index
 
-        # Check content-based patterns
-        if "substrings" in pattern and content:
-            for substring in pattern["substrings"]:
-                if substring in content:
-                    return pattern["ruleName"], pattern["reminder"]
 
-    return None, None
+def check_patterns(file_path, content):
+    """Find every security pattern the file path or content matches.
+
+    Returns a list of matches in load_security_patterns() order, one per rule:
+    {"ruleName", "reminder", "offsets"}, where offsets lists the
+    (start, end) of each substring occurrence in content (empty for
+    path-based rules).
+    """
+    # Rules whose path selectors match (leading slashes are ignored)
+    path_matches = get_path_index().match(file_path)
+
+    offsets = {}
+    if content:
+        # One pass over the content for all substrings of all rules
+        for start, end, index in get_content_scanner().scan(content):
+            offsets.setdefault(index, []).append((start, end))
+
+    matches = []
+    for index, pattern in enumerate(load_security_patterns()):
+        if index in path_matches or index in offsets:
+            matches.append(
+                {
+                    "ruleName": pattern["ruleName"],
+                    "reminder": pattern["reminder"],
+                    "offsets": sorted(offsets.get(index, [])),
+                }
+            )
+
+    return matches
 
 
 def extract_content_from_input(tool_name, tool_input):
@@ -214,63 +261,95 @@ def extract_content_from_input(tool_name, tool_input):
     return ""
 
 
-def main():
-    """Main hook function."""
+def evaluate(input_data):
+    """Check a PreToolUse hook input for security patterns.
+
+    Returns the reminders to show if the tool call should be blocked (the
+    rules the file triggers for the first time in the session), or None to
+    allow it.
+    Used by main() and by in-process dispatchers.
+    """
     # Check if security reminders are enabled
     security_reminder_enabled = os.environ.get("ENABLE_SECURITY_REMINDER", "1")
 
     # Only run if security reminders are enabled
     if security_reminder_enabled == "0":
-        sys.exit(0)
-
-    # Periodically clean up old state files (10% chance per run)
-    if random.random() < 0.1:
-        cleanup_old_state_files()
-
-    # Read input from stdin
-    try:
-        raw_input = sys.stdin.read()
-        input_data = json.loads(raw_input)
-    except json.JSONDecodeError as e:
-        debug_log(f"JSON decode error: {e}")
-        sys.exit(0)  # Allow tool to proceed if we can't parse input
+        return None
 
     # Extract session ID and tool information from the hook input
     session_id = input_data.get("session_id", "default")
     tool_name = input_data.get("tool_name", "")
     tool_input = input_data.get("tool_input", {})
+    logger.session_id = session_id
 
     # Check if this is a relevant tool
     if tool_name not in ["Edit", "Write", "MultiEdit"]:
-        sys.exit(0)  # Allow non-file tools to proceed
+        return None  # Allow non-file tools to proceed
 
     # Extract file path from tool_input
     file_path = tool_input.get("file_path", "")
     if not file_path:
-        sys.exit(0)  # Allow if no file path
+        return None  # Allow if no file path
 
     # Extract content to check
     content = extract_content_from_input(tool_name, tool_input)
 
     # Check for security patterns
-    rule_name, reminder = check_patterns(file_path, content)
+    matches = check_patterns(file_path, content)
+    logger.debug(
+        "Checked file",
+        tool=tool_name,
+        file_path=file_path,
+        rules={match["ruleName"]: match["offsets"] for match in matches},
+    )
+    if not matches:
+        return None
+
+    # Show each rule once per file and session, all new ones together so a
+    # blocked edit surfaces every relevant reminder at once. Claiming the
+    # warning keys is atomic, so parallel hooks never show one twice.
+    warning_keys = [f"{file_path}-{match['ruleName']}" for match in matches]
+    try:
+        new_keys = set(WarningStateStore().claim(session_id, warning_keys))
+    except Exception as e:  # sqlite3.Error, OSError
+        logger.error("Failed to update warning state", error=str(e))
+        new_keys = set(warning_keys)  # Show the warnings rather than lose them
+
+    reminders = [
+        match["reminder"]
+        for match, warning_key in zip(matches, warning_keys)
+        if warning_key in new_keys
+    ]
+    if reminders:
+        logger.info(
+            "Showing security reminders",
+            file_path=file_path,
+            rules=[m["ruleName"] for m, k in zip(matches, warning_keys) if k in new_keys],
+        )
+        return "\n\n".join(reminders)
+
+    return None
 
-    if rule_name and reminder:
-        # Create unique warning key
-        warning_key = f"{file_path}-{rule_name}"
 
-        # Load existing warnings for this session
-        shown_warnings = load_state(session_id)
+def main():
+    """Main hook function."""
+    # Only run if security reminders are enabled
+    if os.environ.get("ENABLE_SECURITY_REMINDER", "1") == "0":
+        sys.exit(0)
 
-        # Check if we've already shown this warning in this session
-        if warning_key not in shown_warnings:
-            # Add to shown warnings and save
-            shown_warnings.add(warning_key)
-            save_state(session_id, shown_warnings)
+    # Read input from stdin
+    try:
+        raw_input = sys.stdin.read()
+        input_data = json.loads(raw_input)
+    except json.JSONDecodeError as e:
+        logger.error("JSON decode error", error=str(e))
+        sys.exit(0)  # Allow tool to proceed if we can't parse input
 
-            # Output the warning to stderr and block execution
-            print(reminder, file=sys.stderr)
-            sys.exit(2)  # Block tool execution (exit code 2 for PreToolUse hooks)
+    reminder = evaluate(input_data)
+    if reminder:
+        # Output the warning to stderr and block execution
+        print(reminder, file=sys.stderr)
+        sys.exit(2)  # Block tool execution (exit code 2 for PreToolUse hooks)
 
     # Allow tool to proceed
     sys.exit(0)
@@ -0,0 +1,8 @@
+"""Make the security_guidance package importable."""
+
+import os
+import sys
+
+HOOKS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "hooks")
+if HOOKS_DIR not in sys.path:
+    sys.path.insert(0, HOOKS_DIR)
@@ -0,0 +1,137 @@
+"""DebugLogger buffering, levels and rotation."""
+
+import json
+import os
+
+import pytest
+
+from security_guidance import debug_logger
+from security_guidance.debug_logger import LOG_NAME, DebugLogger
+
+
+@pytest.fixture(autouse=True)
+def clean_environment(monkeypatch):
+    for name in list(os.environ):
+        if name.startswith("SECURITY_REMINDER_LOG_"):
+            monkeypatch.delenv(name)
+    # Loggers of these tests are flushed explicitly, not at interpreter exit
+    monkeypatch.setattr("atexit.register", lambda func: None)
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def log_files(directory):
+    """The log and its backups, oldest first."""
+    names = sorted((n for n in os.listdir(directory) if n.startswith(LOG_NAME + ".")),
+                   key=lambda n: int(n.rsplit(".", 1)[1]), reverse=True)
+    return [os.path.join(directory, n) for n in names] + [os.path.join(directory, LOG_NAME)]
+
+
+def test_records_are_buffered_until_flush(tmp_path):
+    path = str(tmp_path / "logs" / LOG_NAME)
+    logger = DebugLogger("hook", level="info", path=path)
+    calls = [("s1", "one"), ("s2", "two"), ("s1", "three"), (None, "four"), ("s2", "five")]
+    for session, message in calls:
+        logger.session_id = session
+        logger.info(message, file_path="a.js", rules=["eval"])
+    assert not os.path.exists(path)
+
+    logger.flush()
+    records = read_lines(path)
+    # Unbuffered order, regrouped by session in order of first appearance
+    sessions = list(dict.fromkeys(s for s, _ in calls))
+    expected = sorted(calls, key=lambda call: sessions.index(call[0]))
+    assert [(r["session"], r["msg"]) for r in records] == expected
+    assert all(r["level"] == "info" and r["logger"] == "hook" and r["file_path"] == "a.js"
+               and r["rules"] == ["eval"] for r in records)
+    assert oct(os.stat(path).st_mode & 0o777) == oct(0o600)
+
+    # A second flush appends only the new records
+    logger.flush()
+    logger.error("six")
+    logger.flush()
+    assert [r["msg"] for r in read_lines(path)] == [m for _, m in expected] + ["six"]
+
+
+@pytest.mark.parametrize("level, logged", [
+    ("debug", ["debug", "info", "warning", "error"]),
+    ("info", ["info", "warning", "error"]),
+    ("WARNING", ["warning", "error"]),
+    ("error", ["error"]),
+    ("off", []),
+    ("bogus", ["warning", "error"]),
+])
+def test_levels(tmp_path, level, logged):
+    path = str(tmp_path / LOG_NAME)
+    logger = DebugLogger("hook", level=level, path=path)
+    for name in ("debug", "info", "warning", "error"):
+        getattr(logger, name)(name)
+    logger.flush()
+    if logged:
+        assert [r["level"] for r in read_lines(path)] == logged
+    else:
+        assert not os.path.exists(path)
+
+
+def test_environment_configuration(tmp_path, monkeypatch):
+    monkeypatch.setenv("SECURITY_REMINDER_LOG_LEVEL", "debug")
+    monkeypatch.setenv("SECURITY_REMINDER_LOG_DIR", str(tmp_path))
+    monkeypatch.setenv("SECURITY_REMINDER_LOG_MAX_BYTES", "2048")
+    monkeypatch.setenv("SECURITY_REMINDER_LOG_BACKUPS", "not a number")
+    logger = DebugLogger("hook")
+    assert (logger.level, logger.path) == (debug_logger.LEVELS["debug"], str(tmp_path / LOG_NAME))
+    assert (logger.max_bytes, logger.backups) == (2048, debug_logger.DEFAULT_BACKUPS)
+
+
+@pytest.mark.parametrize("backups", [0, 1, 3])
+def test_rotation_keeps_the_newest_records(tmp_path, backups):
+    logger = DebugLogger("hook", level="info", path=str(tmp_path / LOG_NAME), max_bytes=2000, backups=backups)
+    written = []
+    for i in range(200):
+        logger.info(f"record {i}", padding="x" * 50)
+        written.append(f"record {i}")
+        if i % 7 == 6:
+            logger.flush()
+    logger.flush()
+
+    files = [p for p in log_files(str(tmp_path)) if os.path.exists(p)]
+    assert len(files) <= backups + 1
+    assert all(os.path.getsize(p) <= 2000 + 7 * 200 for p in files)
+    # The files, oldest first, hold an unbroken run of the newest records
+    kept = [r["msg"] for p in files for r in read_lines(p)]
+    assert kept == written[len(written) - len(kept):]
+    if backups:
+        assert len(files) == backups + 1
+
+
+def test_rotation_by_another_process_is_not_repeated(tmp_path, monkeypatch):
+    path = str(tmp_path / LOG_NAME)
+    logger = DebugLogger("hook", level="info", path=path, max_bytes=10)
+    real_fstat = os.fstat
+
+    def fstat_then_rotate(fd):
+        # Another hook rotates between our write and our size check
+        st = real_fstat(fd)
+        os.replace(path, path + ".1")
+        with open(path, "w"):
+            pass
+        return st
+
+    monkeypatch.setattr(debug_logger.os, "fstat", fstat_then_rotate)
+    logger.info("mine")
+    logger.flush()
+    assert [r["msg"] for r in read_lines(path + ".1")] == ["mine"]
+    assert os.path.getsize(path) == 0
+    assert not os.path.exists(path + ".2")
+
+
+def test_unwritable_path_is_ignored(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    logger = DebugLogger("hook", level="info", path=str(blocker / "logs" / LOG_NAME))
+    logger.info("lost")
+    logger.flush()
+    assert logger._buffers == {}
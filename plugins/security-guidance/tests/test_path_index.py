@@ -0,0 +1,68 @@
+"""PathIndex against matching every rule's selectors one by one."""
+
+import fnmatch
+import random
+
+import security_reminder_hook
+from security_guidance.path_index import PathIndex
+
+
+def glob_matches(glob, segments):
+    """Brute-force segment glob: fnmatch per segment, "**" for any number."""
+    parts = [part for part in glob.split("/") if part]
+
+    def match(i, j):
+        if i == len(parts):
+            return j == len(segments)
+        if parts[i] == "**":
+            return any(match(i + 1, k) for k in range(j, len(segments) + 1))
+        return j < len(segments) and fnmatch.fnmatchcase(segments[j], parts[i]) and match(i + 1, j + 1)
+
+    return match(0, 0)
+
+
+def naive(rules, path):
+    path = path.lstrip("/")
+    segments = [segment for segment in path.split("/") if segment]
+    return {
+        key for key, selectors in rules
+        if any(glob_matches(glob, segments) for glob in selectors.get("paths", ()))
+        or any(path.startswith(prefix.lstrip("/")) for prefix in selectors.get("path_prefixes", ()))
+        or any(path.endswith(suffix) for suffix in selectors.get("path_suffixes", ()))
+    }
+
+
+def test_match_agrees_with_brute_force():
+    rng = random.Random(0)
+    words = ["a", "b", "ab", ".github", "x.yml", "b.tf", ""]
+    glob_parts = ["a", "b", "*", "**", "?", "*.yml", "*b", "[ab]", ".github", "a*b", "*.tf"]
+    for _ in range(300):
+        rules = [
+            (i, {
+                "paths": ["/".join(rng.choice(glob_parts) for _ in range(rng.randint(1, 4)))
+                          for _ in range(rng.randint(0, 2))],
+                "path_prefixes": [rng.choice(["a/", "/b", "ab"]) for _ in range(rng.randint(0, 1))],
+                "path_suffixes": [rng.choice([".yml", "/b.tf", "b"]) for _ in range(rng.randint(0, 1))],
+            })
+            for i in range(rng.randint(1, 6))
+        ]
+        index = PathIndex(rules)
+        for _ in range(20):
+            path = "/".join(rng.choice(words) for _ in range(rng.randint(0, 5)))
+            assert index.match(path) == naive(rules, path), (rules, path)
+
+
+def test_builtin_rules_match_the_former_path_check():
+    def workflow_check(path):
+        # The rule's path_check lambda before declarative selectors
+        return ".github/workflows/" in path and (path.endswith(".yml") or path.endswith(".yaml"))
+
+    index = PathIndex(enumerate(security_reminder_hook.SECURITY_PATTERNS))
+    workflow = next(i for i, p in enumerate(security_reminder_hook.SECURITY_PATTERNS)
+                    if p["ruleName"] == "github_actions_workflow")
+    for path in [
+        ".github/workflows/ci.yml", "/repo/.github/workflows/ci.yaml",
+        "repo/.github/workflows/nested/deploy.yml", ".github/workflows/README.md",
+        ".github/ci.yml", "src/app.yml", "docs/.github/workflows.yml",
+    ]:
+        assert (workflow in index.match(path)) == workflow_check(path.lstrip("/")), path
@@ -0,0 +1,56 @@
+"""PatternScanner against finding every substring occurrence one by one."""
+
+import random
+
+import pytest
+
+from security_guidance import pattern_scanner
+from security_guidance.pattern_scanner import PatternScanner
+
+
+def naive(patterns, text):
+    matches = []
+    for substring, key in patterns:
+        if not substring:
+            continue
+        for start in range(len(text) - len(substring) + 1):
+            if text.startswith(substring, start):
+                matches.append((start, start + len(substring), key))
+    return sorted(matches)
+
+
+def random_patterns(rng, count):
+    # A small alphabet gives overlapping and nested substrings
+    return [
+        ("".join(rng.choice("abc(") for _ in range(rng.randint(0, 5))), f"rule_{rng.randrange(count)}")
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("threshold", [0, float("inf")])
+def test_scan_finds_every_occurrence(monkeypatch, threshold):
+    monkeypatch.setattr(pattern_scanner, "MIN_AUTOMATON_SUBSTRINGS", threshold)
+    rng = random.Random(0)
+    for _ in range(200):
+        patterns = random_patterns(rng, rng.randint(1, 12))
+        text = "".join(rng.choice("abc( ") for _ in range(rng.randint(0, 40)))
+        scanner = PatternScanner(patterns)
+        assert scanner.uses_automaton == (threshold == 0)
+        matches = scanner.scan(text)
+        assert sorted(matches) == naive(patterns, text), (patterns, text)
+        assert [end for _, end, _ in matches] == sorted(end for _, end, _ in matches)
+
+
+def test_automaton_only_for_large_sets():
+    small = [("eval(", "eval_injection"), ("pickle", "pickle_deserialization")]
+    assert not PatternScanner(small).uses_automaton
+    large = [(f"substring_{i}", "rule") for i in range(pattern_scanner.MIN_AUTOMATON_SUBSTRINGS)]
+    scanner = PatternScanner(large)
+    assert scanner.uses_automaton
+    assert scanner.scan("x substring_12 y") == [(2, 13, "rule"), (2, 14, "rule")]
+
+
+def test_substring_listed_under_several_keys():
+    scanner = PatternScanner([("exec(", "a"), ("exec(", "b"), ("", "c")])
+    assert len(scanner) == 1
+    assert scanner.scan("exec(x)") == [(0, 5, "a"), (0, 5, "b")]
@@ -0,0 +1,87 @@
+"""WarningStateStore claims and the import of per-session JSON files."""
+
+import json
+import os
+import sqlite3
+import time
+
+import pytest
+
+from security_guidance import state_store
+from security_guidance.state_store import WarningStateStore
+
+
+def test_claim_returns_each_key_once(tmp_path):
+    path = str(tmp_path / "state.sqlite")
+    first, second = WarningStateStore(path), WarningStateStore(path)
+    assert first.claim("s1", ["a", "b"]) == ["a", "b"]
+    assert second.claim("s1", ["b", "c", "a"]) == ["c"]
+    assert first.claim("s1", ["a", "b", "c"]) == []
+    assert first.claim("s2", ["a"]) == ["a"]
+    first.close()
+    second.close()
+
+
+def test_claim_expires_old_entries(tmp_path, monkeypatch):
+    store = WarningStateStore(str(tmp_path / "state.sqlite"))
+    store.claim("s1", ["a"])
+    later = time.time() + (state_store.MAX_AGE_DAYS + 1) * 24 * 60 * 60
+    monkeypatch.setattr(state_store.time, "time", lambda: later)
+    store.claim("s2", ["b"])  # Writes run the expiry
+    assert store.claim("s1", ["a"]) == ["a"]
+    store.close()
+
+
+class _FailingConnection:
+    """Ends the transaction and fails, as SQLite does on some I/O errors."""
+
+    def __init__(self, db):
+        self._db = db
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+    def execute(self, sql, *args):
+        if sql.startswith("DELETE"):
+            self._db.execute("ROLLBACK")
+            raise sqlite3.OperationalError("disk I/O error")
+        return self._db.execute(sql, *args)
+
+
+def test_failed_claim_raises_original_error(tmp_path):
+    store = WarningStateStore(str(tmp_path / "state.sqlite"))
+    store._connect()
+    store._db = _FailingConnection(store._db)
+    with pytest.raises(sqlite3.OperationalError, match="disk I/O error"):
+        store.claim("s1", ["a"])
+    store._db = store._db._db
+    assert not store._db.in_transaction
+    assert store.claim("s1", ["a"]) == ["a"]
+    store.close()
+
+
+def test_legacy_json_files_are_imported_and_removed(tmp_path):
+    def legacy(session_id, keys, age_days=0):
+        path = tmp_path / f"{state_store.LEGACY_PREFIX}{session_id}{state_store.LEGACY_SUFFIX}"
+        path.write_text(keys if isinstance(keys, str) else json.dumps(keys))
+        shown = time.time() - age_days * 24 * 60 * 60
+        os.utime(path, (shown, shown))
+
+    legacy("recent", ["a.js-eval_injection", "b.js-eval_injection"])
+    legacy("old", ["c.js-eval_injection"], age_days=state_store.MAX_AGE_DAYS + 1)
+    legacy("broken", "{not json")
+    (tmp_path / "unrelated.json").write_text("[]")
+
+    store = WarningStateStore(str(tmp_path / "state.sqlite"))
+    assert store.claim("recent", ["a.js-eval_injection", "d.js-eval_injection"]) == ["d.js-eval_injection"]
+    assert store.claim("old", ["c.js-eval_injection"]) == ["c.js-eval_injection"]
+    assert store.claim("broken", ["a.js-eval_injection"]) == ["a.js-eval_injection"]
+    assert sorted(os.listdir(tmp_path)) == ["state.sqlite", "state.sqlite-shm", "state.sqlite-wal",
+                                            "unrelated.json"]
+    store.close()
+
+    # Only a new database imports files
+    legacy("later", ["e.js-eval_injection"])
+    store = WarningStateStore(str(tmp_path / "state.sqlite"))
+    assert store.claim("later", ["e.js-eval_injection"]) == ["e.js-eval_injection"]
+    store.close()